@@ -0,0 +1,5 @@
+"""
+Benchmarks for the packaging and scanning hot paths.
+
+Run them with ``python -m benchmarks``.
+"""
@@ -0,0 +1,111 @@
+"""
+This module runs the benchmarks and compares them against the stored baseline.
+
+    python -m benchmarks                    # quick scale, compare to baseline
+    python -m benchmarks --scale full       # 10k files, 64 MiB binaries
+    python -m benchmarks --save             # record a new baseline
+
+The exit status is 1 if any benchmark regressed beyond the tolerance.
+"""
+
+# __main__.py
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+from typing import Optional, Sequence
+
+from benchmarks.suite import (
+    BENCHMARKS,
+    DEFAULT_TOLERANCE,
+    RESULT_HEADERS,
+    SCALES,
+    find_regressions,
+    load_baseline,
+    result_rows,
+    run_benchmarks,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def format_table(headers: Sequence[str], rows: Sequence[Sequence[str]]) -> str:
+    """
+    Format rows as a table with aligned columns.
+    """
+    widths = [
+        max([len(header)] + [len(row[index]) for row in rows])
+        for index, header in enumerate(headers)
+    ]
+    lines = [headers, ["-" * width for width in widths], *rows]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip()
+        for line in lines
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the benchmarks.
+
+    :param argv: The command-line arguments.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    parser.add_argument(
+        "--filter",
+        action="append",
+        choices=sorted(BENCHMARKS),
+        help="Run only this benchmark; may be repeated.",
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="The allowed slowdown before a benchmark fails, e.g. 0.5 for 50%%.",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Record the results as the baseline."
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    def progress(message: str) -> None:
+        print(message, file=sys.stderr)
+
+    results = run_benchmarks(SCALES[args.scale], args.filter, progress)
+    if args.save:
+        save_baseline(args.baseline, args.scale, results)
+        regressions = []
+    else:
+        baseline = load_baseline(args.baseline)
+        regressions = find_regressions(baseline, args.scale, results, args.tolerance)
+
+    if args.json:
+        report = {
+            "scale": args.scale,
+            "results": [asdict(result) for result in results],
+            "regressions": [asdict(regression) for regression in regressions],
+        }
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_table(RESULT_HEADERS, result_rows(results)))
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.name}: {regression.current:.2f}x calibration,"
+                f" baseline {regression.baseline:.2f}x"
+                f" ({regression.slowdown:.0%} of baseline)"
+            )
+        if args.save:
+            print(f"Saved the {args.scale} baseline to {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+This module generates the synthetic inputs the benchmarks run against.
+
+Everything is generated from a fixed seed, so every run and every machine
+benchmarks the same bytes, and nothing is downloaded.
+"""
+
+# fixtures.py
+
+import os
+import random
+
+HANDLER_SOURCE = """from aws_lambda_typing import context as lambda_context
+
+
+def handler(event: dict, context: lambda_context.Context) -> dict:
+    return {"statusCode": 200, "body": "ok"}
+"""
+
+_FUNCTION_SOURCE = '''
+
+def helper_{index}(values: list, scale: float = 1.0) -> float:
+    """Return the scaled sum of the values above {index}."""
+    total = 0.0
+    for value in values:
+        if value > {index}:
+            total += value * scale
+    return total
+
+
+class Model{index}:
+    """A record with a few fields."""
+
+    def __init__(self, name: str, size: int = {index}) -> None:
+        self.name = name
+        self.size = size
+
+    def describe(self) -> str:
+        return f"{{self.name}}: {{self.size}}"
+'''
+
+
+def large_module_source(function_count: int) -> str:
+    """
+    Generate a module of helper functions and classes ending in a handler.
+
+    :param function_count: The number of helper function and class pairs.
+    :return: The module's source code.
+    """
+    parts = [_FUNCTION_SOURCE.format(index=index) for index in range(function_count)]
+    return "".join(parts) + "\n\n" + HANDLER_SOURCE
+
+
+def write_function_dir(root: str, module_count: int) -> str:
+    """
+    Write a function directory with many modules at its root and one handler.
+
+    :param root: The directory to create.
+    :param module_count: The number of modules besides the handler.
+    :return: The directory.
+    """
+    os.makedirs(root, exist_ok=True)
+    module_source = large_module_source(2)
+    for index in range(module_count):
+        path = os.path.join(root, f"module_{index:05d}.py")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(module_source)
+    with open(os.path.join(root, "zz_handler.py"), "w", encoding="utf-8") as file:
+        file.write(HANDLER_SOURCE)
+    return root
+
+
+def _binary_block(rng: random.Random, size: int) -> bytes:
+    """
+    Generate bytes that compress about as well as a native extension does.
+    """
+    noise = rng.randbytes(size // 2)
+    return noise + bytes(size - len(noise))
+
+
+def _write_binary(path: str, block: bytes, size: int) -> None:
+    """
+    Write a binary of the given size by repeating a block.
+    """
+    with open(path, "wb") as file:
+        remaining = size
+        while remaining > 0:
+            chunk = block[: min(len(block), remaining)]
+            file.write(chunk)
+            remaining -= len(chunk)
+
+
+def write_package_tree(
+    root: str,
+    small_file_count: int,
+    huge_file_count: int = 0,
+    huge_file_size: int = 0,
+    seed: int = 0,
+) -> str:
+    """
+    Write a package tree of many small modules and a few huge binaries.
+
+    Small modules are spread over packages of 100 files.  Binaries are half
+    random and half zeros, so they deflate to about half their size.
+
+    :param root: The directory to create.
+    :param small_file_count: The number of small modules.
+    :param huge_file_count: The number of huge binaries.
+    :param huge_file_size: The size of each binary, in bytes.
+    :param seed: The random seed.
+    :return: The directory.
+    """
+    rng = random.Random(seed)
+    module_source = large_module_source(1)
+    for index in range(small_file_count):
+        package_dir = os.path.join(root, f"package_{index // 100:03d}")
+        os.makedirs(package_dir, exist_ok=True)
+        path = os.path.join(package_dir, f"module_{index % 100:02d}.py")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(module_source)
+
+    block = _binary_block(rng, 1024 * 1024)
+    for index in range(huge_file_count):
+        binaries_dir = os.path.join(root, "binaries")
+        os.makedirs(binaries_dir, exist_ok=True)
+        path = os.path.join(binaries_dir, f"_native_{index}.so")
+        _write_binary(path, block, huge_file_size)
+
+    with open(os.path.join(root, "handler.py"), "w", encoding="utf-8") as file:
+        file.write(HANDLER_SOURCE)
+    return root
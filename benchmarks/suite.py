@@ -0,0 +1,375 @@
+"""
+This module contains the benchmarks for the packaging and scanning hot paths.
+
+Each benchmark builds its fixtures in a temporary directory, then times a
+number of rounds and keeps the fastest and the median.  Every run also times a
+fixed calibration workload, and results are compared as multiples of it, so a
+baseline recorded on one machine still flags regressions on a faster or a
+slower one.
+"""
+
+# suite.py
+
+import ast
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import zlib
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Optional
+
+from benchmarks.fixtures import (
+    large_module_source,
+    write_function_dir,
+    write_package_tree,
+)
+from lambda_kit.utils.aws_lambda import (
+    HandlerScanner,
+    contains_lambda_handler_code,
+    is_python_lambda,
+)
+from lambda_kit.utils.cache import PackageCache, build_cached_zip
+from lambda_kit.utils.packaging import collect_files, write_zip
+
+BASELINE_VERSION = 1
+CALIBRATION = "calibration"
+# The calibration is short, so it is timed more often to steady its minimum.
+CALIBRATION_ROUNDS = 20
+DEFAULT_TOLERANCE = 0.5
+RESULT_HEADERS = ["Benchmark", "Rounds", "Min (s)", "Median (s)", "x Calibration"]
+
+
+@dataclass(frozen=True)
+class Scale:
+    """
+    The size of the fixtures and the number of rounds timed.
+    """
+
+    handler_functions: int
+    function_modules: int
+    small_files: int
+    huge_files: int
+    huge_file_size: int
+    rounds: int
+
+
+SCALES = {
+    "quick": Scale(
+        handler_functions=200,
+        function_modules=200,
+        small_files=500,
+        huge_files=1,
+        huge_file_size=8 * 1024 * 1024,
+        rounds=5,
+    ),
+    "full": Scale(
+        handler_functions=5000,
+        function_modules=5000,
+        small_files=10000,
+        huge_files=3,
+        huge_file_size=64 * 1024 * 1024,
+        rounds=5,
+    ),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The timings of one benchmark.
+    """
+
+    name: str
+    rounds: int
+    min_s: float
+    median_s: float
+    # The fastest round as a multiple of the calibration's fastest round.
+    relative: float = 0.0
+
+
+@dataclass
+class Regression:
+    """
+    A benchmark that got slower than its baseline allows.
+    """
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def slowdown(self) -> float:
+        """
+        How many times slower the benchmark is than its baseline.
+        """
+        return self.current / self.baseline
+
+
+def _silent(_message: str) -> None:
+    pass
+
+
+def _calibration(work_dir: str, scale: Scale) -> Callable[[], object]:
+    """
+    Parse and deflate fixed inputs: the same kinds of work as the suite.
+    """
+    del work_dir, scale
+    source = large_module_source(500)
+    data = source.encode("utf-8") * 8
+
+    def run() -> object:
+        ast.parse(source)
+        return zlib.compress(data, 6)
+
+    return run
+
+
+def _handler_detection(work_dir: str, scale: Scale) -> Callable[[], object]:
+    """
+    Look for a handler in one large module.
+    """
+    del work_dir
+    source = large_module_source(scale.handler_functions)
+    return lambda: contains_lambda_handler_code(source)
+
+
+def _scan_cold(work_dir: str, scale: Scale) -> Callable[[], object]:
+    """
+    Check a function directory of many modules with nothing cached.
+    """
+    directory = write_function_dir(
+        os.path.join(work_dir, "function"), scale.function_modules
+    )
+    return lambda: is_python_lambda(directory, _silent, HandlerScanner(cache_path=None))
+
+
+def _scan_warm(work_dir: str, scale: Scale) -> Callable[[], object]:
+    """
+    Check a function directory of many modules with every file cached.
+    """
+    directory = write_function_dir(
+        os.path.join(work_dir, "function"), scale.function_modules
+    )
+    cache_path = os.path.join(work_dir, "scan-cache.json")
+    is_python_lambda(directory, _silent, HandlerScanner(cache_path=cache_path))
+    return lambda: is_python_lambda(
+        directory, _silent, HandlerScanner(cache_path=cache_path)
+    )
+
+
+def _zip_small_files(work_dir: str, scale: Scale) -> Callable[[], object]:
+    """
+    Package a tree of many small modules.
+    """
+    source_dir = write_package_tree(os.path.join(work_dir, "tree"), scale.small_files)
+    zip_path = os.path.join(work_dir, "small.zip")
+    return lambda: write_zip(collect_files(source_dir), zip_path)
+
+
+def _zip_huge_files(work_dir: str, scale: Scale) -> Callable[[], object]:
+    """
+    Package a tree of a few huge binaries.
+    """
+    source_dir = write_package_tree(
+        os.path.join(work_dir, "tree"), 0, scale.huge_files, scale.huge_file_size
+    )
+    zip_path = os.path.join(work_dir, "huge.zip")
+    return lambda: write_zip(collect_files(source_dir), zip_path)
+
+
+def _zip_incremental(work_dir: str, scale: Scale) -> Callable[[], object]:
+    """
+    Repackage a tree of many small modules after changing one of them.
+    """
+    source_dir = write_package_tree(os.path.join(work_dir, "tree"), scale.small_files)
+    cache = PackageCache(os.path.join(work_dir, "cache"))
+    zip_path = os.path.join(work_dir, "incremental.zip")
+    changed_path = os.path.join(source_dir, "handler.py")
+    build_cached_zip(collect_files(source_dir), zip_path, cache, "incremental")
+    rounds = iter(range(1_000_000))
+
+    def run() -> object:
+        with open(changed_path, "a", encoding="utf-8") as file:
+            file.write(f"# change {next(rounds)}\n")
+        return build_cached_zip(
+            collect_files(source_dir), zip_path, cache, "incremental"
+        )
+
+    return run
+
+
+BENCHMARKS: dict[str, Callable[[str, Scale], Callable[[], object]]] = {
+    CALIBRATION: _calibration,
+    "handler_detection": _handler_detection,
+    "scan_cold": _scan_cold,
+    "scan_warm": _scan_warm,
+    "zip_small_files": _zip_small_files,
+    "zip_huge_files": _zip_huge_files,
+    "zip_incremental": _zip_incremental,
+}
+
+
+def time_benchmark(
+    name: str,
+    setup: Callable[[str, Scale], Callable[[], object]],
+    scale: Scale,
+) -> BenchmarkResult:
+    """
+    Time a benchmark.
+
+    The first call is a warm-up and is not timed.
+
+    :param name: The benchmark name.
+    :param setup: Builds the fixtures in a directory and returns the timed call.
+    :param scale: The fixture sizes and rounds.
+    :return: The timings.
+    """
+    with tempfile.TemporaryDirectory(prefix="kit-bench-") as work_dir:
+        run = setup(work_dir, scale)
+        run()
+        timings = []
+        for _ in range(scale.rounds):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return BenchmarkResult(
+        name=name,
+        rounds=scale.rounds,
+        min_s=min(timings),
+        median_s=statistics.median(timings),
+    )
+
+
+def run_benchmarks(
+    scale: Scale,
+    names: Optional[list[str]] = None,
+    progress: Callable[[str], None] = _silent,
+) -> list[BenchmarkResult]:
+    """
+    Run the benchmarks, always including the calibration.
+
+    :param scale: The fixture sizes and rounds.
+    :param names: The benchmarks to run; all of them if omitted.
+    :param progress: The callable function to report each benchmark's start to.
+    :return: The timings, calibration first.
+    :raises ValueError: If a benchmark name is unknown.
+    """
+    selected = list(BENCHMARKS) if not names else [CALIBRATION, *names]
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results = []
+    for name in dict.fromkeys(selected):
+        progress(f"Running {name} ...")
+        rounds = CALIBRATION_ROUNDS if name == CALIBRATION else scale.rounds
+        results.append(
+            time_benchmark(name, BENCHMARKS[name], replace(scale, rounds=rounds))
+        )
+
+    # The fastest round is the least disturbed by other work on the machine.
+    calibration = results[0].min_s
+    for result in results:
+        result.relative = result.min_s / calibration if calibration else 0.0
+    return results
+
+
+def result_rows(results: list[BenchmarkResult]) -> list[tuple[str, ...]]:
+    """
+    Format results as table rows under ``RESULT_HEADERS``.
+    """
+    return [
+        (
+            result.name,
+            str(result.rounds),
+            f"{result.min_s:.4f}",
+            f"{result.median_s:.4f}",
+            f"{result.relative:.2f}",
+        )
+        for result in results
+    ]
+
+
+def machine_info() -> dict[str, Any]:
+    """
+    Describe the machine the benchmarks ran on.
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def load_baseline(path: str) -> dict[str, Any]:
+    """
+    Load a baseline file.
+
+    :param path: The baseline file.
+    :return: The baseline; empty if the file does not exist or is outdated.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            baseline: dict[str, Any] = json.load(file)
+    except FileNotFoundError:
+        return {}
+    if baseline.get("version") != BASELINE_VERSION:
+        return {}
+    return baseline
+
+
+def save_baseline(path: str, scale_name: str, results: list[BenchmarkResult]) -> None:
+    """
+    Record results as the baseline for a scale, keeping other scales.
+
+    :param path: The baseline file.
+    :param scale_name: The scale the results were measured at.
+    :param results: The results.
+    """
+    baseline = load_baseline(path)
+    scales = baseline.get("scales", {})
+    scales[scale_name] = {result.name: asdict(result) for result in results}
+    baseline = {
+        "version": BASELINE_VERSION,
+        "machine": machine_info(),
+        "scales": scales,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def find_regressions(
+    baseline: dict[str, Any],
+    scale_name: str,
+    results: list[BenchmarkResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Regression]:
+    """
+    Find the benchmarks that are slower than their baseline allows.
+
+    Benchmarks are compared as multiples of the calibration, so the baseline
+    need not come from the same machine.
+
+    :param baseline: The baseline, from ``load_baseline``.
+    :param scale_name: The scale the results were measured at.
+    :param results: The results.
+    :param tolerance: The allowed slowdown, e.g. 0.5 for 50%.
+    :return: The regressions; benchmarks without a baseline are skipped.
+    """
+    recorded = baseline.get("scales", {}).get(scale_name, {})
+    regressions = []
+    for result in results:
+        if result.name == CALIBRATION or result.name not in recorded:
+            continue
+        expected = recorded[result.name]["relative"]
+        if expected and result.relative > expected * (1 + tolerance):
+            regressions.append(
+                Regression(name=result.name, baseline=expected, current=result.relative)
+            )
+    return regressions
@@ -2,18 +2,46 @@
 This module contains the CLI tool for packaging Python Lambda functions.
 """
 
+import json
 import os
 import sys
+import zipfile
+from typing import Optional
 
 import click
 
-from lambda_kit.mvc.controllers.function_controller import FunctionController
-from lambda_kit.mvc.controllers.layer_controller import LayerController
+from lambda_kit.commands.common import (
+    create_function_controller,
+    create_layer_controller,
+    output_format,
+    parse_size_option,
+)
+from lambda_kit.commands.pack import package_all, package_function, package_layer
+from lambda_kit.commands.run import (
+    analyze_init_function,
+    invoke_function,
+    profile_function_imports,
+    serve_function,
+)
+
+# Controllers are imported inside each command, so that ``kit --help`` and
+# argument errors do not pay for pydantic, jinja2 and the packaging modules.
+# pylint: disable=import-outside-toplevel
 
 
 @click.group()
-def cli() -> None:
+@click.option(
+    "--output",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    show_default=True,
+    help="Output format; json writes one event per line (NDJSON).",
+)
+@click.pass_context
+def cli(ctx: click.Context, output: str) -> None:
     """CLI tool for manipulating Python Lambda components."""
+    ctx.ensure_object(dict)
+    ctx.obj["output"] = output
 
 
 @cli.group()
@@ -26,36 +54,91 @@ def layer() -> None:
     """Commands for manipulating Lambda layers."""
 
 
-def echo_wrapper(message: str) -> None:
-    """Wrapper for click.echo."""
-    click.echo(message)
-
 @function.command("init")
-@click.argument("source-dir")
+@click.argument("source-dirs", nargs=-1)
 @click.option(
     "--output-dir",
-    required=True,
+    default=None,
     type=click.Path(),
     help="Path to the output directory.",
 )
-def initialize_function(source_dir: str, output_dir: str) -> None:
-    """Initialize a new Lambda function."""
+@click.option(
+    "--template",
+    default=None,
+    help="Handler template; see 'kit function templates'.",
+    show_default="tuned/api-gateway",
+)
+@click.option(
+    "--template-dir",
+    "template_dirs",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of extra or replacement templates; may be repeated.",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="TOML manifest listing many functions to scaffold.",
+)
+def initialize_function(
+    source_dirs: tuple[str, ...],
+    output_dir: Optional[str],
+    template: Optional[str],
+    template_dirs: tuple[str, ...],
+    manifest: Optional[str],
+) -> None:
+    """Initialize one or more new Lambda functions."""
+    from lambda_kit.utils.templates import (
+        DEFAULT_TEMPLATE,
+        ScaffoldSpec,
+        load_scaffold_manifest,
+    )
+
+    if not source_dirs and manifest is None:
+        raise click.UsageError("Give at least one SOURCE_DIR or a --manifest.")
+
+    controller = create_function_controller(output_dir=output_dir)
+    controller.model.template_dirs = list(template_dirs)
     try:
-        controller = FunctionController.create()
-        model = controller.model
-        view = controller.view
+        specs = [
+            ScaffoldSpec(source_dir=source_dir, template=template or DEFAULT_TEMPLATE)
+            for source_dir in source_dirs
+        ]
+        if manifest is not None:
+            specs.extend(load_scaffold_manifest(manifest))
+
+        controller.initialize_many(specs)
+    except (FileExistsError, ValueError) as err:
+        controller.view.error(str(err))
+        sys.exit(1)
 
-        view.info_display_func = echo_wrapper
-        view.error_display_func = echo_wrapper
 
-        model.name = os.path.basename(os.path.normpath(source_dir))
-        model.source_dir = source_dir
-        model.output_dir = output_dir
+@function.command("templates")
+@click.option(
+    "--template-dir",
+    "template_dirs",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of extra or replacement templates; may be repeated.",
+)
+def list_function_templates(template_dirs: tuple[str, ...]) -> None:
+    """List the handler templates available to 'kit function init'."""
+    from lambda_kit.utils.templates import list_templates
 
-        controller.initialize()
-    except FileExistsError as err:
-        click.echo(err)
-        sys.exit(1)
+    templates = list_templates(template_dirs)
+    if output_format() == "json":
+        click.echo(
+            "\n".join(
+                json.dumps({"event": "template", "name": name, "description": text})
+                for name, text in templates.items()
+            )
+        )
+        return
+
+    width = max(len(name) for name in templates) + 2
+    for name, description in templates.items():
+        click.echo(f"{name:<{width}}{description}")
 
 
 @function.command("describe")
@@ -66,54 +149,60 @@ def initialize_function(source_dir: str, output_dir: str) -> None:
     type=click.Path(),
     help="Path to the output directory.",
 )
-def describe_function(source_dir: str, output_dir: str) -> None:
-    """Describe a Lambda function."""
-    try:
-        controller = FunctionController.create()
-        model = controller.model
-        view = controller.view
-
-        view.info_display_func = echo_wrapper
-        view.error_display_func = echo_wrapper
-
-        model.source_dir = source_dir
-        model.output_dir = output_dir
-
-        controller.describe()
-    except FileExistsError as err:
-        click.echo(err)
-        sys.exit(1)
-
-
-@function.command("pack")
 @click.option(
-    "--source-dir",
-    required=True,
-    type=click.Path(exists=True),
-    help="Path to the source directory.",
+    "--max-size",
+    callback=parse_size_option,
+    default=None,
+    help="Fail if the package is larger than this unzipped, e.g. 200MB.",
+    show_default="250MiB, the Lambda limit",
 )
 @click.option(
-    "--output-dir",
-    required=True,
-    type=click.Path(),
-    help="Path to the output directory.",
+    "--max-cold-start",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Fail if the estimated cold start exceeds this many milliseconds.",
 )
-def package_function(source_dir: str, output_dir: str) -> None:
-    """Package Lambda functions."""
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of packages to list.",
+)
+def describe_function(
+    source_dir: str,
+    output_dir: str,
+    max_size: Optional[int],
+    max_cold_start: Optional[float],
+    limit: int,
+) -> None:
+    """Describe a packaged Lambda function and check its size budget."""
+    controller = create_function_controller(source_dir, output_dir)
     try:
-        controller = FunctionController.create()
-        model = controller.model
-        view = controller.view
-
-        view.info_display_func = echo_wrapper
-        view.error_display_func = echo_wrapper
+        controller.describe(
+            max_size=max_size, max_cold_start_ms=max_cold_start, limit=limit
+        )
+    except (FileExistsError, zipfile.BadZipFile) as err:
+        controller.view.error(str(err))
+        sys.exit(1)
 
-        model.source_dir = source_dir
-        model.output_dir = output_dir
 
-        controller.package()
-    except FileExistsError as err:
-        click.echo(err)
+@function.command("lint")
+@click.argument("source-dir", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parser processes.",
+)
+def lint_function(source_dir: str, workers: Optional[int]) -> None:
+    """Find per-invocation work in handlers, for one function or a whole tree."""
+    controller = create_function_controller(source_dir)
+    controller.model.workers = workers
+    try:
+        controller.lint()
+    except ValueError as err:
+        controller.view.error(str(err))
         sys.exit(1)
 
 
@@ -127,78 +216,113 @@ def package_function(source_dir: str, output_dir: str) -> None:
 )
 def initialize_layer(source_dir: str, output_dir: str) -> None:
     """Initialize a new Lambda layer."""
+    controller = create_layer_controller(source_dir, output_dir)
+    controller.model.name = os.path.basename(os.path.normpath(source_dir))
     try:
-        controller = LayerController.create()
-        model = controller.model
-        view = controller.view
-
-        view.info_display_func = echo_wrapper
-        view.error_display_func = echo_wrapper
-
-        model.name = os.path.basename(os.path.normpath(source_dir))
-        model.source_dir = source_dir
-        model.output_dir = output_dir
-
         controller.initialize()
     except FileExistsError as err:
-        click.echo(err)
+        controller.view.error(str(err))
         sys.exit(1)
 
 
-@layer.command("describe")
-@click.argument("source-dir")
+@layer.command("dedupe")
 @click.option(
     "--output-dir",
     required=True,
-    type=click.Path(),
-    help="Path to the output directory.",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory holding the packaged functions and layers.",
 )
-def describe_layer(source_dir: str, output_dir: str) -> None:
-    """Describe a Lambda layer."""
-    try:
-        controller = LayerController.create()
-        model = controller.model
-        view = controller.view
-
-        view.info_display_func = echo_wrapper
-        view.error_display_func = echo_wrapper
-
-        model.source_dir = source_dir
-        model.output_dir = output_dir
-
-        controller.describe()
-    except FileExistsError as err:
-        click.echo(err)
-        sys.exit(1)
-
-
-@layer.command("pack")
 @click.option(
-    "--source-dir",
-    required=True,
-    type=click.Path(exists=True),
-    help="Path to the source directory.",
+    "--max-layers",
+    type=click.IntRange(min=1, max=5),
+    default=5,
+    show_default=True,
+    help="Most shared layers to propose; leave room for layers already attached.",
 )
+@click.option(
+    "--max-size",
+    callback=parse_size_option,
+    default=None,
+    help="Unzipped limit for a layer and for a function plus its layers.",
+    show_default="250MiB, the Lambda limit",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Number of shared packages to list.",
+)
+@click.option(
+    "--write-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Write the proposed layers here as layer source directories.",
+)
+def dedupe_layers(
+    output_dir: str,
+    max_layers: int,
+    max_size: Optional[int],
+    limit: int,
+    write_dir: Optional[str],
+) -> None:
+    """Find packages duplicated across functions and propose shared layers."""
+    controller = create_layer_controller(output_dir=output_dir)
+    controller.dedupe(
+        max_layers=max_layers, max_size=max_size, limit=limit, write_dir=write_dir
+    )
+
+
+@layer.command("describe")
+@click.argument("source-dir")
 @click.option(
     "--output-dir",
     required=True,
     type=click.Path(),
     help="Path to the output directory.",
 )
-def package_layer(source_dir: str, output_dir: str) -> None:
-    """Package Lambda layers."""
+@click.option(
+    "--max-size",
+    callback=parse_size_option,
+    default=None,
+    help="Fail if the package is larger than this unzipped, e.g. 200MB.",
+    show_default="250MiB, the Lambda limit",
+)
+@click.option(
+    "--max-cold-start",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Fail if the estimated cold start exceeds this many milliseconds.",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of packages to list.",
+)
+def describe_layer(
+    source_dir: str,
+    output_dir: str,
+    max_size: Optional[int],
+    max_cold_start: Optional[float],
+    limit: int,
+) -> None:
+    """Describe a packaged Lambda layer and check its size budget."""
+    controller = create_layer_controller(source_dir, output_dir)
     try:
-        controller = LayerController.create()
-        model = controller.model
-        view = controller.view
-
-        view.info_display_func = echo_wrapper
-        view.error_display_func = echo_wrapper
+        controller.describe(
+            max_size=max_size, max_cold_start_ms=max_cold_start, limit=limit
+        )
+    except (FileExistsError, zipfile.BadZipFile) as err:
+        controller.view.error(str(err))
+        sys.exit(1)
 
-        model.source_dir = source_dir
-        model.output_dir = output_dir
 
-        controller.package()
-    except FileExistsError as err:
-        click.echo(err)
-        sys.exit(1)
+function.add_command(profile_function_imports)
+function.add_command(invoke_function)
+function.add_command(analyze_init_function)
+function.add_command(serve_function)
+function.add_command(package_function)
+layer.add_command(package_layer)
+cli.add_command(package_all)
@@ -0,0 +1,6 @@
+"""
+This package contains the CLI commands that take many options.
+
+Each command collects its options into a dataclass, which the command then
+copies onto its controller's model.
+"""
@@ -0,0 +1,207 @@
+"""
+This module contains the helpers and options shared by the CLI commands.
+
+It is imported by ``kit --help``, so it must not import the controllers.
+"""
+
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+import click
+
+if TYPE_CHECKING:
+    from lambda_kit.mvc.controllers.function_controller import FunctionController
+    from lambda_kit.mvc.controllers.layer_controller import LayerController
+    from lambda_kit.mvc.views.base_view import BaseView
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def echo_wrapper(message: str) -> None:
+    """Wrapper for click.echo."""
+    click.echo(message)
+
+
+def output_format() -> str:
+    """Return the output format chosen with --output."""
+    options = click.get_current_context().obj or {}
+    return str(options.get("output", "text"))
+
+
+def configure_view(view: "BaseView") -> None:
+    """Send a view's output to the terminal in the chosen output format."""
+    view.info_display_func = echo_wrapper
+    view.error_display_func = echo_wrapper
+    view.output_format = output_format()
+    click.get_current_context().call_on_close(view.flush)
+
+
+def create_function_controller(
+    source_dir: Optional[str] = None, output_dir: Optional[str] = None
+) -> "FunctionController":
+    """Create a FunctionController for a function, writing to the terminal."""
+    # pylint: disable=import-outside-toplevel
+    from lambda_kit.mvc.controllers.function_controller import FunctionController
+
+    controller = FunctionController.create()
+    configure_view(controller.view)
+    controller.model.source_dir = source_dir
+    controller.model.output_dir = output_dir
+    return controller
+
+
+def create_layer_controller(
+    source_dir: Optional[str] = None, output_dir: Optional[str] = None
+) -> "LayerController":
+    """Create a LayerController for a layer, writing to the terminal."""
+    # pylint: disable=import-outside-toplevel
+    from lambda_kit.mvc.controllers.layer_controller import LayerController
+
+    controller = LayerController.create()
+    configure_view(controller.view)
+    controller.model.source_dir = source_dir
+    controller.model.output_dir = output_dir
+    return controller
+
+
+def parse_size_option(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[int]:
+    """Convert a size such as 250MB to bytes."""
+    # pylint: disable=import-outside-toplevel
+    from lambda_kit.utils.artifact import parse_size
+
+    if value is None:
+        return None
+    try:
+        size = parse_size(value)
+    except ValueError as err:
+        raise click.BadParameter(str(err), ctx=ctx, param=param) from err
+    if size <= 0:
+        raise click.BadParameter("The size must be positive.", ctx=ctx, param=param)
+    return size
+
+
+@dataclass
+class PackageOptions:  # pylint: disable=too-many-instance-attributes
+    """
+    The options of every packaging command.
+    """
+
+    output_dir: str
+    workers: Optional[int]
+    cache: bool
+    prune: bool
+    compile_bytecode: bool
+    python_version: Optional[str]
+    pyc_only: bool
+    store_compressed: bool
+    timings: bool
+    trace_path: Optional[str]
+
+    def apply(self, model: Any) -> None:
+        """
+        Copy the options onto a controller's model, whose fields share their
+        names.
+        """
+        for option in fields(self):
+            setattr(model, option.name, getattr(self, option.name))
+
+
+def package_options(
+    python_version_help: str, workers_help: str = "Number of compression threads."
+) -> Callable[[F], F]:
+    """
+    Add the options of ``PackageOptions``, other than ``--output-dir``.
+
+    :param python_version_help: The help text of ``--python-version``.
+    :param workers_help: The help text of ``--workers``.
+    """
+    decorators = [
+        click.option(
+            "--workers", type=click.IntRange(min=1), default=None, help=workers_help
+        ),
+        click.option(
+            "--cache/--no-cache",
+            default=True,
+            help="Reuse unchanged work from the cache under the output directory.",
+        ),
+        click.option(
+            "--prune",
+            is_flag=True,
+            default=False,
+            help="Drop files Lambda never needs and strip shared objects.",
+        ),
+        click.option(
+            "--compile",
+            "compile_bytecode",
+            is_flag=True,
+            default=False,
+            help="Precompile sources to unchecked-hash .pyc files.",
+        ),
+        click.option("--python-version", default=None, help=python_version_help),
+        click.option(
+            "--pyc-only",
+            is_flag=True,
+            default=False,
+            help="Ship compiled .pyc files instead of sources (implies --compile).",
+        ),
+        click.option(
+            "--store-compressed",
+            is_flag=True,
+            default=False,
+            help="Store already compressed files (wheels, archives, images) as "
+            "they are.",
+        ),
+        click.option(
+            "--timings",
+            is_flag=True,
+            default=False,
+            help="Show wall time, CPU time, bytes and peak memory per phase.",
+        ),
+        click.option(
+            "--trace",
+            "trace_path",
+            type=click.Path(dir_okay=False),
+            default=None,
+            help="Write the phases as a Chrome trace-event file.",
+        ),
+    ]
+
+    def decorate(command: F) -> F:
+        for decorator in reversed(decorators):
+            command = decorator(command)
+        return command
+
+    return decorate
+
+
+def wheel_options(command: F) -> F:
+    """
+    Add the options that choose where and for which runtime wheels come from.
+    """
+    decorators = [
+        click.option(
+            "--wheelhouse",
+            type=click.Path(file_okay=False),
+            default=None,
+            help="Wheel cache shared between layers.",
+            show_default="~/.cache/lambda-kit/wheelhouse",
+        ),
+        click.option(
+            "--offline",
+            is_flag=True,
+            default=False,
+            help="Install only from wheels already in the wheelhouse.",
+        ),
+        click.option(
+            "--architecture",
+            type=click.Choice(["x86_64", "arm64"]),
+            default=None,
+            help="Select manylinux wheels for this Lambda architecture and "
+            "--python-version instead of for this machine.",
+        ),
+    ]
+    for decorator in reversed(decorators):
+        command = decorator(command)
+    return command
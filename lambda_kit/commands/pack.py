@@ -0,0 +1,179 @@
+"""
+This module contains the CLI commands that package functions and layers.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import click
+
+from lambda_kit.commands.common import (
+    PackageOptions,
+    configure_view,
+    create_function_controller,
+    create_layer_controller,
+    package_options,
+    wheel_options,
+)
+
+# Controllers are imported inside each command; see lambda_kit.__main__.
+# pylint: disable=import-outside-toplevel
+
+
+@dataclass
+class FunctionPackOptions(PackageOptions):
+    """
+    The options of ``kit function pack``.
+    """
+
+    source_dir: str
+    tree_shake: bool
+
+
+@dataclass
+class LayerPackOptions(PackageOptions):
+    """
+    The options of ``kit layer pack``.
+    """
+
+    source_dir: str
+    wheelhouse: Optional[str]
+    offline: bool
+    architecture: Optional[str]
+
+
+@dataclass
+class BatchPackOptions(PackageOptions):
+    """
+    The options of ``kit pack-all``.
+    """
+
+    root_dir: str
+    jobs: Optional[int]
+    tree_shake: bool
+    wheelhouse: Optional[str]
+    offline: bool
+    architecture: Optional[str]
+
+
+@click.command("pack")
+@click.option(
+    "--source-dir",
+    required=True,
+    type=click.Path(exists=True),
+    help="Path to the source directory.",
+)
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(),
+    help="Path to the output directory.",
+)
+@package_options("Target Python version for --compile, e.g. 3.12.")
+@click.option(
+    "--tree-shake",
+    is_flag=True,
+    default=False,
+    help="Drop modules the handlers can never import.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running and repackage whenever the source files change.",
+)
+@click.option(
+    "--debounce",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    help="Seconds of quiet that end a burst of changes, with --watch.",
+)
+def package_function(watch: bool, debounce: float, **options: Any) -> None:
+    """Package Lambda functions."""
+    controller = create_function_controller()
+    FunctionPackOptions(**options).apply(controller.model)
+    try:
+        if watch:
+            controller.watch(debounce)
+        else:
+            controller.package()
+    except FileExistsError as err:
+        controller.view.error(str(err))
+        sys.exit(1)
+    except KeyboardInterrupt:
+        if not watch:
+            raise
+        controller.view.info("Stopped watching.")
+
+
+@click.command("pack")
+@click.option(
+    "--source-dir",
+    required=True,
+    type=click.Path(exists=True),
+    help="Path to the source directory.",
+)
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(),
+    help="Path to the output directory.",
+)
+@package_options("Target Python version for --compile and --architecture, e.g. 3.12.")
+@wheel_options
+def package_layer(**options: Any) -> None:
+    """Package Lambda layers."""
+    controller = create_layer_controller()
+    LayerPackOptions(**options).apply(controller.model)
+    try:
+        controller.package()
+    except FileExistsError as err:
+        controller.view.error(str(err))
+        sys.exit(1)
+
+
+@click.command("pack-all")
+@click.argument("root-dir", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(),
+    help="Path to the output directory.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of functions and layers packaged at once.",
+    show_default="number of CPUs",
+)
+@package_options(
+    "Target Python version for --compile and --architecture, e.g. 3.12.",
+    workers_help="Number of compression threads per package.",
+)
+@wheel_options
+@click.option(
+    "--tree-shake",
+    is_flag=True,
+    default=False,
+    help="Drop modules function handlers can never import.",
+)
+def package_all(**options: Any) -> None:
+    """Package every Lambda function and layer under a directory."""
+    try:
+        from lambda_kit.mvc.controllers.batch_controller import BatchController
+
+        controller = BatchController.create()
+        model = controller.model
+        view = controller.view
+
+        configure_view(view)
+
+        BatchPackOptions(**options).apply(model)
+
+        controller.package()
+    except ValueError as err:
+        view.error(str(err))
+        sys.exit(1)
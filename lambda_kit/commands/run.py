@@ -0,0 +1,221 @@
+"""
+This module contains the CLI commands that run a function locally.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import click
+
+from lambda_kit.commands.common import create_function_controller
+
+
+@dataclass
+class ServeOptions:  # pylint: disable=too-many-instance-attributes
+    """
+    The options of ``kit function serve``.
+    """
+
+    source_dir: str
+    output_dir: Optional[str]
+    events: tuple[str, ...]
+    requests: int
+    concurrency: int
+    workers: Optional[int]
+    port: int
+    python: str
+
+
+@click.command("profile-imports")
+@click.argument("source-dir")
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(),
+    help="Path to the output directory.",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of imports to show per level.",
+)
+@click.option(
+    "--python",
+    default=sys.executable,
+    show_default="current interpreter",
+    help="Interpreter to profile with.",
+)
+def profile_function_imports(
+    source_dir: str, output_dir: str, limit: int, python: str
+) -> None:
+    """Profile the imports of a Lambda function's handler."""
+    controller = create_function_controller(source_dir, output_dir)
+    try:
+        controller.profile_imports(limit=limit, python=python)
+    except RuntimeError as err:
+        controller.view.error(str(err))
+        sys.exit(1)
+
+
+@click.command("invoke")
+@click.argument("source-dir")
+@click.option(
+    "--event",
+    "events",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON event file; repeat to cycle through several events.",
+)
+@click.option(
+    "--iterations",
+    type=click.IntRange(min=0),
+    default=100,
+    show_default=True,
+    help="Number of warm invocations.",
+)
+@click.option(
+    "--cold-starts",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of fresh interpreters to time.",
+)
+@click.option(
+    "--python",
+    default=sys.executable,
+    show_default="current interpreter",
+    help="Interpreter to invoke with.",
+)
+def invoke_function(
+    source_dir: str,
+    events: tuple[str, ...],
+    iterations: int,
+    cold_starts: int,
+    python: str,
+) -> None:
+    """Invoke a Lambda function locally and benchmark it."""
+    controller = create_function_controller(source_dir)
+    try:
+        controller.invoke(
+            event_paths=list(events),
+            iterations=iterations,
+            cold_starts=cold_starts,
+            python=python,
+        )
+    except RuntimeError as err:
+        controller.view.error(str(err))
+        sys.exit(1)
+
+
+@click.command("analyze-init")
+@click.argument("source-dir")
+@click.option(
+    "--event",
+    "events",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON event file; repeat to cycle through several events.",
+)
+@click.option(
+    "--iterations",
+    type=click.IntRange(min=0),
+    default=10,
+    show_default=True,
+    help="Number of warm invocations to compare the first one with.",
+)
+@click.option(
+    "--python",
+    default=sys.executable,
+    show_default="current interpreter",
+    help="Interpreter to invoke with.",
+)
+def analyze_init_function(
+    source_dir: str,
+    events: tuple[str, ...],
+    iterations: int,
+    python: str,
+) -> None:
+    """Split a cold start into init and first invocation, and check snapshot safety."""
+    controller = create_function_controller(source_dir)
+    try:
+        controller.analyze_init(
+            event_paths=list(events),
+            iterations=iterations,
+            python=python,
+        )
+    except RuntimeError as err:
+        controller.view.error(str(err))
+        sys.exit(1)
+
+
+@click.command("serve")
+@click.argument("source-dir", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--output-dir",
+    default=None,
+    help="Run the packaged artifact in this directory instead of the sources.",
+)
+@click.option(
+    "--event",
+    "events",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON event file; repeat to cycle through several events.",
+)
+@click.option(
+    "--requests",
+    type=click.IntRange(min=0),
+    default=100,
+    show_default=True,
+    help="Number of invocations; 0 serves invocations on --port until Ctrl+C.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of invocations in flight at once.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    show_default="concurrency",
+    help="Most execution environments (worker processes) to run at once.",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=9000,
+    show_default=True,
+    help="Port of the invoke endpoint when --requests is 0.",
+)
+@click.option(
+    "--python",
+    default=sys.executable,
+    show_default="current interpreter",
+    help="Interpreter to run execution environments with.",
+)
+def serve_function(**options: Any) -> None:
+    """Run a Lambda function behind an emulated Runtime API and load test it."""
+    serve_options = ServeOptions(**options)
+    controller = create_function_controller(
+        serve_options.source_dir, serve_options.output_dir
+    )
+    try:
+        controller.serve(
+            event_paths=list(serve_options.events),
+            requests=serve_options.requests,
+            concurrency=serve_options.concurrency,
+            workers=serve_options.workers,
+            port=serve_options.port,
+            python=serve_options.python,
+        )
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as err:
+        controller.view.error(str(err))
+        sys.exit(1)
@@ -1,12 +1,15 @@
-from .controllers import FunctionController, LayerController
-from .models import FunctionModel, LayerModel
-from .views import FunctionView, LayerView
+from .controllers import BatchController, FunctionController, LayerController
+from .models import BatchModel, FunctionModel, LayerModel
+from .views import BatchView, FunctionView, LayerView
 
 __all__ = [
+    "BatchController",
     "FunctionController",
     "LayerController",
+    "BatchModel",
     "FunctionModel",
     "LayerModel",
+    "BatchView",
     "FunctionView",
     "LayerView",
 ]
@@ -1,7 +1,9 @@
+from .batch_controller import BatchController
 from .function_controller import FunctionController
 from .layer_controller import LayerController
 
 __all__ = [
+    "BatchController",
     "FunctionController",
     "LayerController",
 ]
@@ -0,0 +1,275 @@
+"""
+This module contains the BatchController class.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from lambda_kit.mvc.controllers.function_controller import FunctionController
+from lambda_kit.mvc.controllers.layer_controller import LayerController
+from lambda_kit.mvc.models import BatchModel
+from lambda_kit.mvc.views import BatchView
+from lambda_kit.utils.aws_lambda import discover_components
+from lambda_kit.utils.tracing import Phase, summarize_phases, write_chrome_trace
+
+FUNCTION = "function"
+LAYER = "layer"
+
+
+@dataclass
+class BatchTask:
+    """
+    One function or layer to package.
+    """
+
+    kind: str
+    name: str
+    source_dir: str
+    output_dir: str
+    options: dict[str, Any]
+
+
+@dataclass
+class BatchResult:  # pylint: disable=too-many-instance-attributes
+    """
+    The outcome of packaging one function or layer.
+    """
+
+    kind: str
+    name: str
+    elapsed: float
+    succeeded: bool
+    file_count: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    cache_hit: bool = False
+    sha256: str = ""
+    messages: list[str] = field(default_factory=list)
+    phases: list[Phase] = field(default_factory=list)
+
+
+def package_component(task: BatchTask) -> BatchResult:
+    """
+    Package one function or layer, capturing its output.
+
+    This runs in a worker process, so it must be a module-level function.
+
+    :param task: The function or layer to package.
+    :return: The outcome.
+    """
+    controller: Any
+    if task.kind == FUNCTION:
+        controller = FunctionController.create()
+    else:
+        controller = LayerController.create()
+
+    messages: list[str] = []
+    controller.view.info_display_func = messages.append
+    controller.view.error_display_func = messages.append
+
+    model = controller.model
+    model.name = task.name
+    model.source_dir = task.source_dir
+    model.output_dir = task.output_dir
+    for key, value in task.options.items():
+        if key in type(model).model_fields:
+            setattr(model, key, value)
+
+    start = time.perf_counter()
+    try:
+        result = controller.package()
+    except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+        messages.append(f"{type(err).__name__}: {err}")
+        return BatchResult(
+            kind=task.kind,
+            name=task.name,
+            elapsed=time.perf_counter() - start,
+            succeeded=False,
+            messages=messages,
+            phases=_tag_phases(controller.view.tracer.phases, task),
+        )
+
+    return BatchResult(
+        kind=task.kind,
+        name=task.name,
+        elapsed=time.perf_counter() - start,
+        succeeded=True,
+        file_count=result.file_count,
+        bytes_read=result.bytes_read,
+        bytes_written=result.bytes_written,
+        cache_hit=result.cache_hit,
+        sha256=result.sha256,
+        messages=messages,
+        phases=_tag_phases(controller.view.tracer.phases, task),
+    )
+
+
+def _tag_phases(phases: list[Phase], task: BatchTask) -> list[Phase]:
+    """
+    Label each phase with the artifact it belongs to.
+    """
+    for phase in phases:
+        phase.args.setdefault("artifact", f"{task.kind} {task.name}")
+    return phases
+
+
+class BatchController:
+    """
+    The BatchController class is responsible for packaging many Lambda
+    functions and layers at once.
+    """
+
+    def __init__(self, model: BatchModel, view: BatchView):
+        """
+        Initialize a new BatchController with a view and a model.
+        """
+        self.model = model
+        self.view = view
+
+    def discover(self) -> list[BatchTask]:
+        """
+        Find the functions and layers to package under the root directory.
+
+        :return: One task per function or layer.
+        """
+        if self.model.root_dir is None:
+            raise ValueError("Root directory not set.")
+
+        if self.model.output_dir is None:
+            raise ValueError("Output directory not set.")
+
+        functions, layers = discover_components(
+            self.model.root_dir, exclude=[self.model.output_dir]
+        )
+        options = self.model.model_dump(
+            exclude={"root_dir", "output_dir", "jobs", "timings", "trace_path"}
+        )
+
+        tasks = []
+        for kind, directories in ((FUNCTION, functions), (LAYER, layers)):
+            for directory in directories:
+                tasks.append(
+                    BatchTask(
+                        kind=kind,
+                        name=self._artifact_name(directory),
+                        source_dir=directory,
+                        output_dir=self.model.output_dir,
+                        options=options,
+                    )
+                )
+        return tasks
+
+    def _artifact_name(self, directory: str) -> str:
+        """
+        Name an artifact after its path below the root, so names are unique.
+        """
+        root_dir = self.model.root_dir or "."
+        relative_path = os.path.relpath(directory, root_dir)
+        if relative_path == os.curdir:
+            return os.path.basename(os.path.abspath(root_dir))
+        return relative_path.replace(os.sep, "-")
+
+    def package(self) -> list[BatchResult]:
+        """
+        Package every function and layer under the root directory concurrently.
+
+        :return: The outcome per function or layer.
+        """
+        start = time.perf_counter()
+        tasks = self.discover()
+        self.view.info(
+            f"Found {sum(task.kind == FUNCTION for task in tasks)} functions and "
+            f"{sum(task.kind == LAYER for task in tasks)} layers "
+            f"under {self.model.root_dir}."
+        )
+
+        results: list[BatchResult] = []
+        if tasks:
+            with ProcessPoolExecutor(max_workers=self.model.jobs) as executor:
+                results = list(executor.map(package_component, tasks))
+
+        self.render_summary(results, time.perf_counter() - start)
+        self.report_phases(results)
+
+        if not all(result.succeeded for result in results):
+            sys.exit(1)
+
+        return results
+
+    def render_summary(self, results: list[BatchResult], elapsed: float) -> None:
+        """
+        Render a table of timings and sizes per artifact.
+
+        :param results: The outcome per function or layer.
+        :param elapsed: The wall time of the whole batch.
+        """
+        rows: list[tuple[object, ...]] = [
+            (
+                result.kind,
+                result.name,
+                (
+                    "cached"
+                    if result.cache_hit
+                    else "ok" if result.succeeded else "FAILED"
+                ),
+                result.file_count,
+                result.bytes_read,
+                result.bytes_written,
+                f"{result.elapsed:.2f}",
+            )
+            for result in results
+        ]
+        self.view.table(
+            ["Kind", "Name", "Status", "Files", "Bytes in", "Zip bytes", "Time (s)"],
+            rows,
+        )
+
+        for result in results:
+            fields = asdict(result)
+            fields["phases"] = [phase.to_dict() for phase in result.phases]
+            self.view.event("artifact", **fields)
+
+        for result in results:
+            if not result.succeeded:
+                self.view.error(f"{result.kind} {result.name} failed:")
+                for message in result.messages[-5:]:
+                    self.view.error(f"  {message}")
+
+        total_bytes = sum(result.bytes_written for result in results)
+        self.view.event(
+            "batch",
+            f"Packaged {len(results)} artifacts ({total_bytes} bytes) "
+            f"in {elapsed:.2f}s.",
+            artifact_count=len(results),
+            failed_count=sum(not result.succeeded for result in results),
+            bytes_written=total_bytes,
+            elapsed=elapsed,
+        )
+
+    def report_phases(self, results: list[BatchResult]) -> None:
+        """
+        Render the phases of every artifact, totalled by phase, and export
+        them all as one trace if asked to.
+
+        :param results: The outcome per function or layer.
+        """
+        phases = [phase for result in results for phase in result.phases]
+        self.view.render_phases(summarize_phases(phases), show_table=self.model.timings)
+        if self.model.trace_path is not None:
+            write_chrome_trace(phases, self.model.trace_path)
+            self.view.info(f"Trace written to {self.model.trace_path}")
+
+    @staticmethod
+    def create() -> "BatchController":
+        """
+        Create a new BatchController.
+        """
+        model = BatchModel()
+        view = BatchView()
+        controller = BatchController(model=model, view=view)
+
+        return controller
@@ -2,93 +2,661 @@
 This module contains the FunctionController class.
 """
 
+import json
 import os
 import sys
-from typing import Any
-
-from jinja2 import Environment, FileSystemLoader
+import tempfile
+import time
+import zipfile
+from dataclasses import asdict
+from typing import Optional
 
+from lambda_kit.mvc.controllers.package_controller import PackageController
 from lambda_kit.mvc.models import FunctionModel
 from lambda_kit.mvc.views import FunctionView
-from lambda_kit.utils.aws_lambda import is_python_lambda
+from lambda_kit.utils.aws_lambda import (
+    HandlerScanner,
+    find_handler_files,
+    find_lambda_handler,
+    find_lambda_handlers,
+)
+from lambda_kit.utils.bytecode import FUNCTION_ROOT
+from lambda_kit.utils.cache import CACHE_DIR_NAME
+from lambda_kit.utils.config import CONFIG_FILE_NAME, load_config
+from lambda_kit.utils.import_profile import (
+    flatten_profile,
+    module_name,
+    profile_imports,
+)
+from lambda_kit.utils.invoke import InitReport, analyze_init, invoke_handler
+from lambda_kit.utils.packaging import (
+    BUILD_DIR_NAME,
+    PackageResult,
+    collect_files,
+    exclude_under,
+)
+from lambda_kit.utils.runtime_api import (
+    LoadResult,
+    run_load_test,
+    serve_invocations,
+)
+from lambda_kit.utils.templates import (
+    DEFAULT_TEMPLATE,
+    HANDLER_FILE_NAME,
+    ScaffoldSpec,
+    render_handler,
+)
+from lambda_kit.utils.tracing import PhaseTracer
+from lambda_kit.utils.tree_shake import (
+    IMPORTS_CACHE_NAME,
+    ImportScanner,
+    describe_tree_shake_report,
+    load_tree_shake_config,
+    shake_sources,
+)
+from lambda_kit.utils.warm_path import (
+    Finding,
+    lint_handler_files,
+    lint_init_files,
+)
+from lambda_kit.utils.watch import (
+    DEFAULT_DEBOUNCE,
+    create_watcher,
+    wait_for_changes,
+)
 
 
-class FunctionController:
+class FunctionController(PackageController[FunctionModel]):
     """
     The FunctionController class is responsible for managing Lambda functions.
     """
 
-    def __init__(self, model: FunctionModel, view: FunctionView):
-        """
-        Initialize a new FunctionController
-        """
-        self.model = model
-        self.view = view
+    kind = "function"
+    bytecode_root = FUNCTION_ROOT
 
     def initialize(self) -> None:
         """
         Initialize a new Lambda function.
         """
-        lambda_template_name = "lambda_function_template.jinja2"
-
         if self.model.source_dir is None:
             raise ValueError("Source directory not set.")
 
-        if os.path.isdir(self.model.source_dir):
-            raise FileExistsError(
-                f"The directory '{self.model.source_dir}' already exists."
+        self.initialize_many(
+            [
+                ScaffoldSpec(
+                    source_dir=self.model.source_dir,
+                    template=self.model.template or DEFAULT_TEMPLATE,
+                )
+            ]
+        )
+
+    def initialize_many(self, specs: list[ScaffoldSpec]) -> None:
+        """
+        Initialize many new Lambda functions in one go.
+
+        Every handler is rendered before any directory is created, so a bad
+        template or an existing directory leaves nothing half scaffolded.
+
+        :param specs: The functions to scaffold.
+        """
+        seen = set()
+        for spec in specs:
+            source_dir = os.path.abspath(spec.source_dir)
+            if os.path.isdir(source_dir) or source_dir in seen:
+                raise FileExistsError(
+                    f"The directory '{spec.source_dir}' already exists."
+                )
+            seen.add(source_dir)
+
+        start = time.perf_counter()
+        rendered = [
+            render_handler(
+                spec.template, spec.context, template_dirs=self.model.template_dirs
             )
+            for spec in specs
+        ]
 
-        # Set up the Jinja2 environment
-        template_dir = "templates"
-        env = Environment(loader=FileSystemLoader(template_dir))
+        for spec, rendered_content in zip(specs, rendered):
+            self.view.info(
+                f"Initializing a new Lambda function from the {spec.template} template."
+            )
+            os.makedirs(spec.source_dir)
 
-        # Load the template
-        template = env.get_template(lambda_template_name)
+            output_path = os.path.join(spec.source_dir, HANDLER_FILE_NAME)
+            with open(output_path, "w", encoding="utf-8") as output_file:
+                output_file.write(rendered_content)
 
-        context: dict[str, Any] = {
-            "description": "A new Lambda function",
-            "status_code": 200,
-            "body_message": "Hello, World!",
-        }
+            self.view.info(f"Lambda function initialized in {spec.source_dir}.")
 
-        # Render the template with the provided context
-        rendered_content = template.render(context)
+        if len(specs) > 1:
+            self.view.info(
+                f"Initialized {len(specs)} Lambda functions "
+                f"in {time.perf_counter() - start:.2f}s."
+            )
 
-        # Write the rendered content to the output file
-        self.view.info("Initializing a new Lambda function.")
-        os.makedirs(self.model.source_dir)
+    def profile_imports(self, limit: int = 10, python: str = sys.executable) -> None:
+        """
+        Profile the imports of a Lambda function's handler module.
 
-        output_path = os.path.join(self.model.source_dir, "handler.py")
-        with open(output_path, "w", encoding="utf-8") as output_file:
-            output_file.write(rendered_content)
+        :param limit: The number of imports to show per level of the tree.
+        :param python: The interpreter to profile with.
+        """
+        if self.model.source_dir is None:
+            raise ValueError("Source directory not set.")
+
+        if self.model.output_dir is None:
+            raise ValueError("Output directory not set.")
+
+        handler_path = find_lambda_handler(self.model.source_dir, self.view.info)
+        if handler_path is None:
+            self.view.info(f"{self.model.source_dir} isn't a Python Lambda function.")
+            sys.exit(1)
+
+        module = module_name(self.model.source_dir, handler_path)
+        profile = profile_imports(self.model.source_dir, module, python=python)
 
-        # Add your initialization logic here
-        self.view.info(f"Lambda function initialized in {self.model.source_dir}.")
+        name = self.model.name or os.path.basename(
+            os.path.normpath(self.model.source_dir)
+        )
+        os.makedirs(self.model.output_dir, exist_ok=True)
+        json_path = os.path.join(self.model.output_dir, f"{name}.imports.json")
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(profile.to_dict(), file, indent=2)
 
-    def describe(self) -> None:
+        handler_roots = [root for root in profile.roots if root.name == module]
+        rows = [
+            (
+                "  " * depth + node.name,
+                f"{node.cumulative_us / 1000:.1f}",
+                f"{node.self_us / 1000:.1f}",
+            )
+            for depth, node in flatten_profile(handler_roots, limit)
+        ]
+        self.view.table(["Module", "Cumulative (ms)", "Self (ms)"], rows)
+        self.view.info(
+            f"Importing {module} took {profile.handler_us / 1000:.1f} ms "
+            f"({profile.total_us / 1000:.1f} ms including interpreter startup)."
+        )
+        self.view.event(
+            "import_profile",
+            f"Import profile written to {json_path}",
+            module=module,
+            handler_us=profile.handler_us,
+            total_us=profile.total_us,
+            profile_path=json_path,
+        )
+
+    def invoke(
+        self,
+        event_paths: Optional[list[str]] = None,
+        iterations: int = 100,
+        cold_starts: int = 1,
+        python: str = sys.executable,
+    ) -> None:
         """
-        Describe the contents of a Lambda function.
+        Invoke a Lambda function locally and report its latency.
+
+        :param event_paths: JSON event files to invoke the handler with.
+        :param iterations: The number of warm invocations.
+        :param cold_starts: The number of fresh interpreters to time.
+        :param python: The interpreter to invoke with.
         """
+        if self.model.source_dir is None:
+            raise ValueError("Source directory not set.")
+
+        handlers = find_lambda_handlers(self.model.source_dir, self.view.info)
+        if not handlers:
+            self.view.info(f"{self.model.source_dir} isn't a Python Lambda function.")
+            sys.exit(1)
+
+        handler_path, names = next(iter(handlers.items()))
+        handler = names[0]
+        module = module_name(self.model.source_dir, handler_path)
+
+        self.view.info(f"Invoking {module}.{handler} ({iterations} warm iterations)")
+        result = invoke_handler(
+            self.model.source_dir,
+            module,
+            handler,
+            event_paths=event_paths,
+            iterations=iterations,
+            cold_starts=cold_starts,
+            python=python,
+        )
 
-    def package(self) -> None:
+        rows = [
+            ("Cold start (median)", f"{result.cold_start_median_ms:.2f} ms"),
+            ("  Handler import", f"{result.import_ms:.2f} ms"),
+            ("  First invocation", f"{result.first_invoke_ms:.2f} ms"),
+            ("Warm p50", f"{result.warm_percentile_ms(50):.3f} ms"),
+            ("Warm p95", f"{result.warm_percentile_ms(95):.3f} ms"),
+            ("Warm p99", f"{result.warm_percentile_ms(99):.3f} ms"),
+            ("Peak RSS", f"{result.peak_rss_bytes / (1024 * 1024):.1f} MiB"),
+            ("Errors", len(result.errors)),
+        ]
+        self.view.table(["Metric", "Value"], rows)
+        self.view.event("invoke", module=module, handler=handler, **result.to_dict())
+        for error in sorted(set(result.errors)):
+            self.view.error(f"Handler raised {error}")
+
+    def analyze_init(
+        self,
+        event_paths: Optional[list[str]] = None,
+        iterations: int = 10,
+        python: str = sys.executable,
+    ) -> InitReport:
         """
-        Package a Lambda function.
+        Split a Lambda function's cold start into its init phase and first
+        invocation, and check what init leaves behind for a snapshot.
+
+        :param event_paths: JSON event files to invoke the handler with.
+        :param iterations: The number of warm invocations to compare with.
+        :param python: The interpreter to invoke with.
+        :return: The measurements.
         """
-        self.view.info(f"Packaging Lambda function: {self.model.name}")
-        self.view.info(f"Source directory: {self.model.source_dir}")
-        self.view.info(f"Output directory: {self.model.output_dir}")
-        # Add your packaging logic here
+        if self.model.source_dir is None:
+            raise ValueError("Source directory not set.")
+
+        handlers = find_lambda_handlers(self.model.source_dir, self.view.info)
+        if not handlers:
+            self.view.info(f"{self.model.source_dir} isn't a Python Lambda function.")
+            sys.exit(1)
+
+        handler_path, names = next(iter(handlers.items()))
+        handler = names[0]
+        module = module_name(self.model.source_dir, handler_path)
+
+        self.view.info(f"Analyzing the init phase of {module}.{handler}")
+        report = analyze_init(
+            self.model.source_dir,
+            module,
+            handler,
+            event_paths=event_paths,
+            iterations=iterations,
+            python=python,
+        )
+        mib = 1024 * 1024
+        self.view.table(
+            ["Metric", "Value"],
+            [
+                ("Cold start", f"{report.cold_start_ms:.2f} ms"),
+                ("  Runtime start", f"{report.runtime_start_ms:.2f} ms"),
+                ("  Init phase", f"{report.init_ms:.2f} ms"),
+                ("    CPU", f"{report.init_cpu_ms:.2f} ms"),
+                ("    Modules loaded", len(report.init.modules)),
+                ("    Memory added", f"{report.init.rss_growth_bytes / mib:.1f} MiB"),
+                ("  First invocation", f"{report.first_invoke_ms:.2f} ms"),
+                ("    Over warm p50", f"{report.first_invoke_overhead_ms:.2f} ms"),
+                ("    Modules loaded", len(report.first_invoke.modules)),
+                (
+                    "    Memory added",
+                    f"{report.first_invoke.rss_growth_bytes / mib:.1f} MiB",
+                ),
+                ("  Probes", f"{report.probe_ms:.2f} ms"),
+                ("Peak RSS", f"{report.peak_rss_bytes / mib:.1f} MiB"),
+            ],
+        )
+
+        if report.init.opened:
+            self.view.table(
+                ["Open after init", "Detail", "Snapshot"],
+                [
+                    (resource.kind, resource.detail, resource.advice)
+                    for resource in report.init.opened
+                ],
+            )
+
+        movable = [
+            (
+                "import",
+                name,
+                "imported by the first invocation; import it at module level",
+            )
+            for name in report.first_invoke.top_level_modules
+        ] + [
+            (
+                resource.kind,
+                resource.detail,
+                "opened by the first invocation; open it during init",
+            )
+            for resource in report.first_invoke.opened
+        ]
+        if movable:
+            self.view.table(["Could move to init", "Detail", "Advice"], movable)
+
+        findings = lint_init_files(report.init.source_files)
+        if findings:
+            self.view.table(
+                ["Location", "Rule", "Message"],
+                [
+                    (finding.location, finding.rule, finding.message)
+                    for finding in findings
+                ],
+            )
+        for finding in findings:
+            self.view.event("finding", **finding.to_dict())
+
+        self.view.event(
+            "analyze_init",
+            f"Init is {report.init_ms:.2f} ms of a {report.cold_start_ms:.2f} ms "
+            f"cold start; {len(findings)} snapshot issues.",
+            module=module,
+            handler=handler,
+            finding_count=len(findings),
+            **report.to_dict(),
+        )
+        for error in sorted(set(report.errors)):
+            self.view.error(f"Handler raised {error}")
+        return report
 
+    def serve(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        event_paths: Optional[list[str]] = None,
+        *,
+        requests: int = 100,
+        concurrency: int = 10,
+        workers: Optional[int] = None,
+        port: int = 9000,
+        python: str = sys.executable,
+    ) -> Optional[LoadResult]:
+        """
+        Run a Lambda function behind an emulated Runtime API and load test it.
+
+        When an output directory is set, the packaged artifact in it is
+        unzipped and run, exactly as Lambda would; otherwise the source
+        directory is run in place.
+
+        :param event_paths: JSON event files, used in turn.
+        :param requests: The number of invocations; 0 serves invocations on
+            ``port`` until interrupted instead.
+        :param concurrency: The number of invocations in flight at once.
+        :param workers: The most execution environments to run at once; as
+            many as the concurrency if omitted.
+        :param port: The port to serve invocations on when ``requests`` is 0.
+        :param python: The interpreter to run environments with.
+        :return: The measurements of the load test, if one was run.
+        """
         if self.model.source_dir is None:
             raise ValueError("Source directory not set.")
 
-        if is_python_lambda(self.model.source_dir, self.view.info):
-            self.view.info(f"Todo: Package Lambda function: {self.model.name}")
-        else:
+        handlers = find_lambda_handlers(self.model.source_dir, self.view.info)
+        if not handlers:
             self.view.info(f"{self.model.source_dir} isn't a Python Lambda function.")
             sys.exit(1)
 
+        handler_path, names = next(iter(handlers.items()))
+        handler = f"{module_name(self.model.source_dir, handler_path)}.{names[0]}"
+        name = self.model.name or os.path.basename(
+            os.path.normpath(self.model.source_dir)
+        )
+
+        with tempfile.TemporaryDirectory(prefix="kit-serve-") as task_root:
+            if self.model.output_dir is None:
+                task_root = self.model.source_dir
+            else:
+                zip_path = os.path.join(self.model.output_dir, f"{name}.zip")
+                if not os.path.isfile(zip_path):
+                    self.view.error(
+                        f"No package at {zip_path}; run 'kit function pack' first."
+                    )
+                    sys.exit(1)
+                with zipfile.ZipFile(zip_path) as archive:
+                    archive.extractall(task_root)
+                self.view.info(f"Unpacked {zip_path}")
+
+            environments = workers or concurrency
+            if requests == 0:
+                serve_invocations(
+                    task_root,
+                    handler,
+                    name,
+                    host="127.0.0.1",
+                    port=port,
+                    max_environments=environments,
+                    on_ready=lambda url: self.view.event(
+                        "serve", f"Serving {handler} at {url}", url=url
+                    ),
+                    on_invocation=lambda record: self.view.event(
+                        "invocation",
+                        f"Environment {record.environment}: "
+                        f"{record.latency_ms:.2f} ms"
+                        + (" (cold)" if record.cold else "")
+                        + (f" {record.error}" if record.error else ""),
+                        **asdict(record),
+                    ),
+                    python=python,
+                )
+                return None
+
+            payloads = []
+            for path in event_paths or []:
+                with open(path, "rb") as file:
+                    payloads.append(file.read())
+
+            self.view.info(
+                f"Invoking {handler} {requests} times, {concurrency} at a time, "
+                f"in up to {environments} environments"
+            )
+            result = run_load_test(
+                task_root,
+                handler,
+                name,
+                payloads or [b"{}"],
+                requests=requests,
+                concurrency=concurrency,
+                max_environments=environments,
+                python=python,
+            )
+
+        summary = result.to_dict()
+        self.view.table(
+            ["Metric", "Value"],
+            [
+                ("Invocations", len(result.invocations)),
+                ("Throughput", f"{result.throughput:.1f} /s"),
+                ("Latency p50", f"{summary['latency_p50_ms']:.2f} ms"),
+                ("Latency p90", f"{summary['latency_p90_ms']:.2f} ms"),
+                ("Latency p99", f"{summary['latency_p99_ms']:.2f} ms"),
+                ("Warm p50", f"{summary['warm_p50_ms']:.2f} ms"),
+                ("Cold starts", result.cold_starts),
+                ("Init (median)", f"{summary['init_median_ms']:.2f} ms"),
+                ("Errors", len(result.errors)),
+            ],
+        )
+
+        histogram = result.histogram()
+        most = max((count for _, count in histogram), default=0)
+        self.view.table(
+            ["Latency (ms)", "Invocations", ""],
+            [
+                (label, count, "#" * (count and max(1, round(40 * count / most))))
+                for label, count in histogram
+            ],
+        )
+
+        self.view.table(
+            ["Environment", "Started (s)", "Init (ms)", "Invocations", "Errors"],
+            [
+                (
+                    record.environment,
+                    f"{record.started_s:.3f}",
+                    f"{record.init_ms:.2f}",
+                    record.invocations,
+                    record.errors,
+                )
+                for record in result.environments
+            ],
+        )
+        self.view.event("serve", handler=handler, **summary)
+        for error in sorted(set(result.errors)):
+            self.view.error(f"Handler raised {error}")
+        return result
+
+    def lint(self) -> list[Finding]:
+        """
+        Find per-invocation work in the handlers of a function, or of every
+        function under a directory.
+
+        :return: The findings.
+        """
+        if self.model.source_dir is None:
+            raise ValueError("Source directory not set.")
+
+        exclude = [self.model.output_dir] if self.model.output_dir else []
+        handler_files = find_handler_files(self.model.source_dir, exclude=exclude)
+        findings = lint_handler_files(list(handler_files), workers=self.model.workers)
+
+        if findings:
+            self.view.table(
+                ["Location", "Handler", "Rule", "Message"],
+                [
+                    (finding.location, finding.handler, finding.rule, finding.message)
+                    for finding in findings
+                ],
+            )
+        for finding in findings:
+            self.view.event("finding", **finding.to_dict())
+
+        noun = "file" if len(handler_files) == 1 else "files"
+        self.view.event(
+            "lint",
+            f"Found {len(findings)} warm-path issues in "
+            f"{len(handler_files)} handler {noun}.",
+            file_count=len(handler_files),
+            finding_count=len(findings),
+        )
+        if findings:
+            sys.exit(1)
+        return findings
+
+    def package(self, scanner: Optional[HandlerScanner] = None) -> PackageResult:
+        """
+        Package a Lambda function.
+
+        :param scanner: The handler scanner to use; one with the default cache
+            if omitted.
+        :return: A summary of the packaging run.
+        """
+        source_dir, output_dir = self._start_package()
+
+        with self.view.tracer.phase("discover"):
+            handlers = find_lambda_handlers(source_dir, self.view.info, scanner)
+            if not handlers:
+                self.view.info(f"{source_dir} isn't a Python Lambda function.")
+                sys.exit(1)
+
+            name = self._artifact_name()
+            config = load_config(source_dir)
+
+            config_path = os.path.abspath(os.path.join(source_dir, CONFIG_FILE_NAME))
+            under_output_dir = exclude_under(output_dir)
+            sources = collect_files(
+                source_dir,
+                exclude=lambda path: path == config_path or under_output_dir(path),
+            )
+
+        shake_config = load_tree_shake_config(config)
+        if self.model.tree_shake or shake_config.enabled:
+            with self.view.tracer.phase("tree_shake"):
+                cache_path = None
+                if self.model.cache:
+                    cache_path = os.path.join(
+                        output_dir, CACHE_DIR_NAME, IMPORTS_CACHE_NAME
+                    )
+                sources, shake_report = shake_sources(
+                    sources,
+                    [module_name(source_dir, path) for path in handlers],
+                    shake_config,
+                    ImportScanner(cache_path, workers=self.model.workers),
+                )
+                self.view.event(
+                    "tree_shake",
+                    *describe_tree_shake_report(shake_report),
+                    modules=shake_report.modules,
+                    reachable=shake_report.reachable,
+                    removed={
+                        package: asdict(savings)
+                        for package, savings in shake_report.removed.items()
+                    },
+                    dynamic=shake_report.dynamic,
+                )
+
+        build_dir = os.path.join(output_dir, BUILD_DIR_NAME, name)
+        sources = self._prune(sources, config, build_dir)
+        sources = self._compile(sources, build_dir)
+        return self._finish_package(sources, name)
+
+    def watch(
+        self, debounce: float = DEFAULT_DEBOUNCE, max_rebuilds: Optional[int] = None
+    ) -> list[PackageResult]:
+        """
+        Package a Lambda function, then repackage it whenever its files change.
+
+        Rebuilds go through the cache, so only the entries of changed files are
+        compressed again, and share one handler scanner, so only changed
+        modules are parsed again.  A rebuild that fails, e.g. while the handler
+        is half edited, is reported and the watch goes on.
+
+        :param debounce: The seconds of quiet that end a burst of changes.
+        :param max_rebuilds: The number of rebuilds to stop after; watch until
+            interrupted if omitted.
+        :return: The results of the initial build and the rebuilds that succeeded.
+        """
+        if self.model.source_dir is None:
+            raise ValueError("Source directory not set.")
+
+        if self.model.output_dir is None:
+            raise ValueError("Output directory not set.")
+
+        if not self.model.cache:
+            self.view.info(
+                "The cache is disabled; every rebuild recompresses every file."
+            )
+
+        scanner = HandlerScanner()
+        watcher = create_watcher(
+            self.model.source_dir, exclude=exclude_under(self.model.output_dir)
+        )
+        try:
+            results = self._rebuild(scanner)
+            rebuilds = 0
+            while max_rebuilds is None or rebuilds < max_rebuilds:
+                self.view.info(
+                    f"Watching {self.model.source_dir} for changes "
+                    f"({watcher.name}); press Ctrl+C to stop."
+                )
+                self.view.flush()
+                changes = wait_for_changes(watcher, debounce)
+                noun = "file" if len(changes) == 1 else "files"
+                self.view.event(
+                    "change",
+                    f"{len(changes)} {noun} changed; repackaging.",
+                    paths=sorted(changes),
+                )
+                results.extend(self._rebuild(scanner))
+                rebuilds += 1
+        finally:
+            watcher.close()
+        return results
+
+    def _rebuild(self, scanner: HandlerScanner) -> list[PackageResult]:
+        """
+        Package the function while watching, reporting failures instead of
+        raising them.
+        """
+        self.view.tracer = PhaseTracer()
+        try:
+            return [self.package(scanner)]
+        except SystemExit:
+            # package() exits when no file defines a handler; while watching,
+            # that is just a state between two saves.
+            return []
+        except (OSError, ValueError) as err:
+            self.view.error(str(err))
+            return []
+        finally:
+            self.view.flush()
+
     @staticmethod
     def create() -> "FunctionController":
         """
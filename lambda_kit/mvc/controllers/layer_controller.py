@@ -4,23 +4,40 @@ This module contains the LayerController class.
 
 import os
 import sys
+from typing import Optional
 
+from lambda_kit.mvc.controllers.package_controller import PackageController
 from lambda_kit.mvc.models import LayerModel
 from lambda_kit.mvc.views import LayerView
+from lambda_kit.utils.artifact import LAMBDA_UNZIPPED_LIMIT, format_size
 from lambda_kit.utils.aws_lambda import is_python_layer
-
-
-class LayerController:
+from lambda_kit.utils.bytecode import LAYER_ROOT, current_python_version
+from lambda_kit.utils.config import load_config
+from lambda_kit.utils.layer_plan import (
+    MAX_LAYERS,
+    find_shared_packages,
+    plan_layers,
+    scan_artifact,
+    write_layer_sources,
+)
+from lambda_kit.utils.packaging import (
+    BUILD_DIR_NAME,
+    PackageResult,
+    collect_files,
+    exclude_under,
+    merge_sources,
+)
+from lambda_kit.utils.wheel_index import TargetPlatform, find_foreign_binaries
+from lambda_kit.utils.wheels import DEFAULT_WHEELHOUSE, install_requirements
+
+
+class LayerController(PackageController[LayerModel]):
     """
     The LayerController class is responsible for managing Lambda layers.
     """
 
-    def __init__(self, model: LayerModel, view: LayerView):
-        """
-        Initialize a new LayerController with a view and a model.
-        """
-        self.model = model
-        self.view = view
+    kind = "layer"
+    bytecode_root = LAYER_ROOT
 
     def initialize(self) -> None:
         """
@@ -28,11 +45,90 @@ class LayerController:
         """
         self.view.info(f"Todo: Initialize Lambda layer: {self.model.name}")
 
-    def describe(self) -> None:
+    def dedupe(
+        self,
+        max_layers: int = MAX_LAYERS,
+        max_size: Optional[int] = None,
+        limit: int = 20,
+        write_dir: Optional[str] = None,
+    ) -> None:
         """
-        Describe the contents of a Lambda layer.
+        Find packages duplicated across function packages and plan shared layers.
+
+        :param max_layers: The most layers to propose.
+        :param max_size: The unzipped limit for layers and functions.
+        :param limit: The number of shared packages to list.
+        :param write_dir: Where to write the proposed layers' sources, if given.
         """
-        self.view.info(f"Todo: Describe Lambda layer: {self.model.name}")
+        if self.model.output_dir is None:
+            raise ValueError("Output directory not set.")
+
+        zip_paths = sorted(
+            os.path.join(self.model.output_dir, file_name)
+            for file_name in os.listdir(self.model.output_dir)
+            if file_name.endswith(".zip")
+        )
+        artifacts = [scan_artifact(zip_path) for zip_path in zip_paths]
+        function_count = sum(not artifact.is_layer for artifact in artifacts)
+        self.view.info(
+            f"Scanned {function_count} function packages and "
+            f"{len(artifacts) - function_count} layers in {self.model.output_dir}."
+        )
+
+        shared = find_shared_packages(artifacts)
+        self.view.table(
+            ["Package", "Requirement", "Copies", "Size", "Saves", "Already in"],
+            [
+                (
+                    package.name,
+                    package.requirement or "-",
+                    len(package.functions),
+                    format_size(package.compressed_bytes),
+                    format_size(package.savings),
+                    ", ".join(package.layers) or "-",
+                )
+                for package in shared[:limit]
+            ],
+        )
+
+        plan = plan_layers(
+            artifacts,
+            max_layers=max_layers,
+            max_size=LAMBDA_UNZIPPED_LIMIT if max_size is None else max_size,
+        )
+        self.view.table(
+            ["Layer", "Packages", "Unzipped", "Zipped", "Functions"],
+            [
+                (
+                    layer.name,
+                    len(layer.packages),
+                    format_size(layer.uncompressed_bytes),
+                    format_size(layer.compressed_bytes),
+                    len(layer.functions),
+                )
+                for layer in plan.layers
+            ],
+        )
+        for package in plan.in_existing_layers:
+            self.view.info(
+                f"{package.name} is already in {', '.join(package.layers)}; "
+                f"attach it instead of shipping {package.name}."
+            )
+        for package in plan.unplaced:
+            self.view.error(f"{package.name} does not fit in any shared layer.")
+
+        saved = plan.bytes_before - plan.bytes_after
+        percent = saved / plan.bytes_before * 100 if plan.bytes_before else 0.0
+        self.view.info(
+            f"Function upload size: {format_size(plan.bytes_before)} -> "
+            f"{format_size(plan.bytes_after)} including shared layers "
+            f"({percent:.1f}% saved)."
+        )
+        self.view.event("layer_plan", **plan.to_dict())
+
+        if write_dir is not None:
+            for layer_dir in write_layer_sources(plan, write_dir):
+                self.view.info(f"Wrote layer source {layer_dir}")
 
     def is_layer(self) -> bool:
         """
@@ -54,39 +150,79 @@ class LayerController:
             self.view.info(f"Directory not found: {self.model.source_dir}")
             return False
 
-        required_files = ["python", "requirements.txt"]
-
-        for file in required_files:
-            file_path = os.path.join(self.model.source_dir, file)
-            if os.path.isdir(file_path):
-                self.view.info(f"Found required directory: {file_path}")
-            else:
-                self.view.info(f"Missing required directory: {file_path}")
+        required = [
+            ("python", os.path.isdir, "directory"),
+            ("requirements.txt", os.path.isfile, "file"),
+        ]
+        for name, exists, kind in required:
+            path = os.path.join(self.model.source_dir, name)
+            if not exists(path):
+                self.view.info(f"Missing required {kind}: {path}")
                 return False
+            self.view.info(f"Found required {kind}: {path}")
 
         self.view.info(f"{self.model.source_dir} appears to be a Python Lambda layer.")
 
         return True
 
-    def package(self) -> None:
+    def package(self) -> PackageResult:
         """
         Package a Lambda layer.
-        """
-        self.view.info(f"Packaging Lambda layer: {self.model.name}")
-        self.view.info(f"Source directory: {self.model.source_dir}")
-        self.view.info(f"Output directory: {self.model.output_dir}")
-        # Add your packaging logic here
 
-        if self.model.source_dir is None:
-            raise ValueError("Source directory not set.")
+        :return: A summary of the packaging run.
+        """
+        source_dir, output_dir = self._start_package()
+
+        tracer = self.view.tracer
+        with tracer.phase("discover"):
+            if not is_python_layer(source_dir, self.view.info):
+                self.view.info(
+                    f"{source_dir} does not appear to be a Python Lambda layer."
+                )
+                sys.exit(1)
+
+            name = self._artifact_name()
+            build_dir = os.path.join(output_dir, BUILD_DIR_NAME, name)
+            config = load_config(source_dir)
+
+        target = None
+        if self.model.architecture is not None:
+            target = TargetPlatform(
+                self.model.architecture,
+                self.model.python_version or current_python_version(),
+            )
 
-        if is_python_layer(self.model.source_dir, self.view.info):
-            self.view.info(f"Todo: Package Lambda layer: {self.model.name}")
-        else:
-            self.view.info(
-                f"{self.model.source_dir} does not appear to be a Python Lambda layer."
+        requirements = os.path.join(source_dir, "requirements.txt")
+        site_dir = os.path.join(build_dir, "python")
+        install_requirements(
+            requirements,
+            site_dir,
+            self.view.info,
+            wheelhouse=self.model.wheelhouse or DEFAULT_WHEELHOUSE,
+            offline=self.model.offline,
+            workers=self.model.workers,
+            tracer=tracer,
+            target=target,
+        )
+
+        with tracer.phase("collect"):
+            sources = merge_sources(
+                collect_files(
+                    os.path.join(source_dir, "python"),
+                    exclude=exclude_under(output_dir),
+                    prefix="python/",
+                ),
+                collect_files(site_dir, prefix="python/"),
             )
-            sys.exit(1)
+            if target is not None:
+                for arcname, machine in find_foreign_binaries(sources, target):
+                    self.view.error(
+                        f"{arcname} is built for {machine}, not {target.machine}."
+                    )
+
+        sources = self._prune(sources, config, build_dir)
+        sources = self._compile(sources, build_dir)
+        return self._finish_package(sources, name)
 
     @staticmethod
     def create() -> "LayerController":
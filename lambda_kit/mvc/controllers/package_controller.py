@@ -0,0 +1,251 @@
+"""
+This module contains the base class for controllers that package an artifact.
+
+A function and a layer are packaged by the same steps once their files are
+staged: prune, compile, zip through the cache, then report.  The steps live
+here, as does describing the artifact; each subclass discovers and stages its
+own files.
+"""
+
+import os
+import sys
+from dataclasses import asdict
+from typing import Any, Generic, Optional, TypeVar
+
+from lambda_kit.mvc.models import FunctionModel, LayerModel
+from lambda_kit.mvc.views.base_view import BaseView
+from lambda_kit.utils.artifact import (
+    LAMBDA_UNZIPPED_LIMIT,
+    check_budgets,
+    describe_artifact,
+    package_rows,
+    summary_rows,
+)
+from lambda_kit.utils.bytecode import compile_sources
+from lambda_kit.utils.cache import (
+    CACHE_DIR_NAME,
+    PackageCache,
+    build_cached_zip,
+    hash_requirements,
+)
+from lambda_kit.utils.packaging import (
+    STORED_SUFFIXES,
+    PackageResult,
+    ZipSource,
+    describe_package_result,
+    write_checksum_file,
+    write_zip,
+)
+from lambda_kit.utils.prune import (
+    describe_prune_report,
+    load_prune_config,
+    prune_sources,
+)
+from lambda_kit.utils.tracing import write_chrome_trace
+
+ModelT = TypeVar("ModelT", FunctionModel, LayerModel)
+
+
+class PackageController(Generic[ModelT]):  # pylint: disable=too-few-public-methods
+    """
+    Base class for the controllers of functions and layers.
+    """
+
+    # The kind of artifact, as used in messages, events and command names.
+    kind = ""
+
+    # The directory Lambda extracts the artifact to, recorded in its bytecode.
+    bytecode_root = ""
+
+    def __init__(self, model: ModelT, view: BaseView):
+        """
+        Initialize a new controller with a view and a model.
+        """
+        self.model: ModelT = model
+        self.view = view
+
+    def describe(
+        self,
+        max_size: Optional[int] = None,
+        max_cold_start_ms: Optional[float] = None,
+        limit: int = 10,
+    ) -> None:
+        """
+        Describe the packaged contents of the artifact and check its budgets.
+
+        :param max_size: The largest allowed unzipped size, in bytes.
+        :param max_cold_start_ms: The largest allowed cold-start estimate.
+        :param limit: The number of packages to list.
+        """
+        _, output_dir = self._directories()
+        name = self._artifact_name()
+        zip_path = os.path.join(output_dir, f"{name}.zip")
+        if not os.path.isfile(zip_path):
+            self.view.error(
+                f"No package at {zip_path}; run 'kit {self.kind} pack' first."
+            )
+            sys.exit(1)
+
+        report = describe_artifact(zip_path)
+        self.view.info(f"Lambda {self.kind}: {zip_path}")
+        self.view.table(["Metric", "Value"], summary_rows(report))
+        self.view.table(
+            ["Package", "Files", "Unzipped", "Zipped"], package_rows(report, limit)
+        )
+        self.view.event("describe", kind=self.kind, name=name, **report.to_dict())
+
+        violations = check_budgets(
+            report,
+            max_size=LAMBDA_UNZIPPED_LIMIT if max_size is None else max_size,
+            max_cold_start_ms=0.0 if max_cold_start_ms is None else max_cold_start_ms,
+        )
+        for violation in violations:
+            self.view.error(violation)
+        if violations:
+            sys.exit(1)
+
+    def _directories(self) -> tuple[str, str]:
+        """
+        Return the source and output directories, which must both be set.
+        """
+        if self.model.source_dir is None:
+            raise ValueError("Source directory not set.")
+
+        if self.model.output_dir is None:
+            raise ValueError("Output directory not set.")
+
+        return self.model.source_dir, self.model.output_dir
+
+    def _artifact_name(self) -> str:
+        """
+        Return the name of the artifact, after its source directory by default.
+        """
+        source_dir, _ = self._directories()
+        return self.model.name or os.path.basename(os.path.normpath(source_dir))
+
+    def _start_package(self) -> tuple[str, str]:
+        """
+        Announce a packaging run.
+
+        :return: The source and output directories.
+        """
+        self.view.info(f"Packaging Lambda {self.kind}: {self.model.name}")
+        self.view.info(f"Source directory: {self.model.source_dir}")
+        self.view.info(f"Output directory: {self.model.output_dir}")
+        return self._directories()
+
+    def _prune(
+        self, sources: list[ZipSource], config: dict[str, Any], build_dir: str
+    ) -> list[ZipSource]:
+        """
+        Drop the files Lambda never needs, if pruning is enabled.
+        """
+        prune_config = load_prune_config(config)
+        if not (self.model.prune or prune_config.enabled):
+            return sources
+
+        with self.view.tracer.phase("prune"):
+            sources, report = prune_sources(
+                sources,
+                prune_config,
+                os.path.join(build_dir, "stripped"),
+                workers=self.model.workers,
+            )
+            self.view.event(
+                "prune",
+                *describe_prune_report(report),
+                rules={rule: asdict(savings) for rule, savings in report.items()},
+            )
+        return sources
+
+    def _compile(self, sources: list[ZipSource], build_dir: str) -> list[ZipSource]:
+        """
+        Precompile the Python sources to bytecode, if compiling is enabled.
+        """
+        if not (self.model.compile_bytecode or self.model.pyc_only):
+            return sources
+
+        with self.view.tracer.phase("compile"):
+            compiled = compile_sources(
+                sources,
+                os.path.join(build_dir, "bytecode"),
+                python_version=self.model.python_version,
+                dfile_prefix=self.bytecode_root,
+                pyc_only=self.model.pyc_only,
+                workers=self.model.workers,
+            )
+            self.view.event(
+                "compile",
+                f"Compiled {compiled.compiled} Python files to bytecode.",
+                *(
+                    f"Could not compile {arcname}; packaging its source."
+                    for arcname in compiled.failed
+                ),
+                compiled=compiled.compiled,
+                failed=compiled.failed,
+            )
+        return compiled.sources
+
+    def _finish_package(self, sources: list[ZipSource], name: str) -> PackageResult:
+        """
+        Zip the staged files and report the artifact and the phases.
+        """
+        result = self._write_artifact(sources, name)
+
+        self.view.event(
+            "package",
+            describe_package_result(result),
+            f"SHA-256: {result.sha256}",
+            f"CodeSha256: {result.code_sha256}",
+            kind=self.kind,
+            name=name,
+            **result.to_dict(),
+        )
+        self._report_phases()
+
+        return result
+
+    def _report_phases(self) -> None:
+        """
+        Render the phases timed while packaging, and export them if asked to.
+        """
+        phases = self.view.tracer.phases
+        self.view.render_phases(phases, show_table=self.model.timings)
+        if self.model.trace_path is not None:
+            write_chrome_trace(phases, self.model.trace_path)
+            self.view.info(f"Trace written to {self.model.trace_path}")
+
+    def _write_artifact(self, sources: list[ZipSource], name: str) -> PackageResult:
+        """
+        Zip the staged files, through the cache when it is enabled.
+        """
+        source_dir, output_dir = self._directories()
+        zip_path = os.path.join(output_dir, f"{name}.zip")
+        store_suffixes = STORED_SUFFIXES if self.model.store_compressed else ()
+
+        if self.model.cache:
+            cache = PackageCache(os.path.join(output_dir, CACHE_DIR_NAME))
+            requirements = os.path.join(source_dir, "requirements.txt")
+            result = build_cached_zip(
+                sources,
+                zip_path,
+                cache,
+                name,
+                extra_inputs={"requirements": hash_requirements(requirements)},
+                workers=self.model.workers,
+                store_suffixes=store_suffixes,
+                tracer=self.view.tracer,
+            )
+        else:
+            with self.view.tracer.phase("zip") as phase:
+                result = write_zip(
+                    sources,
+                    zip_path,
+                    workers=self.model.workers,
+                    store_suffixes=store_suffixes,
+                )
+                phase.bytes_read = result.bytes_read
+                phase.bytes_written = result.bytes_written
+
+        write_checksum_file(result)
+        return result
@@ -1,4 +1,6 @@
+from .batch_model import BatchModel
 from .function_model import FunctionModel
 from .layer_model import LayerModel
+from .package_model import PackageModel
 
-__all__ = ["FunctionModel", "LayerModel"]
+__all__ = ["BatchModel", "FunctionModel", "LayerModel", "PackageModel"]
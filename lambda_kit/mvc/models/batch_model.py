@@ -0,0 +1,22 @@
+"""
+This module contains the data models for packaging many Lambda components.
+"""
+
+from typing import Optional
+
+from pydantic import Field
+
+from lambda_kit.mvc.models.package_model import PackageModel
+
+
+class BatchModel(PackageModel):
+    """
+    Represents a tree of AWS Lambda functions and layers
+    """
+
+    root_dir: Optional[str] = Field(default=None, alias="root_dir")
+    jobs: Optional[int] = Field(default=None, alias="jobs")
+    tree_shake: bool = Field(default=False, alias="tree_shake")
+    wheelhouse: Optional[str] = Field(default=None, alias="wheelhouse")
+    offline: bool = Field(default=False, alias="offline")
+    architecture: Optional[str] = Field(default=None, alias="architecture")
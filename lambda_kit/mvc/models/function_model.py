@@ -4,14 +4,18 @@ This module contains the data models for AWS Lambda functions.
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from lambda_kit.mvc.models.package_model import PackageModel
 
-class FunctionModel(BaseModel):
+
+class FunctionModel(PackageModel):
     """
     Represents an AWS Lambda function
     """
 
     name: Optional[str] = Field(default=None, alias="name")
     source_dir: Optional[str] = Field(default=None, alias="source_dir")
-    output_dir: Optional[str] = Field(default=None, alias="output_dir")
+    tree_shake: bool = Field(default=False, alias="tree_shake")
+    template: Optional[str] = Field(default=None, alias="template")
+    template_dirs: list[str] = Field(default_factory=list, alias="template_dirs")
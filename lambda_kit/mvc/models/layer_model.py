@@ -4,14 +4,18 @@ This module contains the data models for AWS Lambda layers.
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from lambda_kit.mvc.models.package_model import PackageModel
 
-class LayerModel(BaseModel):
+
+class LayerModel(PackageModel):
     """
     Represents an AWS Lambda layer
     """
 
     name: Optional[str] = Field(default=None, alias="name")
     source_dir: Optional[str] = Field(default=None, alias="source_dir")
-    output_dir: Optional[str] = Field(default=None, alias="output_dir")
+    wheelhouse: Optional[str] = Field(default=None, alias="wheelhouse")
+    offline: bool = Field(default=False, alias="offline")
+    architecture: Optional[str] = Field(default=None, alias="architecture")
@@ -0,0 +1,24 @@
+"""
+This module contains the data model shared by the models of packaged artifacts.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PackageModel(BaseModel):
+    """
+    Represents the options of every packaging command
+    """
+
+    output_dir: Optional[str] = Field(default=None, alias="output_dir")
+    workers: Optional[int] = Field(default=None, alias="workers")
+    cache: bool = Field(default=True, alias="cache")
+    prune: bool = Field(default=False, alias="prune")
+    compile_bytecode: bool = Field(default=False, alias="compile_bytecode")
+    python_version: Optional[str] = Field(default=None, alias="python_version")
+    pyc_only: bool = Field(default=False, alias="pyc_only")
+    store_compressed: bool = Field(default=False, alias="store_compressed")
+    timings: bool = Field(default=False, alias="timings")
+    trace_path: Optional[str] = Field(default=None, alias="trace_path")
@@ -2,7 +2,8 @@
 This package contains the views for the Lambda Kit application.
 """
 
+from .batch_view import BatchView
 from .function_view import FunctionView
 from .layer_view import LayerView
 
-__all__ = ["LayerView", "FunctionView"]
+__all__ = ["BatchView", "LayerView", "FunctionView"]
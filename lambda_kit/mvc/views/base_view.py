@@ -1,5 +1,27 @@
+"""
+This module contains the base class for views.
+
+Views render text by default.  In JSON mode every message, table and event is
+rendered as one JSON object per line (NDJSON), stamped with the seconds since
+the view was created.  JSON lines are buffered and written in batches rather
+than one at a time, so call ``flush`` when the command is done.
+
+Each view carries a ``PhaseTracer`` its controller times its phases with.
+"""
+
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Any, Callable, Sequence
+
+from lambda_kit.utils.tracing import PHASE_HEADERS, Phase, PhaseTracer, phase_rows
+
+TEXT_OUTPUT = "text"
+JSON_OUTPUT = "json"
+OUTPUT_FORMATS = (TEXT_OUTPUT, JSON_OUTPUT)
+
+# The number of JSON lines held before they are written.
+FLUSH_THRESHOLD = 256
 
 
 class BaseView(ABC):
@@ -10,6 +32,10 @@ class BaseView(ABC):
     def __init__(self) -> None:
         self.info_display_func: Callable[[str], None] = print
         self.error_display_func: Callable[[str], None] = print
+        self.output_format = TEXT_OUTPUT
+        self.buffer: list[str] = []
+        self.started = time.perf_counter()
+        self.tracer = PhaseTracer()
 
     @abstractmethod
     def info(self, message: str) -> None:
@@ -27,7 +53,89 @@ class BaseView(ABC):
         """
         Render a message.
         """
-        if is_error and self.error_display_func is not None:
+        if self.output_format == JSON_OUTPUT:
+            level = "error" if is_error else "info"
+            self.emit({"event": "message", "level": level, "message": message})
+        elif is_error and self.error_display_func is not None:
             self.error_display_func(message)
         else:
             self.info_display_func(message)
+
+    def event(self, event_name: str, *messages: str, **fields: Any) -> None:
+        """
+        Render a structured event.
+
+        In text mode only the messages are rendered, one per line.  In JSON
+        mode only the event name and its fields are.
+
+        :param event_name: The kind of event, e.g. ``package``.
+        :param messages: Lines describing the event for people.
+        :param fields: The event's data; values must be JSON serializable.
+        """
+        if self.output_format == JSON_OUTPUT:
+            self.emit({"event": event_name, **fields})
+        else:
+            for message in messages:
+                self.info(message)
+
+    def emit(self, record: dict[str, Any]) -> None:
+        """
+        Buffer one JSON line, writing the buffer out once it is full.
+        """
+        elapsed = round(time.perf_counter() - self.started, 6)
+        self.buffer.append(json.dumps({**record, "t": elapsed}, default=str))
+        if len(self.buffer) >= FLUSH_THRESHOLD:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write out any buffered JSON lines.
+        """
+        if self.buffer:
+            lines, self.buffer = self.buffer, []
+            self.info_display_func("\n".join(lines))
+
+    def render_phases(self, phases: list[Phase], show_table: bool = False) -> None:
+        """
+        Render the phases of a packaging run as events, and optionally a table.
+
+        :param phases: The phases, e.g. from ``self.tracer``.
+        :param show_table: Whether to also render a table of the phases.
+        """
+        for phase in phases:
+            self.event("phase", **phase.to_dict())
+        if show_table:
+            self.table(PHASE_HEADERS, phase_rows(phases))
+
+    def table(self, headers: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+        """
+        Render rows as a table with aligned columns.
+
+        :param headers: The column headings.
+        :param rows: The rows, one value per column.
+        """
+        if self.output_format == JSON_OUTPUT:
+            self.emit(
+                {
+                    "event": "table",
+                    "headers": list(headers),
+                    "rows": [list(row) for row in rows],
+                }
+            )
+            return
+
+        cells = [[str(value) for value in row] for row in rows]
+        widths = [
+            max([len(header)] + [len(row[index]) for row in cells])
+            for index, header in enumerate(headers)
+        ]
+
+        def format_row(values: Sequence[str]) -> str:
+            return "  ".join(
+                value.ljust(width) for value, width in zip(values, widths)
+            ).rstrip()
+
+        self.info(format_row(headers))
+        self.info(format_row(["-" * width for width in widths]))
+        for row in cells:
+            self.info(format_row(row))
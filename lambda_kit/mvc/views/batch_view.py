@@ -0,0 +1,23 @@
+"""
+This module contains a view for the BatchController class.
+"""
+
+from lambda_kit.mvc.views.base_view import BaseView
+
+
+class BatchView(BaseView):
+    """
+    The BatchView class renders the output of the BatchController class.
+    """
+
+    def info(self, message: str) -> None:
+        """
+        Render the output of the BatchController class.
+        """
+        self.render_message(message, is_error=False)
+
+    def error(self, message: str) -> None:
+        """
+        Render an error message.
+        """
+        self.render_message(message, is_error=True)
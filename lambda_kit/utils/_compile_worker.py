@@ -0,0 +1,76 @@
+"""
+Compile Python sources to bytecode for the interpreter running this script.
+
+This script is executed by the *target* interpreter, so it must only import
+the standard library.  It reads a JSON job from standard input and writes a
+JSON object to standard output listing the ``[arcname, pyc_path]`` pairs that
+were compiled and the archive names of the sources that failed to compile.
+
+A staged ``.pyc`` is reused only when its header holds this interpreter's
+magic number and the hash of the current source.  Modification times are not
+trusted: unchecked-hash bytecode is never revalidated by the Lambda runtime,
+and copies and extracted archives can make a changed source look older.
+"""
+
+import importlib.util
+import json
+import os
+import py_compile
+import sys
+
+
+def is_current(pyc_path: str, source: bytes) -> bool:
+    try:
+        with open(pyc_path, "rb") as file:
+            header = file.read(16)
+    except OSError:
+        return False
+    return (
+        header[:4] == importlib.util.MAGIC_NUMBER
+        and int.from_bytes(header[4:8], "little") == 0b01
+        and header[8:16] == importlib.util.source_hash(source)
+    )
+
+
+def main() -> None:
+    job = json.load(sys.stdin)
+    staging_dir = job["staging_dir"]
+    cache_tag = sys.implementation.cache_tag
+    compiled = []
+    failed = []
+
+    for source_path, arcname in job["files"]:
+        directory, _, file_name = arcname.rpartition("/")
+        module = file_name[: -len(".py")]
+        if job["pyc_only"]:
+            pyc_arcname = f"{arcname}c"
+        else:
+            prefix = f"{directory}/" if directory else ""
+            pyc_arcname = f"{prefix}__pycache__/{module}.{cache_tag}.pyc"
+
+        pyc_path = os.path.join(staging_dir, *pyc_arcname.split("/"))
+        try:
+            with open(source_path, "rb") as file:
+                source = file.read()
+        except OSError:
+            failed.append(arcname)
+            continue
+        if not is_current(pyc_path, source):
+            try:
+                py_compile.compile(
+                    source_path,
+                    cfile=pyc_path,
+                    dfile=job["dfile_prefix"] + arcname,
+                    doraise=True,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+            except py_compile.PyCompileError:
+                failed.append(arcname)
+                continue
+        compiled.append([pyc_arcname, pyc_path])
+
+    json.dump({"compiled": compiled, "failed": failed}, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
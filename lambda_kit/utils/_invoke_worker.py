@@ -0,0 +1,269 @@
+"""
+Invoke a Lambda handler in this interpreter and time it.
+
+This script runs in a fresh interpreter, so it must only import the standard
+library.  It reads a JSON job from standard input.  Output written by the
+handler is redirected to standard error; standard output carries the protocol:
+a ``ready`` line once the first (cold) invocation returns, then one JSON line
+with the measurements.
+
+With ``analyze_init`` set in the job, the init phase (importing the handler
+module) and the first invocation are also probed separately: the modules each
+one loads, the resident memory it adds, and the threads, sockets, pipes and
+files it leaves open.
+"""
+
+import gc
+import importlib
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Any, Callable, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+
+class Context:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """
+    A stand-in for the Lambda context object, with its attributes.
+    """
+
+    def __init__(self, function_name: str, timeout_ms: int, memory_mb: int):
+        self.function_name = function_name
+        self.function_version = "$LATEST"
+        self.invoked_function_arn = (
+            f"arn:aws:lambda:us-east-1:000000000000:function:{function_name}"
+        )
+        self.memory_limit_in_mb = memory_mb
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = f"/aws/lambda/{function_name}"
+        self.log_stream_name = "local"
+        self.identity = None
+        self.client_context = None
+        self._deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_bytes()
+
+
+def describe_socket(sock: Optional[Any], target: str) -> str:
+    if sock is None:
+        return target
+    for describe, method in (
+        ("connected to", "getpeername"),
+        ("bound to", "getsockname"),
+    ):
+        try:
+            address = getattr(sock, method)()
+        except OSError:
+            continue
+        if address:
+            return f"{target} {describe} {address}"
+    return target
+
+
+def open_resources() -> dict[str, list[str]]:
+    """
+    Describe the running threads and open file descriptors, keyed so that the
+    same resource has the same key in two snapshots.
+    """
+    # Imported here, so that plain invocations do not pay for them.
+    # pylint: disable=import-outside-toplevel
+    import socket
+    import threading
+
+    resources = {}
+    for thread in threading.enumerate():
+        daemon = " (daemon)" if thread.daemon else ""
+        resources[f"thread:{thread.ident}"] = ["thread", thread.name + daemon]
+
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return resources
+
+    sockets = {}
+    for obj in gc.get_objects():
+        if isinstance(obj, socket.socket) and obj.fileno() >= 0:
+            sockets[obj.fileno()] = obj
+
+    for name in os.listdir(fd_dir):
+        try:
+            target = os.readlink(os.path.join(fd_dir, name))
+        except OSError:
+            continue  # The descriptor listdir itself used.
+        if target.startswith("socket:"):
+            entry = ["socket", describe_socket(sockets.get(int(name)), target)]
+        elif target.startswith("pipe:"):
+            entry = ["pipe", target]
+        elif target.startswith("anon_inode:"):
+            entry = ["anon_inode", target]
+        else:
+            entry = ["file", target]
+        resources[f"fd:{name}:{target}"] = entry
+    return resources
+
+
+class Probe:  # pylint: disable=too-few-public-methods
+    """
+    Measures what a phase of the worker loads and leaves open.
+    """
+
+    def __init__(self, source_dir: str):
+        self.source_dir = os.path.join(os.path.abspath(source_dir), "")
+        self.resources = open_resources()
+        self.rss = current_rss_bytes()
+        self.modules = set(sys.modules)
+
+    def finish(self) -> dict[str, Any]:
+        modules = sorted(set(sys.modules) - self.modules)
+        resources = open_resources()
+        source_files = []
+        for name in modules:
+            path = getattr(sys.modules[name], "__file__", None) or ""
+            if path.endswith(".py") and path.startswith(self.source_dir):
+                source_files.append(path)
+        rss = current_rss_bytes()
+        return {
+            "modules": modules,
+            "source_files": source_files,
+            "opened": [
+                entry for key, entry in resources.items() if key not in self.resources
+            ],
+            "rss_bytes": rss,
+            "rss_growth_bytes": rss - self.rss,
+        }
+
+
+def load_events(paths: list[str]) -> list[Any]:
+    events = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as file:
+            events.append(json.load(file))
+    return events or [{}]
+
+
+def probe_phase(
+    source_dir: Optional[str], phase: Callable[[], T]
+) -> tuple[T, Optional[dict[str, Any]], int]:
+    """
+    Run a phase, probing it when a source directory is given.
+
+    :return: The phase's result, what it loaded and left open, and the time
+        spent probing, in nanoseconds.
+    """
+    if source_dir is None:
+        return phase(), None, 0
+    start = time.perf_counter_ns()
+    probe = Probe(source_dir)
+    probe_ns = time.perf_counter_ns() - start
+    result = phase()
+    start = time.perf_counter_ns()
+    found = probe.finish()
+    return result, found, probe_ns + time.perf_counter_ns() - start
+
+
+def import_handler(module: str, handler: str) -> tuple[Any, int, int]:
+    """
+    Import a handler, timing it.
+
+    :return: The handler, and the wall and CPU time of the import, in
+        nanoseconds.
+    """
+    start = time.perf_counter_ns()
+    cpu_start = time.process_time_ns()
+    loaded = importlib.import_module(module)
+    import_ns = time.perf_counter_ns() - start
+    import_cpu_ns = time.process_time_ns() - cpu_start
+    return getattr(loaded, handler), import_ns, import_cpu_ns
+
+
+def cold_start(
+    job: dict[str, Any], invoke: Callable[[Any, int], int]
+) -> tuple[Any, dict[str, Any]]:
+    """
+    Import the handler and invoke it once, probing both if the job asks to.
+
+    :return: The handler and the measurements of the cold start.
+    """
+    source_dir = job["source_dir"] if job.get("analyze_init", False) else None
+    (handler, import_ns, import_cpu_ns), init, init_probe_ns = probe_phase(
+        source_dir, lambda: import_handler(job["module"], job["handler"])
+    )
+    first_invoke_ns, first_invoke, invoke_probe_ns = probe_phase(
+        source_dir, lambda: invoke(handler, 0)
+    )
+
+    result: dict[str, Any] = {
+        "import_ns": import_ns,
+        "first_invoke_ns": first_invoke_ns,
+    }
+    if source_dir is not None:
+        result.update(
+            import_cpu_ns=import_cpu_ns,
+            probe_ns=init_probe_ns + invoke_probe_ns,
+            init=init,
+            first_invoke=first_invoke,
+        )
+    return handler, result
+
+
+def main() -> None:
+    job = json.load(sys.stdin)
+
+    protocol = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+
+    # Like Lambda, start sys.path with the function, not this script's directory,
+    # so the handler cannot import lambda_kit's own modules by accident.
+    sys.path[0] = job["source_dir"]
+    events = load_events(job["events"])
+    errors: list[str] = []
+
+    def invoke(handler: Any, index: int) -> int:
+        context = Context(job["function_name"], job["timeout_ms"], job["memory_mb"])
+        start = time.perf_counter_ns()
+        try:
+            handler(events[index % len(events)], context)
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append(f"{type(err).__name__}: {err}")
+        return time.perf_counter_ns() - start
+
+    handler, result = cold_start(job, invoke)
+    protocol.write("ready\n")
+    protocol.flush()
+
+    result.update(
+        warm_ns=[invoke(handler, index + 1) for index in range(job["iterations"])],
+        peak_rss_bytes=peak_rss_bytes(),
+        errors=errors,
+    )
+    protocol.write(json.dumps(result) + "\n")
+    protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
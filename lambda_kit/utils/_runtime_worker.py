@@ -0,0 +1,111 @@
+"""
+A minimal Lambda runtime client, run as one execution environment.
+
+This script runs in a fresh interpreter, so it must only import the standard
+library.  Like the bootstrap of a Lambda runtime, it imports the handler named
+by ``_HANDLER`` from ``LAMBDA_TASK_ROOT``, then loops: it fetches the next
+invocation from the Runtime API at ``AWS_LAMBDA_RUNTIME_API`` and posts the
+handler's result or error back.  Import failures are posted to the init error
+endpoint, and the process exits.
+"""
+
+import http.client
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Any, Optional
+
+RUNTIME_API_PREFIX = "/2018-06-01/runtime"
+
+
+class Context:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """
+    The Lambda context object, built from the headers of an invocation.
+    """
+
+    def __init__(self, request_id: str, deadline_ms: int, function_arn: str):
+        self.function_name = os.environ["AWS_LAMBDA_FUNCTION_NAME"]
+        self.function_version = os.environ["AWS_LAMBDA_FUNCTION_VERSION"]
+        self.invoked_function_arn = function_arn
+        self.memory_limit_in_mb = int(os.environ["AWS_LAMBDA_FUNCTION_MEMORY_SIZE"])
+        self.aws_request_id = request_id
+        self.log_group_name = os.environ["AWS_LAMBDA_LOG_GROUP_NAME"]
+        self.log_stream_name = os.environ["AWS_LAMBDA_LOG_STREAM_NAME"]
+        self.identity = None
+        self.client_context = None
+        self._deadline_ms = deadline_ms
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, self._deadline_ms - int(time.time() * 1000))
+
+
+def error_payload(err: BaseException) -> bytes:
+    return json.dumps(
+        {
+            "errorMessage": str(err),
+            "errorType": type(err).__name__,
+            # Like Lambda, show the function's frames, not the runtime's.
+            "stackTrace": traceback.format_list(
+                [
+                    frame
+                    for frame in traceback.extract_tb(err.__traceback__)
+                    if frame.filename != __file__
+                ]
+            ),
+        }
+    ).encode("utf-8")
+
+
+def post(connection: http.client.HTTPConnection, path: str, body: bytes) -> None:
+    connection.request(
+        "POST", path, body=body, headers={"Content-Type": "application/json"}
+    )
+    connection.getresponse().read()
+
+
+def main() -> int:
+    # Lambda's sys.path starts with the task root, not the runtime's directory.
+    task_root = os.environ["LAMBDA_TASK_ROOT"]
+    sys.path[0] = task_root
+
+    connection = http.client.HTTPConnection(os.environ["AWS_LAMBDA_RUNTIME_API"])
+    module_name, _, function_name = os.environ["_HANDLER"].rpartition(".")
+    try:
+        handler = getattr(importlib.import_module(module_name), function_name)
+    except Exception as err:  # pylint: disable=broad-except
+        post(connection, f"{RUNTIME_API_PREFIX}/init/error", error_payload(err))
+        return 1
+
+    while True:
+        connection.request("GET", f"{RUNTIME_API_PREFIX}/invocation/next")
+        response = connection.getresponse()
+        event: Any = json.loads(response.read())
+        request_id = response.getheader("Lambda-Runtime-Aws-Request-Id", "")
+        context = Context(
+            request_id,
+            int(response.getheader("Lambda-Runtime-Deadline-Ms", "0")),
+            response.getheader("Lambda-Runtime-Invoked-Function-Arn", ""),
+        )
+        os.environ["_X_AMZN_TRACE_ID"] = response.getheader(
+            "Lambda-Runtime-Trace-Id", ""
+        )
+
+        error: Optional[bytes] = None
+        try:
+            result = json.dumps(handler(event, context)).encode("utf-8")
+        except Exception as err:  # pylint: disable=broad-except
+            error = error_payload(err)
+
+        if error is None:
+            path = f"{RUNTIME_API_PREFIX}/invocation/{request_id}/response"
+            post(connection, path, result)
+        else:
+            path = f"{RUNTIME_API_PREFIX}/invocation/{request_id}/error"
+            post(connection, path, error)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
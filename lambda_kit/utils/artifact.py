@@ -0,0 +1,261 @@
+"""
+This module contains utility functions for describing packaged artifacts.
+
+The report covers what Lambda limits and what drives cold starts: unzipped
+size, the biggest top-level packages, native extensions, and the bytes of
+code Python has to load.  The cold-start estimate converts those bytes to
+time using rates measured with ``python -X importtime``.  Sources are costed
+at the rate for compiling and executing them.  Bytecode is costed at the
+lower rate for only executing it.  The estimate assumes everything packaged
+is imported, so it is an upper bound.
+"""
+
+# artifact.py
+
+import posixpath
+import re
+import zipfile
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+# Lambda rejects functions whose code and layers exceed this size unzipped.
+LAMBDA_UNZIPPED_LIMIT = 250 * 1024 * 1024
+
+# Import cost per megabyte of code, measured on popular pure-Python packages.
+SOURCE_MS_PER_MB = 800.0
+BYTECODE_MS_PER_MB = 150.0
+NATIVE_EXTENSION_MS = 2.0
+
+_LAYER_PREFIX = re.compile(r"^python/(lib/python[^/]+/site-packages/)?")
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmg]i?b?|b)?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1000,
+    "kb": 1000,
+    "kib": 1024,
+    "m": 1000**2,
+    "mb": 1000**2,
+    "mib": 1024**2,
+    "g": 1000**3,
+    "gb": 1000**3,
+    "gib": 1024**3,
+}
+
+
+@dataclass
+class PackageSize:
+    """
+    The files of one top-level package or module in an artifact.
+    """
+
+    name: str
+    file_count: int = 0
+    uncompressed_bytes: int = 0
+    compressed_bytes: int = 0
+
+
+@dataclass
+class ArtifactReport:  # pylint: disable=too-many-instance-attributes
+    """
+    The size and cold-start profile of a packaged artifact.
+    """
+
+    zip_path: str
+    file_count: int = 0
+    uncompressed_bytes: int = 0
+    compressed_bytes: int = 0
+    source_bytes: int = 0
+    bytecode_bytes: int = 0
+    packages: list[PackageSize] = field(default_factory=list)
+    native_extensions: list[str] = field(default_factory=list)
+
+    @property
+    def estimated_cold_start_ms(self) -> float:
+        """
+        The estimated time to import everything in the artifact.
+        """
+        megabyte = 1024 * 1024
+        return (
+            self.source_bytes / megabyte * SOURCE_MS_PER_MB
+            + self.bytecode_bytes / megabyte * BYTECODE_MS_PER_MB
+            + len(self.native_extensions) * NATIVE_EXTENSION_MS
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the report to plain data for JSON output.
+        """
+        return {
+            **asdict(self),
+            "estimated_cold_start_ms": self.estimated_cold_start_ms,
+        }
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a size such as ``250MB``, ``50MiB`` or ``1048576``.
+
+    :param value: The size, with an optional decimal or binary unit.
+    :return: The size in bytes.
+    :raises ValueError: If the size cannot be parsed.
+    """
+    match = _SIZE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[(unit or "").lower()])
+
+
+def is_native_extension(arcname: str) -> bool:
+    """
+    Determine if a file is a compiled extension module or shared library.
+    """
+    base_name = posixpath.basename(arcname)
+    return base_name.endswith((".so", ".pyd")) or ".so." in base_name
+
+
+def strip_layer_prefix(arcname: str) -> str:
+    """
+    Return a layer file's path relative to the directory Lambda imports from.
+    """
+    return _LAYER_PREFIX.sub("", arcname)
+
+
+def top_level_name(arcname: str) -> str:
+    """
+    Return the top-level package or module a file in an artifact belongs to.
+
+    Layer paths are read relative to their ``python/`` directory.
+    """
+    parts = strip_layer_prefix(arcname).split("/")
+    if len(parts) == 1 or parts[0] == "__pycache__":
+        return parts[-1].split(".")[0]
+    return parts[0]
+
+
+def _source_for_bytecode(arcname: str) -> str:
+    directory, base_name = posixpath.split(arcname)
+    if posixpath.basename(directory) == "__pycache__":
+        directory = posixpath.dirname(directory)
+    return posixpath.join(directory, base_name.split(".")[0] + ".py")
+
+
+def describe_artifact(zip_path: str) -> ArtifactReport:
+    """
+    Measure a packaged artifact.
+
+    :param zip_path: The artifact.
+    :return: The report, with packages largest first.
+    """
+    report = ArtifactReport(zip_path=zip_path)
+    packages: dict[str, PackageSize] = {}
+    sources: dict[str, int] = {}
+    compiled_sources = set()
+
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            report.file_count += 1
+            report.uncompressed_bytes += info.file_size
+            report.compressed_bytes += info.compress_size
+
+            name = top_level_name(info.filename)
+            package = packages.setdefault(name, PackageSize(name=name))
+            package.file_count += 1
+            package.uncompressed_bytes += info.file_size
+            package.compressed_bytes += info.compress_size
+
+            if info.filename.endswith(".py"):
+                sources[info.filename] = info.file_size
+            elif info.filename.endswith(".pyc"):
+                report.bytecode_bytes += info.file_size
+                compiled_sources.add(_source_for_bytecode(info.filename))
+            elif is_native_extension(info.filename):
+                report.native_extensions.append(info.filename)
+
+    # Python loads bytecode instead of a source when both are packaged.
+    report.source_bytes = sum(
+        size for arcname, size in sources.items() if arcname not in compiled_sources
+    )
+    report.packages = sorted(
+        packages.values(), key=lambda package: package.uncompressed_bytes, reverse=True
+    )
+    return report
+
+
+def format_size(size: int) -> str:
+    """
+    Format a size in bytes for display, e.g. ``12.3 MiB``.
+    """
+    value = float(size)
+    for unit in ["B", "KiB", "MiB"]:
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def summary_rows(report: ArtifactReport) -> list[tuple[str, str]]:
+    """
+    Format the headline figures of a report as (metric, value) rows.
+    """
+    limit_percent = report.uncompressed_bytes / LAMBDA_UNZIPPED_LIMIT * 100
+    return [
+        ("Files", str(report.file_count)),
+        (
+            "Unzipped size",
+            f"{format_size(report.uncompressed_bytes)} "
+            f"({limit_percent:.1f}% of the Lambda limit)",
+        ),
+        ("Zipped size", format_size(report.compressed_bytes)),
+        ("Native extensions", str(len(report.native_extensions))),
+        ("Python sources loaded", format_size(report.source_bytes)),
+        ("Python bytecode loaded", format_size(report.bytecode_bytes)),
+        ("Estimated cold start", f"{report.estimated_cold_start_ms:.0f} ms"),
+    ]
+
+
+def package_rows(report: ArtifactReport, limit: int) -> list[tuple[str, ...]]:
+    """
+    Format the largest packages of a report as table rows.
+    """
+    return [
+        (
+            package.name,
+            str(package.file_count),
+            format_size(package.uncompressed_bytes),
+            format_size(package.compressed_bytes),
+        )
+        for package in report.packages[:limit]
+    ]
+
+
+def check_budgets(
+    report: ArtifactReport,
+    max_size: int = LAMBDA_UNZIPPED_LIMIT,
+    max_cold_start_ms: float = 0.0,
+) -> list[str]:
+    """
+    List the ways an artifact exceeds its budgets.
+
+    :param report: The artifact's report.
+    :param max_size: The largest allowed unzipped size, in bytes.
+    :param max_cold_start_ms: The largest allowed cold-start estimate, or 0
+        for no limit.
+    :return: One message per budget exceeded.
+    """
+    violations = []
+    limit = min(max_size, LAMBDA_UNZIPPED_LIMIT)
+    if report.uncompressed_bytes > limit:
+        violations.append(
+            f"Unzipped size {report.uncompressed_bytes} bytes exceeds "
+            f"the budget of {limit} bytes."
+        )
+    if max_cold_start_ms and report.estimated_cold_start_ms > max_cold_start_ms:
+        violations.append(
+            f"Estimated cold start {report.estimated_cold_start_ms:.0f} ms exceeds "
+            f"the budget of {max_cold_start_ms:.0f} ms."
+        )
+    return violations
@@ -5,11 +5,24 @@ This module contains utility functions for working with AWS Lambda functions.
 # function_model.py
 
 import ast
+import json
 import os
-from typing import Callable, Optional
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence, Union
 
 from lambda_kit.utils.directory import validate_directory
 
+DEFAULT_SCAN_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "lambda-kit", "handlers.json"
+)
+
+# Below this many uncached files, parsing in-process beats starting workers.
+PARALLEL_SCAN_THRESHOLD = 64
+
+# Bump when the rules for recognising a handler change.
+SCAN_FORMAT_VERSION = 1
+
 
 def is_dict_annotation(annotation: Optional[ast.expr]) -> bool:
     return isinstance(annotation, ast.Name) and annotation.id == "dict"
@@ -19,7 +32,9 @@ def is_context_annotation(annotation: Optional[ast.expr]) -> bool:
     return isinstance(annotation, ast.Attribute) and annotation.attr == "Context"
 
 
-def has_lambda_handler_signature(node: ast.FunctionDef) -> bool:
+def has_lambda_handler_signature(
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+) -> bool:
     if len(node.args.args) != 2:
         return False
     param1, param2 = node.args.args
@@ -28,6 +43,29 @@ def has_lambda_handler_signature(node: ast.FunctionDef) -> bool:
     )
 
 
+def find_lambda_handler_names(python_source_code: Union[str, bytes]) -> list[str]:
+    """
+    Find the names of the lambda handler functions in the given code.
+
+    Lambda can only call module-level functions, so nested definitions are
+    not searched.
+
+    :param python_source_code: The Python code to check.
+    :return: The handler function names, in the order they are defined.
+    """
+    try:
+        tree = ast.parse(python_source_code)
+    except (SyntaxError, ValueError):
+        return []
+
+    return [
+        node.name
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and has_lambda_handler_signature(node)
+    ]
+
+
 def contains_lambda_handler_code(python_source_code: str) -> bool:
     """
     Determine if the given code contains a lambda handler function.
@@ -38,44 +76,288 @@ def contains_lambda_handler_code(python_source_code: str) -> bool:
     Returns:
     bool: True if the code contains a lambda handler function, False otherwise.
     """
+    return len(find_lambda_handler_names(python_source_code)) > 0
+
+
+def scan_file(path: str) -> list[str]:
+    """
+    Find the names of the lambda handler functions in a file.
+
+    :param path: The Python file to check.
+    :return: The handler function names; empty if the file cannot be read.
+    """
+    try:
+        with open(path, "rb") as file:
+            return find_lambda_handler_names(file.read())
+    except OSError:
+        return []
+
+
+def _is_import_call(func: ast.expr) -> bool:
+    """
+    Determine if a call target is ``__import__`` or ``importlib.import_module``.
+    """
+    if isinstance(func, ast.Name):
+        return func.id in ("__import__", "import_module")
+    return isinstance(func, ast.Attribute) and func.attr == "import_module"
+
+
+def find_imports(
+    python_source_code: Union[str, bytes],
+) -> tuple[list[tuple[int, str, list[str]]], bool]:
+    """
+    Find every import in the given code, wherever it appears.
+
+    Imports inside functions, ``try`` blocks and ``if TYPE_CHECKING:`` are
+    included, since any of them may run.  Calls to ``__import__`` and
+    ``importlib.import_module`` with a literal name count as imports; calls
+    with a computed name cannot be followed, and are flagged instead.
+
+    :param python_source_code: The Python code to check.
+    :return: One ``(level, module, names)`` triple per import, where level is
+        the number of leading dots and names are those of a ``from`` import,
+        and whether the code imports modules by computed name.  Code that
+        cannot be parsed is flagged as importing by computed name.
+    """
     try:
         tree = ast.parse(python_source_code)
-        for node in ast.walk(tree):
-            if not isinstance(node, ast.FunctionDef):
-                continue
+    except (SyntaxError, ValueError):
+        return [], True
+
+    imports: list[tuple[int, str, list[str]]] = []
+    dynamic = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((0, alias.name, []) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append(
+                (node.level, node.module or "", [alias.name for alias in node.names])
+            )
+        elif isinstance(node, ast.Call) and _is_import_call(node.func):
+            argument = node.args[0] if node.args else None
+            if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+                name = argument.value.lstrip(".")
+                imports.append((len(argument.value) - len(name), name, []))
+            else:
+                dynamic = True
+    return imports, dynamic
+
+
+def scan_imports(path: str) -> tuple[list[tuple[int, str, list[str]]], bool]:
+    """
+    Find every import in a file.
+
+    :param path: The Python file to check.
+    :return: The imports and whether the file imports by computed name, as
+        returned by find_imports.
+    """
+    try:
+        with open(path, "rb") as file:
+            return find_imports(file.read())
+    except OSError:
+        return [], True
+
+
+class ScanCache:
+    """
+    A JSON file of per-file scan results, keyed by the scanner's choosing.
+
+    The file is read once and replaced atomically on save.  A missing,
+    unreadable or outdated file reads as empty.
+    """
+
+    def __init__(self, path: Optional[str], version: int):
+        """
+        Initialize a new ScanCache.
+
+        :param path: The cache file, or None to not cache on disk.
+        :param version: The format version; files of other versions are ignored.
+        """
+        self.path = path
+        self.version = version
+        self._entries: Optional[dict[str, dict[str, Any]]] = None
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """
+        Read the cached entries, once.
+
+        :return: The entries, which ``save`` writes back after they change.
+        """
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as file:
+                        data = json.load(file)
+                    if data.get("version") == self.version:
+                        self._entries = dict(data["files"])
+                except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                    pass
+        return self._entries
+
+    def save(self, entries: dict[str, dict[str, Any]]) -> None:
+        """
+        Write entries to the cache file, ignoring errors.
+
+        :param entries: The entries to write.
+        """
+        if self.path is None:
+            return
+        cache_dir = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            descriptor, temporary_path = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump({"version": self.version, "files": entries}, file)
+            os.replace(temporary_path, self.path)
+        except OSError:
+            pass
+
+
+class HandlerScanner:  # pylint: disable=too-few-public-methods
+    """
+    Finds handlers in Python files, in parallel, remembering the results.
+
+    Results are cached on disk keyed by each file's path, size and
+    modification time, so unchanged files are never parsed twice.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = DEFAULT_SCAN_CACHE,
+        workers: Optional[int] = None,
+    ):
+        """
+        Initialize a new HandlerScanner.
+
+        :param cache_path: The cache file, or None to not cache on disk.
+        :param workers: The number of parser processes.
+        """
+        self.cache_path = cache_path
+        self.workers = workers
+        self._cache = ScanCache(cache_path, SCAN_FORMAT_VERSION)
 
-            if not has_lambda_handler_signature(node):
+    def scan(self, paths: Sequence[str]) -> dict[str, list[str]]:
+        """
+        Find the handlers defined in each of the given files.
+
+        :param paths: The Python files to check.
+        :return: The handler names per file, in the order given.
+        """
+        entries = self._cache.load()
+        stats: dict[str, os.stat_result] = {}
+        missing = []
+        for path in paths:
+            key = os.path.abspath(path)
+            try:
+                stat = os.stat(key)
+            except OSError:
                 continue
+            stats[key] = stat
+            entry = entries.get(key)
+            if (
+                entry is None
+                or entry["size"] != stat.st_size
+                or entry["mtime_ns"] != stat.st_mtime_ns
+            ):
+                missing.append(key)
 
-            return True
-        return False
-    except SyntaxError:
-        return False
+        if missing:
+            if len(missing) < PARALLEL_SCAN_THRESHOLD or self.workers == 1:
+                results = [scan_file(path) for path in missing]
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    results = list(executor.map(scan_file, missing, chunksize=8))
+            for key, handlers in zip(missing, results):
+                entries[key] = {
+                    "size": stats[key].st_size,
+                    "mtime_ns": stats[key].st_mtime_ns,
+                    "handlers": handlers,
+                }
+            self._cache.save(entries)
+
+        found = {}
+        for path in paths:
+            key = os.path.abspath(path)
+            if key in stats:
+                found[path] = list(entries[key]["handlers"])
+        return found
 
 
-def is_python_lambda(directory: str, info: Callable[[str], None]) -> bool:
+def _root_python_files(directory: str) -> list[str]:
+    return [
+        os.path.join(directory, file_name)
+        for file_name in sorted(os.listdir(directory))
+        if file_name.endswith(".py")
+        and os.path.isfile(os.path.join(directory, file_name))
+    ]
+
+
+def find_lambda_handlers(
+    directory: str,
+    info: Callable[[str], None],
+    scanner: Optional[HandlerScanner] = None,
+) -> dict[str, list[str]]:
     """
-    Determine if a given directory appears to be a Python Lambda function.
+    Find every handler defined by the Python files at the root of a directory.
 
     :param directory: The directory to check.
-    :return: True if it is a Python Lambda function, False otherwise.
+    :param info: The callable function to use for output.
+    :param scanner: The scanner to use; one with the default cache if omitted.
+    :return: The handler names per file, for files that define any, sorted.
     :raises ValueError: If the directory is empty.
     :raises NotADirectoryError: If the directory does not exist.
     """
     validate_directory(directory)
 
-    for file_name in os.listdir(directory):
-        file_path = os.path.join(directory, file_name)
-        if os.path.isfile(file_path) and file_name.endswith(".py"):
-            info(f"Checking file: {file_path}")
-            with open(file_path, "r", encoding="utf-8") as file:
-                code = file.read()
-                if contains_lambda_handler_code(code):
-                    info(f"Found lambda handler in file: {file_path}")
-                    return True
+    scanner = scanner or HandlerScanner()
+    handlers = {}
+    for file_path, names in scanner.scan(_root_python_files(directory)).items():
+        info(f"Checking file: {file_path}")
+        if names:
+            info(f"Found lambda handler in file: {file_path}")
+            handlers[file_path] = names
+
+    if not handlers:
+        info(f"No lambda handler found in any Python file at the root of {directory}.")
+    return handlers
+
 
-    info(f"No lambda handler found in any Python file at the root of {directory}.")
-    return False
+def find_lambda_handler(
+    directory: str,
+    info: Callable[[str], None],
+    scanner: Optional[HandlerScanner] = None,
+) -> Optional[str]:
+    """
+    Find the Python file at the root of a directory that defines a handler.
+
+    :param directory: The directory to check.
+    :param info: The callable function to use for output.
+    :param scanner: The scanner to use; one with the default cache if omitted.
+    :return: The path of the first handler file, or None if there is none.
+    :raises ValueError: If the directory is empty.
+    :raises NotADirectoryError: If the directory does not exist.
+    """
+    handlers = find_lambda_handlers(directory, info, scanner)
+    return next(iter(handlers), None)
+
+
+def is_python_lambda(
+    directory: str,
+    info: Callable[[str], None],
+    scanner: Optional[HandlerScanner] = None,
+) -> bool:
+    """
+    Determine if a given directory appears to be a Python Lambda function.
+
+    :param directory: The directory to check.
+    :param info: The callable function to use for output.
+    :param scanner: The scanner to use; one with the default cache if omitted.
+    :return: True if it is a Python Lambda function, False otherwise.
+    :raises ValueError: If the directory is empty.
+    :raises NotADirectoryError: If the directory does not exist.
+    """
+    return find_lambda_handler(directory, info, scanner) is not None
 
 
 def is_python_layer(directory: str, info: Callable[[str], None]) -> bool:
@@ -90,16 +372,103 @@ def is_python_layer(directory: str, info: Callable[[str], None]) -> bool:
     """
     validate_directory(directory)
 
-    required_files = ["python", "requirements.txt"]
+    python_dir = os.path.join(directory, "python")
+    if os.path.isdir(python_dir):
+        info(f"Found required directory: {python_dir}")
+    else:
+        info(f"Missing required directory: {python_dir}")
+        return False
 
-    for file in required_files:
-        file_path = os.path.join(directory, file)
-        if os.path.isdir(file_path):
-            info(f"Found required directory: {file_path}")
-        else:
-            info(f"Missing required directory: {file_path}")
-            return False
+    requirements_file = os.path.join(directory, "requirements.txt")
+    if os.path.isfile(requirements_file):
+        info(f"Found required file: {requirements_file}")
+    else:
+        info(f"Missing required file: {requirements_file}")
+        return False
 
     info(f"{directory} appears to be a Python Lambda layer.")
 
     return True
+
+
+# Directories that never contain functions or layers of their own.
+SKIPPED_DIRECTORIES = {"node_modules", "__pycache__", "venv", "site-packages"}
+
+
+def discover_components(
+    root: str,
+    exclude: Sequence[str] = (),
+    scanner: Optional[HandlerScanner] = None,
+) -> tuple[list[str], list[str]]:
+    """
+    Find every Lambda function and layer directory under a root directory.
+
+    Directories inside a function or layer, hidden directories and anything
+    under ``exclude`` are not searched.  The tree is walked one level at a
+    time, and the files of each level are scanned for handlers in one batch.
+
+    :param root: The directory to search.
+    :param exclude: Directories to skip, such as the output directory.
+    :param scanner: The scanner to use; one with the default cache if omitted.
+    :return: The function directories and the layer directories, sorted.
+    :raises ValueError: If the directory is empty.
+    :raises NotADirectoryError: If the directory does not exist.
+    """
+    validate_directory(root)
+    excluded = {os.path.abspath(directory) for directory in exclude}
+    scanner = scanner or HandlerScanner()
+
+    def quiet(_: str) -> None:
+        pass
+
+    functions = []
+    layers = []
+    level = [root]
+    while level:
+        candidates = {}
+        for directory in level:
+            if is_python_layer(directory, quiet):
+                layers.append(directory)
+            else:
+                candidates[directory] = _root_python_files(directory)
+
+        handlers = scanner.scan(
+            [path for paths in candidates.values() for path in paths]
+        )
+
+        level = []
+        for directory, paths in candidates.items():
+            if any(handlers.get(path) for path in paths):
+                functions.append(directory)
+                continue
+            level.extend(
+                os.path.join(directory, name)
+                for name in sorted(os.listdir(directory))
+                if not name.startswith(".")
+                and name not in SKIPPED_DIRECTORIES
+                and os.path.isdir(os.path.join(directory, name))
+                and os.path.abspath(os.path.join(directory, name)) not in excluded
+            )
+
+    return sorted(functions), sorted(layers)
+
+
+def find_handler_files(
+    root: str,
+    exclude: Sequence[str] = (),
+    scanner: Optional[HandlerScanner] = None,
+) -> dict[str, list[str]]:
+    """
+    Find every file defining a handler in the functions under a root directory.
+
+    :param root: The directory to search; it may itself be a function.
+    :param exclude: Directories to skip, such as the output directory.
+    :param scanner: The scanner to use; one with the default cache if omitted.
+    :return: The handler names per file, for files that define any, sorted.
+    :raises ValueError: If the directory is empty.
+    :raises NotADirectoryError: If the directory does not exist.
+    """
+    scanner = scanner or HandlerScanner()
+    functions, _ = discover_components(root, exclude, scanner)
+    paths = [path for directory in functions for path in _root_python_files(directory)]
+    return {path: names for path, names in scanner.scan(paths).items() if names}
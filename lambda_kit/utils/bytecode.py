@@ -0,0 +1,163 @@
+"""
+This module contains utility functions for precompiling Lambda artifacts.
+
+Staged ``.py`` files are compiled to ``.pyc`` with unchecked-hash invalidation
+(PEP 552), so the Lambda runtime never stats the source or recompiles it.
+Bytecode is interpreter-specific, so compilation runs in an interpreter of the
+target Python version, split across one process per core.
+"""
+
+# bytecode.py
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from lambda_kit.utils.packaging import ZipSource, merge_sources
+
+# Where Lambda unpacks function and layer archives, for traceback paths.
+FUNCTION_ROOT = "/var/task/"
+LAYER_ROOT = "/opt/"
+
+_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_compile_worker.py")
+
+
+@dataclass
+class CompileResult:
+    """
+    The outcome of compiling staged sources.
+    """
+
+    sources: list[ZipSource]
+    compiled: int = 0
+    failed: list[str] = field(default_factory=list)
+
+
+def current_python_version() -> str:
+    """
+    Return the running interpreter's version as ``major.minor``.
+    """
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def find_interpreter(python_version: str) -> str:
+    """
+    Find an interpreter for a target Python version.
+
+    :param python_version: The target version, e.g. ``3.12``.
+    :return: The path to the interpreter.
+    :raises FileNotFoundError: If no such interpreter is on the PATH.
+    """
+    if python_version == current_python_version():
+        return sys.executable
+
+    interpreter = shutil.which(f"python{python_version}")
+    if interpreter is None:
+        raise FileNotFoundError(
+            f"No python{python_version} interpreter found on the PATH."
+        )
+    return interpreter
+
+
+def _run_worker(
+    interpreter: str,
+    files: list[tuple[str, str]],
+    staging_dir: str,
+    dfile_prefix: str,
+    pyc_only: bool,
+) -> tuple[list[tuple[str, str]], list[str]]:
+    job = {
+        "files": files,
+        "staging_dir": staging_dir,
+        "dfile_prefix": dfile_prefix,
+        "pyc_only": pyc_only,
+    }
+    process = subprocess.run(
+        [interpreter, "-I", _WORKER],
+        input=json.dumps(job),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Bytecode compilation failed:\n{process.stderr.strip()}")
+
+    output = json.loads(process.stdout)
+    return [tuple(pair) for pair in output["compiled"]], list(output["failed"])
+
+
+def _without_compiled(sources: list[ZipSource], failed: list[str]) -> list[ZipSource]:
+    """
+    Drop the ``.py`` files that were compiled, keeping those that failed.
+    """
+    failed_set = set(failed)
+    return [
+        source
+        for source in sources
+        if not source.arcname.endswith(".py") or source.arcname in failed_set
+    ]
+
+
+def compile_sources(  # pylint: disable=too-many-arguments
+    sources: list[ZipSource],
+    staging_dir: str,
+    *,
+    python_version: Optional[str] = None,
+    dfile_prefix: str = FUNCTION_ROOT,
+    pyc_only: bool = False,
+    workers: Optional[int] = None,
+) -> CompileResult:
+    """
+    Compile the ``.py`` files of an artifact to ``.pyc`` files.
+
+    Bytecode is written to ``__pycache__`` directories under ``staging_dir``
+    and added to the file list.  With ``pyc_only``, ``.pyc`` files take the
+    place of their sources instead (sourceless imports).  Sources that fail to
+    compile are packaged as they are.
+
+    :param sources: The files to package.
+    :param staging_dir: Where compiled files are written.
+    :param python_version: The target version; defaults to the running one.
+    :param dfile_prefix: The directory the artifact is unpacked into at
+        runtime, used for paths in tracebacks.
+    :param pyc_only: If True, drop the ``.py`` files that were compiled.
+    :param workers: The number of compiler processes.
+    :return: The updated file list and what was compiled.
+    """
+    interpreter = find_interpreter(python_version or current_python_version())
+    python_files = [
+        (source.path, source.arcname)
+        for source in sources
+        if source.arcname.endswith(".py")
+    ]
+    if not python_files:
+        return CompileResult(sources=sources)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(python_files)))
+    batches = [python_files[index::workers] for index in range(workers)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outputs = list(
+            executor.map(
+                lambda batch: _run_worker(
+                    interpreter, batch, staging_dir, dfile_prefix, pyc_only
+                ),
+                batches,
+            )
+        )
+
+    compiled = [pair for pairs, _ in outputs for pair in pairs]
+    failed = sorted(arcname for _, failures in outputs for arcname in failures)
+
+    remaining = _without_compiled(sources, failed) if pyc_only else sources
+    bytecode = [ZipSource(path=path, arcname=arcname) for arcname, path in compiled]
+    return CompileResult(
+        sources=merge_sources(bytecode, remaining),
+        compiled=len(compiled),
+        failed=failed,
+    )
@@ -0,0 +1,471 @@
+"""
+This module contains an on-disk, content-addressed cache for packaged artifacts.
+
+Artifacts are keyed by a SHA-256 over the (archive name, mode, content hash)
+of every packaged file plus any extra inputs, such as the normalized contents of
+``requirements.txt``.  File hashes are only recomputed when a file's size or
+mtime changed since the previous run.  The cache is bounded by size and evicts
+the least recently used artifacts first.
+"""
+
+# cache.py
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+from lambda_kit.utils.packaging import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_COMPRESS_LEVEL,
+    PackageResult,
+    ReusableArchive,
+    ZipSource,
+    iter_file_views,
+    normalize_mode,
+    write_zip,
+)
+from lambda_kit.utils.tracing import PhaseTracer
+
+CACHE_DIR_NAME = ".kit-cache"
+DEFAULT_MAX_CACHE_SIZE = 512 * 1024 * 1024
+
+# Bumped whenever the archive layout changes, so stale artifacts never match.
+ARCHIVE_FORMAT_VERSION = 2
+
+# An include (-r) or constraint (-c) line of a requirements file, once
+# read_requirements has removed its whitespace.
+_INCLUDE = re.compile(r"^(?:--requirement|--constraint|-r|-c)=?(\S+)$")
+
+
+@dataclass
+class FileRecord:
+    """
+    The size, mtime, archive mode and content hash of a packaged file.
+    """
+
+    size: int
+    mtime_ns: int
+    mode: int
+    sha256: str
+
+
+@dataclass
+class Manifest:
+    """
+    The inputs of the last artifact built under a given name.
+    """
+
+    key: str
+    settings: str
+    files: dict[str, FileRecord]
+
+
+def hash_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Compute the SHA-256 of a file.
+
+    :param path: The path to the file.
+    :param chunk_size: The number of bytes read per chunk.
+    :return: The hex digest.
+    """
+    digest = hashlib.sha256()
+    for view in iter_file_views(path, chunk_size):
+        digest.update(view)
+    return digest.hexdigest()
+
+
+def read_requirements(path: str) -> list[str]:
+    """
+    Read a requirements file without comments, blank lines or whitespace.
+
+    :param path: The path to the requirements file.
+    :return: The requirement lines, sorted.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        lines = [line.split("#", 1)[0].strip() for line in file]
+
+    return sorted("".join(line.split()) for line in lines if line)
+
+
+def hash_requirements(path: str) -> str:
+    """
+    Compute a hash of a requirements file and the files it includes that
+    ignores comments, blank lines, whitespace and line order.
+
+    :param path: The path to the requirements file.
+    :return: The hex digest, or an empty string if the file does not exist.
+    """
+    return _hash_requirements(path, set())
+
+
+def _hash_requirements(path: str, seen: set[str]) -> str:
+    """
+    Hash a requirements file together with the files it includes with ``-r``
+    or ``-c``, which are followed relative to it.
+
+    :param path: The path to the requirements file.
+    :param seen: The real paths already on the include chain, to stop cycles.
+    :return: The hex digest, or an empty string if the file does not exist.
+    """
+    real_path = os.path.realpath(path)
+    if not os.path.isfile(path) or real_path in seen:
+        return ""
+
+    requirements = read_requirements(path)
+    digest = hashlib.sha256("\n".join(requirements).encode("utf-8"))
+    for requirement in requirements:
+        match = _INCLUDE.match(requirement)
+        if match:
+            included = os.path.join(os.path.dirname(path), match.group(1))
+            digest.update(
+                _hash_requirements(included, seen | {real_path}).encode("utf-8")
+            )
+    return digest.hexdigest()
+
+
+def scan_sources(
+    sources: list[ZipSource], previous: Optional[dict[str, FileRecord]] = None
+) -> dict[str, FileRecord]:
+    """
+    Record the size, mtime, archive mode and content hash of each file.
+
+    :param sources: The files to scan.
+    :param previous: Records from an earlier scan; hashes are reused for files
+        whose size and mtime are unchanged.
+    :return: The records, keyed by archive name.
+    """
+    previous = previous or {}
+    records = {}
+    for source in sources:
+        stat = os.stat(source.path)
+        mode = normalize_mode(stat.st_mode)
+        record = previous.get(source.arcname)
+        if (
+            record is None
+            or record.size != stat.st_size
+            or record.mtime_ns != stat.st_mtime_ns
+        ):
+            record = FileRecord(
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                mode=mode,
+                sha256=hash_file(source.path),
+            )
+        elif record.mode != mode:
+            # chmod does not touch the mtime; the content hash still holds.
+            record = replace(record, mode=mode)
+        records[source.arcname] = record
+    return records
+
+
+def compute_cache_key(
+    records: dict[str, FileRecord], settings: str, extra_inputs: dict[str, str]
+) -> str:
+    """
+    Compute the content address of an artifact.
+
+    :param records: The file records, keyed by archive name.
+    :param settings: A description of the packaging settings.
+    :param extra_inputs: Additional named input hashes.
+    :return: The hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(settings.encode("utf-8"))
+    for name in sorted(extra_inputs):
+        digest.update(f"\0extra\0{name}\0{extra_inputs[name]}".encode("utf-8"))
+    for arcname in sorted(records):
+        record = records[arcname]
+        digest.update(
+            f"\0file\0{arcname}\0{record.mode:o}\0{record.sha256}".encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+class PackageCache:
+    """
+    A size-bounded, least-recently-used store of built artifacts.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_CACHE_SIZE):
+        """
+        Initialize a new PackageCache rooted at a directory.
+
+        :param cache_dir: The cache directory, created on demand.
+        :param max_size: The total artifact size, in bytes, to keep.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.artifacts_dir = os.path.join(cache_dir, "artifacts")
+        self.manifests_dir = os.path.join(cache_dir, "manifests")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock_path = os.path.join(cache_dir, "index.lock")
+
+    def artifact_path(self, key: str) -> str:
+        """
+        Return the path an artifact is stored at.
+        """
+        return os.path.join(self.artifacts_dir, f"{key}.zip")
+
+    def load_manifest(self, name: str) -> Optional[Manifest]:
+        """
+        Load the manifest of the last artifact built under a name.
+        """
+        path = os.path.join(self.manifests_dir, f"{name}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            files = {
+                arcname: FileRecord(**record)
+                for arcname, record in data["files"].items()
+            }
+            return Manifest(key=data["key"], settings=data["settings"], files=files)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save_manifest(self, name: str, manifest: Manifest) -> None:
+        """
+        Save the manifest of the artifact just built under a name.
+        """
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        path = os.path.join(self.manifests_dir, f"{name}.json")
+        _write_json(path, asdict(manifest))
+
+    def _load_index(self) -> dict[str, dict[str, float]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                index: dict[str, dict[str, float]] = json.load(file)
+            return index
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold the cache lock, so concurrent builds do not lose index updates.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.lock_path, "a", encoding="utf-8") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Return the path of a cached artifact and mark it as recently used.
+
+        :param key: The artifact's content address.
+        :return: The path, or None on a cache miss.
+        """
+        path = self.artifact_path(key)
+        if not os.path.isfile(path):
+            return None
+
+        with self._locked():
+            index = self._load_index()
+            index[key] = {"size": os.path.getsize(path), "last_used": time.time()}
+            _write_json(self.index_path, index)
+        return path
+
+    def store(self, key: str, zip_path: str) -> str:
+        """
+        Copy a freshly built artifact into the cache and evict old entries.
+
+        :param key: The artifact's content address.
+        :param zip_path: The artifact to store.
+        :return: The path of the cached copy.
+        """
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        path = self.artifact_path(key)
+        temporary_path = _temporary_path(path)
+        shutil.copyfile(zip_path, temporary_path)
+        os.replace(temporary_path, path)
+
+        with self._locked():
+            index = self._load_index()
+            index[key] = {"size": os.path.getsize(path), "last_used": time.time()}
+            self._evict(index)
+        return path
+
+    def evict(self, index: Optional[dict[str, dict[str, float]]] = None) -> list[str]:
+        """
+        Remove least recently used artifacts until the cache fits its budget.
+
+        :param index: The index to evict from; loaded from disk if omitted.
+        :return: The keys that were evicted.
+        """
+        with self._locked():
+            if index is None:
+                index = self._load_index()
+            return self._evict(index)
+
+    def _evict(self, index: dict[str, dict[str, float]]) -> list[str]:
+        evicted = []
+        total = sum(entry["size"] for entry in index.values())
+        for key in sorted(index, key=lambda key: index[key]["last_used"]):
+            if total <= self.max_size:
+                break
+            total -= index.pop(key)["size"]
+            evicted.append(key)
+            try:
+                os.remove(self.artifact_path(key))
+            except FileNotFoundError:
+                pass
+
+        _write_json(self.index_path, index)
+        return evicted
+
+
+def _temporary_path(path: str) -> str:
+    """
+    Create an empty file next to a path, unique to this writer.
+    """
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}."
+    )
+    os.close(descriptor)
+    return temporary_path
+
+
+def _write_json(path: str, data: object) -> None:
+    temporary_path = _temporary_path(path)
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temporary_path, path)
+
+
+def _reusable_archive(
+    cache: PackageCache,
+    previous: Optional[Manifest],
+    settings: str,
+    records: dict[str, FileRecord],
+) -> Optional[ReusableArchive]:
+    """
+    Open the previous build's artifact to copy unchanged entries from.
+
+    :param cache: The cache holding the previous artifact.
+    :param previous: The manifest of the previous build, if any.
+    :param settings: The archive settings of this build.
+    :param records: The records of the files in this build.
+    :return: The archive, or None if nothing can be reused.
+    """
+    if previous is None or previous.settings != settings:
+        return None
+
+    previous_path = cache.lookup(previous.key)
+    if previous_path is None:
+        return None
+
+    unchanged = {
+        arcname
+        for arcname, record in records.items()
+        if arcname in previous.files
+        and previous.files[arcname].sha256 == record.sha256
+        and previous.files[arcname].mode == record.mode
+    }
+    return ReusableArchive(previous_path, unchanged)
+
+
+def build_cached_zip(  # pylint: disable=too-many-arguments,too-many-locals
+    sources: list[ZipSource],
+    zip_path: str,
+    cache: PackageCache,
+    name: str,
+    *,
+    extra_inputs: Optional[dict[str, str]] = None,
+    workers: Optional[int] = None,
+    compresslevel: int = DEFAULT_COMPRESS_LEVEL,
+    store_suffixes: tuple[str, ...] = (),
+    tracer: Optional[PhaseTracer] = None,
+) -> PackageResult:
+    """
+    Package files into a zip archive, reusing cached work where possible.
+
+    On a cache hit the cached artifact is copied to ``zip_path``.  On a miss,
+    entries that are unchanged since the previous build of ``name`` are copied
+    from that build without being recompressed.
+
+    :param sources: The files to package, in archive order.
+    :param zip_path: The path of the archive to create.
+    :param cache: The cache to use.
+    :param name: The artifact name, used to find the previous build.
+    :param extra_inputs: Additional named input hashes for the cache key.
+    :param workers: The number of compression threads.
+    :param compresslevel: The zlib compression level.
+    :param store_suffixes: File suffixes to store without compression.
+    :param tracer: Records the hash and zip phases.
+    :return: A summary of the packaging run.
+    """
+    tracer = tracer or PhaseTracer()
+    start = time.perf_counter()
+    settings = (
+        f"format:{ARCHIVE_FORMAT_VERSION}:deflate:{compresslevel}"
+        f":zlib:{zlib.ZLIB_RUNTIME_VERSION}"
+        f":store:{','.join(sorted(store_suffixes))}"
+    )
+
+    with tracer.phase("hash") as phase:
+        previous = cache.load_manifest(name)
+        previous_files = previous.files if previous else {}
+        records = scan_sources(sources, previous_files)
+        key = compute_cache_key(records, settings, extra_inputs or {})
+        phase.bytes_read = sum(
+            record.size
+            for arcname, record in records.items()
+            if previous_files.get(arcname) is not record
+        )
+
+    cached_path = cache.lookup(key)
+    if cached_path is not None:
+        with tracer.phase("zip", cache_hit=True) as phase:
+            os.makedirs(os.path.dirname(os.path.abspath(zip_path)), exist_ok=True)
+            shutil.copyfile(cached_path, zip_path)
+            cache.save_manifest(
+                name, Manifest(key=key, settings=settings, files=records)
+            )
+            result = PackageResult(
+                zip_path=zip_path,
+                file_count=len(sources),
+                bytes_read=0,
+                bytes_written=os.path.getsize(zip_path),
+                elapsed=time.perf_counter() - start,
+                reused_count=len(sources),
+                cache_hit=True,
+                sha256=hash_file(zip_path),
+            )
+            phase.bytes_written = result.bytes_written
+        return result
+
+    with tracer.phase("zip", cache_hit=False) as phase:
+        reuse = _reusable_archive(cache, previous, settings, records)
+        try:
+            result = write_zip(
+                sources,
+                zip_path,
+                workers=workers,
+                compresslevel=compresslevel,
+                reuse=reuse,
+                store_suffixes=store_suffixes,
+            )
+        finally:
+            if reuse is not None:
+                reuse.close()
+
+        cache.store(key, zip_path)
+        cache.save_manifest(name, Manifest(key=key, settings=settings, files=records))
+        phase.bytes_read = result.bytes_read
+        phase.bytes_written = result.bytes_written
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -0,0 +1,34 @@
+"""
+This module contains utility functions for reading per-component settings.
+
+Functions and layers can carry a ``lambda-kit.toml`` file at the root of their
+source directory.  It is never packaged.
+"""
+
+# config.py
+
+import os
+from typing import Any
+
+import toml
+
+CONFIG_FILE_NAME = "lambda-kit.toml"
+
+
+def load_config(source_dir: str) -> dict[str, Any]:
+    """
+    Load the settings file of a function or layer.
+
+    :param source_dir: The source directory of the function or layer.
+    :return: The parsed settings, or an empty dict if there is no settings file.
+    :raises ValueError: If the settings file is not valid TOML.
+    """
+    config_path = os.path.join(source_dir, CONFIG_FILE_NAME)
+    if not os.path.isfile(config_path):
+        return {}
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as file:
+            return dict(toml.load(file))
+    except toml.TomlDecodeError as err:
+        raise ValueError(f"Invalid settings file {config_path}: {err}") from err
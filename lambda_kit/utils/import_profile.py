@@ -0,0 +1,188 @@
+"""
+This module contains utility functions for profiling a handler's imports.
+
+The handler module is imported in a fresh interpreter started with
+``-X importtime``, and the report it prints is parsed back into a tree of
+modules with their self and cumulative import times.
+"""
+
+# import_profile.py
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+_IMPORTTIME_PREFIX = "import time:"
+
+
+@dataclass
+class ImportNode:
+    """
+    A module and the modules first imported while importing it.
+    """
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: list["ImportNode"] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the subtree to plain data for JSON output.
+        """
+        return {
+            "name": self.name,
+            "self_us": self.self_us,
+            "cumulative_us": self.cumulative_us,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+@dataclass
+class ImportProfile:
+    """
+    The import tree of a handler module.
+    """
+
+    module: str
+    roots: list[ImportNode]
+
+    @property
+    def total_us(self) -> int:
+        """
+        The time spent importing everything, including interpreter startup.
+        """
+        return sum(root.cumulative_us for root in self.roots)
+
+    @property
+    def handler_us(self) -> int:
+        """
+        The time spent importing the handler module and its dependencies.
+        """
+        for root in self.roots:
+            if root.name == self.module:
+                return root.cumulative_us
+        return 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the profile to plain data for JSON output.
+        """
+        return {
+            "module": self.module,
+            "total_us": self.total_us,
+            "handler_us": self.handler_us,
+            "imports": [root.to_dict() for root in self.roots],
+        }
+
+
+def parse_importtime(output: str) -> list[ImportNode]:
+    """
+    Parse the report printed by ``python -X importtime``.
+
+    The report lists modules in post-order: a module's line follows the lines
+    of the modules it imported, which are indented two spaces deeper.
+
+    :param output: The interpreter's standard error.
+    :return: The top-level imports, most expensive first.
+    """
+    pending: dict[int, list[ImportNode]] = {}
+
+    for line in output.splitlines():
+        if not line.startswith(_IMPORTTIME_PREFIX):
+            continue
+        fields = line.replace(_IMPORTTIME_PREFIX, "", 1).split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        node = ImportNode(
+            name=name.strip(),
+            self_us=int(fields[0]),
+            cumulative_us=int(fields[1]),
+            children=pending.pop(depth + 1, []),
+        )
+        pending.setdefault(depth, []).append(node)
+
+    roots = pending.get(0, [])
+    _sort_tree(roots)
+    return roots
+
+
+def _sort_tree(nodes: list[ImportNode]) -> None:
+    nodes.sort(key=lambda node: node.cumulative_us, reverse=True)
+    for node in nodes:
+        _sort_tree(node.children)
+
+
+def module_name(source_dir: str, file_path: str) -> str:
+    """
+    Return the dotted module name of a file relative to a source directory.
+    """
+    relative_path = os.path.relpath(file_path, source_dir)
+    return os.path.splitext(relative_path)[0].replace(os.sep, ".")
+
+
+def profile_imports(
+    source_dir: str,
+    module: str,
+    python: str = sys.executable,
+    extra_paths: Optional[list[str]] = None,
+) -> ImportProfile:
+    """
+    Import a module in a fresh interpreter and profile its imports.
+
+    Bytecode is not written, so sources are compiled on every run, as on a
+    cold start without precompiled ``.pyc`` files.
+
+    :param source_dir: The directory the module is imported from.
+    :param module: The dotted module name.
+    :param python: The interpreter to use.
+    :param extra_paths: Additional import paths, e.g. layer ``python/`` dirs.
+    :return: The import profile.
+    :raises RuntimeError: If the module cannot be imported.
+    """
+    env = dict(os.environ)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    env["PYTHONPATH"] = os.pathsep.join([source_dir, *(extra_paths or [])])
+
+    process = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=source_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if process.returncode != 0:
+        errors = [
+            line
+            for line in process.stderr.splitlines()
+            if not line.startswith(_IMPORTTIME_PREFIX)
+        ]
+        raise RuntimeError(f"Could not import {module}:\n" + "\n".join(errors))
+
+    return ImportProfile(module=module, roots=parse_importtime(process.stderr))
+
+
+def flatten_profile(
+    nodes: list[ImportNode], limit: int, max_depth: int = 3, depth: int = 0
+) -> list[tuple[int, ImportNode]]:
+    """
+    List the most expensive imports as (depth, node) pairs in tree order.
+
+    :param nodes: The nodes to flatten, most expensive first.
+    :param limit: The maximum number of entries per level.
+    :param max_depth: The deepest level to include.
+    :param depth: The depth of ``nodes``.
+    :return: The entries to display.
+    """
+    rows = []
+    for node in nodes[:limit]:
+        rows.append((depth, node))
+        if depth < max_depth:
+            rows.extend(flatten_profile(node.children, limit, max_depth, depth + 1))
+    return rows
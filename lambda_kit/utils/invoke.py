@@ -0,0 +1,359 @@
+"""
+This module contains utility functions for invoking Lambda handlers locally.
+
+Each cold start is a fresh interpreter running a stdlib-only worker script,
+timed from process spawn until the first invocation returns.  The first
+worker then keeps invoking the handler to measure warm latency.
+
+The init analysis splits a cold start the way Lambda bills and snapshots it:
+the init phase, which imports the handler module and is what SnapStart
+snapshots, and the first invocation.  For each it reports time, memory and
+the modules loaded, plus what init leaves open in the snapshot.
+"""
+
+# invoke.py
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+DEFAULT_TIMEOUT_MS = 3000
+DEFAULT_MEMORY_MB = 128
+
+# What becomes of resources init leaves open when its memory is snapshotted.
+RESOURCE_ADVICE = {
+    "socket": "stale after a snapshot is restored; reconnect before use",
+    "thread": "paused in the snapshot; it must tolerate the gap on restore",
+    "pipe": "its other end may be gone after a snapshot is restored",
+    "file": "captured in the snapshot; reopen it if the file can change",
+    "anon_inode": "captured in the snapshot; recreate it after restore",
+}
+
+_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_invoke_worker.py")
+
+
+@dataclass
+class InvokeResult:
+    """
+    Latency and memory measurements of a handler.
+    """
+
+    cold_start_ms: list[float]
+    import_ms: float
+    first_invoke_ms: float
+    warm_ms: list[float]
+    peak_rss_bytes: int
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def cold_start_median_ms(self) -> float:
+        """
+        The median time from process spawn to the end of the first invocation.
+        """
+        return statistics.median(self.cold_start_ms) if self.cold_start_ms else 0.0
+
+    def warm_percentile_ms(self, percent: float) -> float:
+        """
+        Return a warm-invocation latency percentile.
+        """
+        return percentile(self.warm_ms, percent)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the measurements to plain data for JSON output.
+
+        Warm latencies are summarized as percentiles rather than listed.
+        """
+        return {
+            "cold_start_ms": self.cold_start_ms,
+            "cold_start_median_ms": self.cold_start_median_ms,
+            "import_ms": self.import_ms,
+            "first_invoke_ms": self.first_invoke_ms,
+            "warm_count": len(self.warm_ms),
+            "warm_p50_ms": self.warm_percentile_ms(50),
+            "warm_p95_ms": self.warm_percentile_ms(95),
+            "warm_p99_ms": self.warm_percentile_ms(99),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class OpenResource:
+    """
+    A thread, socket, pipe or file left open by a phase.
+    """
+
+    kind: str
+    detail: str
+
+    @property
+    def advice(self) -> str:
+        """
+        What to do about the resource before snapshotting init.
+        """
+        return RESOURCE_ADVICE.get(self.kind, "")
+
+
+@dataclass
+class PhaseProbe:
+    """
+    What one phase of a cold start loaded and left open.
+    """
+
+    modules: list[str]
+    source_files: list[str]
+    opened: list[OpenResource]
+    rss_bytes: int
+    rss_growth_bytes: int
+
+    @property
+    def top_level_modules(self) -> list[str]:
+        """
+        The top-level packages of the modules loaded, without duplicates.
+        """
+        return sorted({name.split(".")[0] for name in self.modules})
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "PhaseProbe":
+        """
+        Build a probe from the worker's measurements.
+        """
+        return PhaseProbe(
+            modules=list(data["modules"]),
+            source_files=list(data["source_files"]),
+            opened=[OpenResource(kind, detail) for kind, detail in data["opened"]],
+            rss_bytes=int(data["rss_bytes"]),
+            rss_growth_bytes=int(data["rss_growth_bytes"]),
+        )
+
+
+@dataclass
+class InitReport:  # pylint: disable=too-many-instance-attributes
+    """
+    How a cold start splits between the init phase and the first invocation.
+    """
+
+    cold_start_ms: float
+    probe_ms: float
+    init_ms: float
+    init_cpu_ms: float
+    init: PhaseProbe
+    first_invoke_ms: float
+    first_invoke: PhaseProbe
+    warm_ms: list[float]
+    peak_rss_bytes: int
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def runtime_start_ms(self) -> float:
+        """
+        The rest of the cold start: starting the interpreter and the runtime,
+        without the time spent probing.
+        """
+        return max(
+            0.0,
+            self.cold_start_ms - self.probe_ms - self.init_ms - self.first_invoke_ms,
+        )
+
+    @property
+    def first_invoke_overhead_ms(self) -> float:
+        """
+        How much longer the first invocation took than a typical warm one;
+        the work that could move to init.
+        """
+        if not self.warm_ms:
+            return 0.0
+        return max(0.0, self.first_invoke_ms - percentile(self.warm_ms, 50))
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the measurements to plain data for JSON output.
+        """
+        return {
+            "cold_start_ms": self.cold_start_ms,
+            "probe_ms": self.probe_ms,
+            "runtime_start_ms": self.runtime_start_ms,
+            "init_ms": self.init_ms,
+            "init_cpu_ms": self.init_cpu_ms,
+            "init": asdict(self.init),
+            "first_invoke_ms": self.first_invoke_ms,
+            "first_invoke_overhead_ms": self.first_invoke_overhead_ms,
+            "first_invoke": asdict(self.first_invoke),
+            "warm_count": len(self.warm_ms),
+            "warm_p50_ms": percentile(self.warm_ms, 50),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "errors": self.errors,
+        }
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    Compute a percentile with the nearest-rank method.
+
+    :param values: The samples.
+    :param percent: The percentile, between 0 and 100.
+    :return: The percentile, or 0.0 if there are no samples.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def _run_worker(
+    job: dict[str, Any], python: str, source_dir: str
+) -> tuple[float, dict[str, Any]]:
+    """
+    Run one fresh interpreter; return its cold start time and measurements.
+
+    The handler's own output goes to a temporary file rather than a pipe, so a
+    chatty handler can never block on a full pipe buffer.  Bytecode is not
+    written, so every cold start compiles the sources as Lambda would without
+    precompiled ``.pyc`` files.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as stderr:
+        start = time.perf_counter()
+        # pylint: disable=consider-using-with
+        process = subprocess.Popen(
+            [python, _WORKER],
+            cwd=source_dir,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+        )
+        stdin, stdout = process.stdin, process.stdout
+        if stdin is None or stdout is None:
+            raise RuntimeError("Could not start the invoke worker.")
+
+        stdin.write(json.dumps(job))
+        stdin.close()
+        ready = stdout.readline()
+        cold_start_ms = (time.perf_counter() - start) * 1000
+        output = stdout.read()
+        stdout.close()
+        process.wait()
+
+        if ready.strip() != "ready" or process.returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"Could not invoke {job['module']}:\n{stderr.read()}")
+
+    measurements: dict[str, Any] = json.loads(output)
+    return cold_start_ms, measurements
+
+
+def _job(
+    source_dir: str,
+    module: str,
+    handler: str,
+    event_paths: Optional[list[str]],
+    iterations: int,
+) -> dict[str, Any]:
+    """
+    Build the job the worker reads from standard input.
+    """
+    return {
+        "source_dir": os.path.abspath(source_dir),
+        "module": module,
+        "handler": handler,
+        "function_name": os.path.basename(os.path.normpath(source_dir)),
+        "events": [os.path.abspath(path) for path in event_paths or []],
+        "timeout_ms": DEFAULT_TIMEOUT_MS,
+        "memory_mb": DEFAULT_MEMORY_MB,
+        "iterations": iterations,
+    }
+
+
+def invoke_handler(  # pylint: disable=too-many-arguments
+    source_dir: str,
+    module: str,
+    handler: str,
+    event_paths: Optional[list[str]] = None,
+    *,
+    iterations: int = 100,
+    cold_starts: int = 1,
+    python: str = sys.executable,
+) -> InvokeResult:
+    """
+    Invoke a handler locally and measure cold and warm latency.
+
+    :param source_dir: The function's source directory.
+    :param module: The dotted name of the handler module.
+    :param handler: The name of the handler function.
+    :param event_paths: JSON event files, used in turn; an empty event is used
+        if there are none.
+    :param iterations: The number of warm invocations.
+    :param cold_starts: The number of fresh interpreters to time.
+    :param python: The interpreter to use.
+    :return: The measurements.
+    :raises RuntimeError: If the handler cannot be imported.
+    """
+    job = _job(source_dir, module, handler, event_paths, iterations)
+    cold_start_ms = []
+    first: dict[str, Any] = {}
+    for run in range(max(1, cold_starts)):
+        run_job = dict(job, iterations=iterations if run == 0 else 0)
+        elapsed, measurements = _run_worker(run_job, python, source_dir)
+        cold_start_ms.append(elapsed)
+        if run == 0:
+            first = measurements
+
+    return InvokeResult(
+        cold_start_ms=cold_start_ms,
+        import_ms=first["import_ns"] / 1_000_000,
+        first_invoke_ms=first["first_invoke_ns"] / 1_000_000,
+        warm_ms=[value / 1_000_000 for value in first["warm_ns"]],
+        peak_rss_bytes=int(first["peak_rss_bytes"]),
+        errors=list(first["errors"]),
+    )
+
+
+def analyze_init(  # pylint: disable=too-many-arguments
+    source_dir: str,
+    module: str,
+    handler: str,
+    event_paths: Optional[list[str]] = None,
+    *,
+    iterations: int = 10,
+    python: str = sys.executable,
+) -> InitReport:
+    """
+    Measure the init phase of a cold start separately from its first invocation.
+
+    :param source_dir: The function's source directory.
+    :param module: The dotted name of the handler module.
+    :param handler: The name of the handler function.
+    :param event_paths: JSON event files, used in turn; an empty event is used
+        if there are none.
+    :param iterations: The number of warm invocations to compare the first
+        invocation with.
+    :param python: The interpreter to use.
+    :return: The measurements.
+    :raises RuntimeError: If the handler cannot be imported.
+    """
+    job = dict(
+        _job(source_dir, module, handler, event_paths, iterations), analyze_init=True
+    )
+    cold_start_ms, measurements = _run_worker(job, python, source_dir)
+    return InitReport(
+        cold_start_ms=cold_start_ms,
+        probe_ms=measurements["probe_ns"] / 1_000_000,
+        init_ms=measurements["import_ns"] / 1_000_000,
+        init_cpu_ms=measurements["import_cpu_ns"] / 1_000_000,
+        init=PhaseProbe.from_dict(measurements["init"]),
+        first_invoke_ms=measurements["first_invoke_ns"] / 1_000_000,
+        first_invoke=PhaseProbe.from_dict(measurements["first_invoke"]),
+        warm_ms=[value / 1_000_000 for value in measurements["warm_ns"]],
+        peak_rss_bytes=int(measurements["peak_rss_bytes"]),
+        errors=list(measurements["errors"]),
+    )
@@ -0,0 +1,425 @@
+"""
+This module contains utility functions for planning shared layers.
+
+Function packages are compared by top-level package.  Each package's
+fingerprint is computed from the paths, sizes and CRCs in the zip, so it is
+computed without decompressing anything.  A package whose identical copy is
+shipped by two or more functions is a candidate for a shared layer.
+
+Candidates are packed into layers first-fit-decreasing by the bytes they
+would save.  Each goes into the layer whose functions overlap its own the
+most, as long as no layer and no function's code plus layers exceeds the
+unzipped limit, and no more layers are proposed than a function may attach.
+"""
+
+# layer_plan.py
+
+import functools
+import hashlib
+import json
+import os
+import posixpath
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from lambda_kit.utils.artifact import (
+    LAMBDA_UNZIPPED_LIMIT,
+    strip_layer_prefix,
+    top_level_name,
+)
+
+# Lambda attaches at most this many layers to a function.
+MAX_LAYERS = 5
+
+_DIST_INFO_SUFFIX = ".dist-info"
+
+
+@dataclass
+class PackageCopy:
+    """
+    One copy of a top-level package inside an artifact.
+    """
+
+    name: str
+    fingerprint: str
+    file_count: int
+    uncompressed_bytes: int
+    compressed_bytes: int
+
+
+@dataclass
+class ArtifactPackages:
+    """
+    The top-level packages of a function or layer artifact.
+    """
+
+    name: str
+    is_layer: bool
+    uncompressed_bytes: int
+    packages: dict[str, PackageCopy]
+    requirements: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SharedPackage:
+    """
+    A package shipped, byte for byte, by several artifacts.
+    """
+
+    name: str
+    fingerprint: str
+    uncompressed_bytes: int
+    compressed_bytes: int
+    functions: list[str] = field(default_factory=list)
+    layers: list[str] = field(default_factory=list)
+    requirement: Optional[str] = None
+
+    @property
+    def savings(self) -> int:
+        """
+        The compressed bytes saved by shipping one copy in a layer.
+
+        No copy needs shipping if the package is already in a layer.
+        """
+        if self.layers:
+            return self.compressed_bytes * len(self.functions)
+        return self.compressed_bytes * (len(self.functions) - 1)
+
+
+@dataclass
+class ProposedLayer:
+    """
+    A shared layer and the functions that would attach it.
+    """
+
+    name: str
+    packages: list[SharedPackage] = field(default_factory=list)
+    functions: set[str] = field(default_factory=set)
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        """
+        The unzipped size of the layer.
+        """
+        return sum(package.uncompressed_bytes for package in self.packages)
+
+    @property
+    def compressed_bytes(self) -> int:
+        """
+        The compressed size of the layer's files.
+        """
+        return sum(package.compressed_bytes for package in self.packages)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the layer to plain data for JSON output.
+        """
+        return {
+            "name": self.name,
+            "uncompressed_bytes": self.uncompressed_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "packages": [package.name for package in self.packages],
+            "requirements": sorted(
+                {
+                    package.requirement
+                    for package in self.packages
+                    if package.requirement
+                }
+            ),
+            "functions": sorted(self.functions),
+        }
+
+
+@dataclass
+class LayerPlan:
+    """
+    Proposed shared layers and the bytes they save.
+    """
+
+    layers: list[ProposedLayer]
+    in_existing_layers: list[SharedPackage]
+    unplaced: list[SharedPackage]
+    bytes_before: int
+    bytes_after: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the plan to plain data for JSON output.
+        """
+        return {
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+            "layers": [layer.to_dict() for layer in self.layers],
+            "in_existing_layers": {
+                package.name: package.layers for package in self.in_existing_layers
+            },
+            "unplaced": [package.name for package in self.unplaced],
+        }
+
+
+def _requirements_from_dist_info(
+    archive: zipfile.ZipFile, dist_info_dirs: set[str]
+) -> dict[str, str]:
+    """
+    Map top-level package names to pinned requirements using RECORD files.
+    """
+    requirements: dict[str, str] = {}
+    for dist_info in sorted(dist_info_dirs):
+        base_name = posixpath.basename(dist_info)[: -len(_DIST_INFO_SUFFIX)]
+        distribution, _, version = base_name.rpartition("-")
+        if not distribution:
+            continue
+        try:
+            record = archive.read(f"{dist_info}/RECORD").decode("utf-8")
+        except (KeyError, UnicodeDecodeError):
+            continue
+        for line in record.splitlines():
+            path = line.split(",", 1)[0]
+            if path and not path.startswith("..") and "dist-info" not in path:
+                requirements.setdefault(
+                    top_level_name(path), f"{distribution}=={version}"
+                )
+    return requirements
+
+
+def scan_artifact(zip_path: str) -> ArtifactPackages:
+    """
+    Fingerprint the top-level packages of an artifact.
+
+    :param zip_path: The function or layer zip.
+    :return: The artifact's packages; package metadata directories are only
+        used to find each package's pinned requirement.
+    """
+    entries: dict[str, list[zipfile.ZipInfo]] = {}
+    dist_info_dirs = set()
+    is_layer = True
+    uncompressed_bytes = 0
+
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            is_layer = is_layer and info.filename.startswith("python/")
+            uncompressed_bytes += info.file_size
+            directory = posixpath.dirname(info.filename)
+            if directory.endswith(_DIST_INFO_SUFFIX):
+                dist_info_dirs.add(directory)
+                continue
+            entries.setdefault(top_level_name(info.filename), []).append(info)
+        requirements = _requirements_from_dist_info(archive, dist_info_dirs)
+
+    packages = {}
+    for name, infos in entries.items():
+        digest = hashlib.sha256()
+        for info in sorted(infos, key=lambda info: info.filename):
+            path = strip_layer_prefix(info.filename)
+            digest.update(f"{path}\0{info.CRC}\0{info.file_size}\n".encode("utf-8"))
+        packages[name] = PackageCopy(
+            name=name,
+            fingerprint=digest.hexdigest(),
+            file_count=len(infos),
+            uncompressed_bytes=sum(info.file_size for info in infos),
+            compressed_bytes=sum(info.compress_size for info in infos),
+        )
+
+    artifact_name = os.path.splitext(os.path.basename(zip_path))[0]
+    return ArtifactPackages(
+        name=artifact_name,
+        is_layer=is_layer,
+        uncompressed_bytes=uncompressed_bytes,
+        packages=packages,
+        requirements=requirements,
+    )
+
+
+def find_shared_packages(artifacts: list[ArtifactPackages]) -> list[SharedPackage]:
+    """
+    Find the packages shipped identically by two or more functions, or by a
+    function and an existing layer.
+
+    :param artifacts: The scanned function and layer artifacts.
+    :return: The shared packages, largest savings first.
+    """
+    shared: dict[tuple[str, str], SharedPackage] = {}
+    for artifact in artifacts:
+        for copy in artifact.packages.values():
+            package = shared.setdefault(
+                (copy.name, copy.fingerprint),
+                SharedPackage(
+                    name=copy.name,
+                    fingerprint=copy.fingerprint,
+                    uncompressed_bytes=copy.uncompressed_bytes,
+                    compressed_bytes=copy.compressed_bytes,
+                ),
+            )
+            if artifact.is_layer:
+                package.layers.append(artifact.name)
+            else:
+                package.functions.append(artifact.name)
+            package.requirement = package.requirement or artifact.requirements.get(
+                copy.name
+            )
+
+    duplicated = [
+        package
+        for package in shared.values()
+        if len(package.functions) > 1 or (package.functions and package.layers)
+    ]
+    return sorted(duplicated, key=lambda package: package.savings, reverse=True)
+
+
+def _fits(
+    layers: list[ProposedLayer],
+    layer: ProposedLayer,
+    package: SharedPackage,
+    function_sizes: dict[str, int],
+    max_size: int,
+) -> bool:
+    """
+    Determine if a package can join a layer, new or planned, without the layer
+    or any function's code plus layers exceeding the limit.
+    """
+    if layer.uncompressed_bytes + package.uncompressed_bytes > max_size:
+        return False
+    candidate = ProposedLayer(
+        name=layer.name,
+        packages=[*layer.packages, package],
+        functions=layer.functions | set(package.functions),
+    )
+    plan = [candidate if other is layer else other for other in layers]
+    if not any(other is layer for other in layers):
+        plan.append(candidate)
+    for function in candidate.functions:
+        attached = [other for other in plan if function in other.functions]
+        moved = sum(
+            shared.uncompressed_bytes
+            for other in attached
+            for shared in other.packages
+            if function in shared.functions
+        )
+        total = function_sizes[function] - moved
+        total += sum(other.uncompressed_bytes for other in attached)
+        if total > max(max_size, function_sizes[function]):
+            return False
+    return True
+
+
+def _overlap(layer: ProposedLayer, package: SharedPackage) -> float:
+    """
+    The Jaccard similarity of a layer's functions and a package's.
+    """
+    functions = set(package.functions)
+    return len(layer.functions & functions) / len(layer.functions | functions)
+
+
+def plan_layers(
+    artifacts: list[ArtifactPackages],
+    max_layers: int = MAX_LAYERS,
+    max_size: int = LAMBDA_UNZIPPED_LIMIT,
+) -> LayerPlan:
+    """
+    Pack the shared packages of a set of functions into shared layers.
+
+    Packages already in an existing layer are not packed again; the functions
+    can attach that layer instead.
+
+    :param artifacts: The scanned function and layer artifacts.
+    :param max_layers: The most layers to propose; layers the functions
+        already attach count toward Lambda's limit of five.
+    :param max_size: The unzipped limit for a layer, and for each function's
+        code plus the layers it attaches.
+    :return: The plan.
+    """
+    function_sizes = {
+        artifact.name: artifact.uncompressed_bytes
+        for artifact in artifacts
+        if not artifact.is_layer
+    }
+    layers: list[ProposedLayer] = []
+    in_existing_layers: list[SharedPackage] = []
+    unplaced: list[SharedPackage] = []
+
+    for package in find_shared_packages(artifacts):
+        if package.layers:
+            in_existing_layers.append(package)
+            continue
+        ranked = sorted(
+            layers, key=functools.partial(_overlap, package=package), reverse=True
+        )
+        target = next(
+            (
+                layer
+                for layer in ranked
+                if _fits(layers, layer, package, function_sizes, max_size)
+            ),
+            None,
+        )
+        if target is None and len(layers) < max_layers:
+            new_layer = ProposedLayer(name=f"shared-{len(layers) + 1}")
+            if _fits(layers, new_layer, package, function_sizes, max_size):
+                layers.append(new_layer)
+                target = new_layer
+        if target is None:
+            unplaced.append(package)
+            continue
+        target.packages.append(package)
+        target.functions.update(package.functions)
+
+    compressed_sizes = {
+        artifact.name: sum(copy.compressed_bytes for copy in artifact.packages.values())
+        for artifact in artifacts
+        if not artifact.is_layer
+    }
+    bytes_before = sum(compressed_sizes.values())
+    moved = sum(
+        package.compressed_bytes * len(package.functions)
+        for package in [
+            *in_existing_layers,
+            *(package for layer in layers for package in layer.packages),
+        ]
+    )
+    bytes_after = bytes_before - moved + sum(layer.compressed_bytes for layer in layers)
+    return LayerPlan(
+        layers=layers,
+        in_existing_layers=in_existing_layers,
+        unplaced=unplaced,
+        bytes_before=bytes_before,
+        bytes_after=bytes_after,
+    )
+
+
+def write_layer_sources(plan: LayerPlan, directory: str) -> list[str]:
+    """
+    Write each proposed layer as a layer source directory.
+
+    Each layer gets a ``requirements.txt`` pinning the packages it holds and an
+    empty ``python/`` directory, so ``kit layer pack`` can build it.  The plan
+    itself is written to ``layer-plan.json``.
+
+    :param plan: The plan.
+    :param directory: The directory to write the layers under.
+    :return: The layer source directories.
+    """
+    layer_dirs = []
+    for layer in plan.layers:
+        layer_dir = os.path.join(directory, layer.name)
+        os.makedirs(os.path.join(layer_dir, "python"), exist_ok=True)
+        lines = sorted(
+            {package.requirement for package in layer.packages if package.requirement}
+        )
+        lines.extend(
+            f"# {package.name}: no package metadata found; copy it in by hand"
+            for package in layer.packages
+            if not package.requirement
+        )
+        requirements_path = os.path.join(layer_dir, "requirements.txt")
+        with open(requirements_path, "w", encoding="utf-8") as file:
+            file.write("".join(f"{line}\n" for line in lines))
+        layer_dirs.append(layer_dir)
+
+    with open(
+        os.path.join(directory, "layer-plan.json"), "w", encoding="utf-8"
+    ) as file:
+        json.dump(plan.to_dict(), file, indent=2)
+    return layer_dirs
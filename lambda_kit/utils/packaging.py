@@ -0,0 +1,699 @@
+"""
+This module contains utility functions for building Lambda deployment packages.
+
+Entries are compressed concurrently on a thread pool (zlib releases the GIL
+while deflating) and streamed in fixed-size chunks, so a file is never held in
+memory in its entirety.  Compressed entries are then appended to the archive
+sequentially, in a stable order.
+
+Files are read through memory-mapped windows that are unmapped as soon as they
+are consumed, so bytes go from the page cache to zlib, or straight to the
+archive for stored entries, without being copied into Python objects.  Formats
+that are already compressed can be stored as they are instead of deflated
+again.  Together with the small spools and the bounded number of entries in
+flight, peak memory does not depend on the size of the package.
+
+Archives are reproducible: entries are sorted, timestamps are fixed, modes are
+normalized to 0644/0755 and compression settings are constant, so identical
+inputs always produce byte-identical archives with the same SHA-256.
+"""
+
+# packaging.py
+
+import base64
+import hashlib
+import io
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, Union
+
+BUILD_DIR_NAME = ".kit-build"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_COMPRESS_LEVEL = 6
+
+# The earliest timestamp a zip archive can represent.
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Compressed entries larger than this spill from memory to a temporary file.
+SPOOL_MAX_SIZE = DEFAULT_CHUNK_SIZE
+
+# Formats that are already compressed; deflating them again saves nothing.
+# Shared objects are not among them: they usually shrink by half.
+STORED_SUFFIXES = (
+    ".zip",
+    ".whl",
+    ".egg",
+    ".jar",
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".zst",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".mp3",
+    ".mp4",
+)
+
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_ZIP_VERSION = 20
+_ZIP_MAX_ENTRIES = 0xFFFF
+_ZIP_MAX_SIZE = 0xFFFFFFFF
+_UTF8_FLAG = 0x800
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIR = struct.Struct("<IHHHHIIH")
+
+
+@dataclass
+class ZipSource:
+    """
+    A file on disk and the name it is stored under in the archive.
+    """
+
+    path: str
+    arcname: str
+
+
+@dataclass
+class ZipEntry:  # pylint: disable=too-many-instance-attributes
+    """
+    A compressed archive entry waiting to be written.
+    """
+
+    arcname: str
+    data: Union[IO[bytes], io.RawIOBase]
+    crc: int
+    file_size: int
+    compress_size: int
+    compress_type: int
+    mode: int
+    date_time: tuple[int, int, int, int, int, int]
+
+
+@dataclass
+class PackageResult:  # pylint: disable=too-many-instance-attributes
+    """
+    Summary of a packaging run.
+    """
+
+    zip_path: str
+    file_count: int
+    bytes_read: int
+    bytes_written: int
+    elapsed: float
+    reused_count: int = 0
+    cache_hit: bool = False
+    sha256: str = ""
+
+    @property
+    def code_sha256(self) -> str:
+        """
+        The base64-encoded SHA-256, as reported by Lambda's ``CodeSha256``.
+        """
+        return base64.b64encode(bytes.fromhex(self.sha256)).decode("ascii")
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """
+        Uncompressed input throughput in MB/s.
+        """
+        if self.elapsed <= 0:
+            return 0.0
+        return self.bytes_read / (1024 * 1024) / self.elapsed
+
+    @property
+    def files_per_second(self) -> float:
+        """
+        Input throughput in files/s.
+        """
+        if self.elapsed <= 0:
+            return 0.0
+        return self.file_count / self.elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the result to plain data for JSON output.
+        """
+        return {
+            **asdict(self),
+            "code_sha256": self.code_sha256,
+            "megabytes_per_second": self.megabytes_per_second,
+            "files_per_second": self.files_per_second,
+        }
+
+
+def collect_files(
+    source_dir: str,
+    exclude: Optional[Callable[[str], bool]] = None,
+    prefix: str = "",
+) -> list[ZipSource]:
+    """
+    Walk a directory and list the regular files to package.
+
+    :param source_dir: The directory to walk.
+    :param exclude: Optional predicate called with each absolute path; files for
+        which it returns True are skipped.
+    :param prefix: A directory prefix for archive names, e.g. ``python/``.
+    :return: The files found, sorted by archive name.
+    """
+    sources = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for file_name in files:
+            path = os.path.join(root, file_name)
+            if not os.path.isfile(path):
+                continue
+            if exclude is not None and exclude(os.path.abspath(path)):
+                continue
+            arcname = prefix + os.path.relpath(path, source_dir).replace(os.sep, "/")
+            sources.append(ZipSource(path=path, arcname=arcname))
+
+    sources.sort(key=lambda source: source.arcname)
+    return sources
+
+
+def merge_sources(*source_lists: list[ZipSource]) -> list[ZipSource]:
+    """
+    Merge several file lists into one, sorted by archive name.
+
+    When two lists contain the same archive name, the earlier list wins.
+
+    :param source_lists: The file lists to merge.
+    :return: The merged list.
+    """
+    merged: dict[str, ZipSource] = {}
+    for sources in source_lists:
+        for source in sources:
+            merged.setdefault(source.arcname, source)
+    return [merged[arcname] for arcname in sorted(merged)]
+
+
+def exclude_under(*directories: Optional[str]) -> Callable[[str], bool]:
+    """
+    Build a collect_files exclude predicate for paths below some directories.
+
+    :param directories: The directories to exclude; None entries are ignored.
+    :return: The predicate.
+    """
+    roots = tuple(
+        os.path.join(os.path.abspath(directory), "")
+        for directory in directories
+        if directory is not None
+    )
+    return lambda path: path.startswith(roots)
+
+
+def describe_package_result(result: "PackageResult") -> str:
+    """
+    Format a one-line summary of a packaging run.
+    """
+    if result.cache_hit:
+        return (
+            f"Reused cached artifact for {result.file_count} unchanged files "
+            f"({result.bytes_written} bytes) as {result.zip_path} "
+            f"in {result.elapsed:.2f}s."
+        )
+
+    reused = ""
+    if result.reused_count:
+        reused = f", {result.reused_count} unchanged entries reused"
+
+    return (
+        f"Packaged {result.file_count} files "
+        f"({result.bytes_read} bytes -> {result.bytes_written} bytes{reused}) "
+        f"into {result.zip_path} in {result.elapsed:.2f}s "
+        f"({result.megabytes_per_second:.1f} MB/s, "
+        f"{result.files_per_second:.0f} files/s)."
+    )
+
+
+def write_checksum_file(result: PackageResult) -> str:
+    """
+    Write a ``sha256sum``-compatible checksum file next to an archive.
+
+    :param result: The packaging run to record.
+    :return: The path of the checksum file.
+    """
+    checksum_path = f"{result.zip_path}.sha256"
+    with open(checksum_path, "w", encoding="utf-8") as file:
+        file.write(f"{result.sha256}  {os.path.basename(result.zip_path)}\n")
+    return checksum_path
+
+
+def normalize_mode(mode: int) -> int:
+    """
+    Reduce a file mode to 0755 if any execute bit is set, 0644 otherwise.
+    """
+    return 0o755 if mode & 0o111 else 0o644
+
+
+def iter_file_views(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[memoryview]:
+    """
+    Read a file as a sequence of views of memory-mapped windows.
+
+    Each window is unmapped before the next is mapped, so the pages of a large
+    file never stay resident in this process.  A view is only valid until the
+    next one is requested.
+
+    :param path: The file to read.
+    :param chunk_size: The approximate window size; it is rounded up to the
+        mapping granularity.
+    :return: The views, in file order.
+    """
+    granularity = mmap.ALLOCATIONGRANULARITY
+    window = max(granularity, -(-chunk_size // granularity) * granularity)
+
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        for offset in range(0, size, window):
+            length = min(window, size - offset)
+            with mmap.mmap(
+                file.fileno(), length, access=mmap.ACCESS_READ, offset=offset
+            ) as mapped:
+                with memoryview(mapped) as view:
+                    yield view
+
+
+class _MappedFile(io.RawIOBase):
+    """
+    A file whose contents are written to the archive straight from its mapping.
+    """
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__()
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def readable(self) -> bool:
+        return True
+
+    def views(self) -> Iterator[memoryview]:
+        """
+        Return views of the file's contents, in order.
+        """
+        return iter_file_views(self.path, self.chunk_size)
+
+
+def compress_file(
+    source: ZipSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compresslevel: int = DEFAULT_COMPRESS_LEVEL,
+) -> ZipEntry:
+    """
+    Deflate a file into a spooled buffer, one chunk at a time.
+
+    :param source: The file to compress.
+    :param chunk_size: The number of bytes read per chunk.
+    :param compresslevel: The zlib compression level.
+    :return: The compressed entry.
+    """
+    # pylint: disable=consider-using-with
+    spool: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = 0
+    file_size = 0
+
+    for view in iter_file_views(source.path, chunk_size):
+        crc = zlib.crc32(view, crc)
+        file_size += len(view)
+        spool.write(compressor.compress(view))
+    spool.write(compressor.flush())
+    compress_size = spool.tell()
+    spool.seek(0)
+
+    return ZipEntry(
+        arcname=source.arcname,
+        data=spool,
+        crc=crc,
+        file_size=file_size,
+        compress_size=compress_size,
+        compress_type=_ZIP_DEFLATED,
+        mode=normalize_mode(os.stat(source.path).st_mode),
+        date_time=FIXED_DATE_TIME,
+    )
+
+
+def store_file(source: ZipSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ZipEntry:
+    """
+    Prepare a file to be stored without compression.
+
+    Only the CRC is computed up front; the contents are copied from the file's
+    mapping when the entry is written.
+
+    :param source: The file to store.
+    :param chunk_size: The number of bytes mapped at a time.
+    :return: The stored entry.
+    """
+    crc = 0
+    file_size = 0
+    for view in iter_file_views(source.path, chunk_size):
+        crc = zlib.crc32(view, crc)
+        file_size += len(view)
+
+    return ZipEntry(
+        arcname=source.arcname,
+        data=_MappedFile(source.path, chunk_size),
+        crc=crc,
+        file_size=file_size,
+        compress_size=file_size,
+        compress_type=_ZIP_STORED,
+        mode=normalize_mode(os.stat(source.path).st_mode),
+        date_time=FIXED_DATE_TIME,
+    )
+
+
+class ZipWriter:
+    """
+    A minimal, append-only zip writer for entries that are already compressed.
+    """
+
+    def __init__(self, file: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize a new ZipWriter around a binary file object.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.central_directory: list[bytes] = []
+        self.digest = hashlib.sha256()
+        self.offset = 0
+
+    def _write(self, data: Union[bytes, memoryview]) -> None:
+        self.file.write(data)
+        self.digest.update(data)
+        self.offset += len(data)
+
+    def _chunks(self, data: Union[IO[bytes], io.RawIOBase]) -> Iterable[Any]:
+        if isinstance(data, _MappedFile):
+            return data.views()
+        return iter(lambda: data.read(self.chunk_size), b"")
+
+    def write_entry(self, entry: ZipEntry) -> None:
+        """
+        Append an entry to the archive.
+
+        :param entry: The compressed entry.
+        :raises ValueError: If the entry or archive exceeds the zip32 limits.
+        """
+        if len(self.central_directory) >= _ZIP_MAX_ENTRIES:
+            raise ValueError(f"Too many entries for a zip archive: {entry.arcname}")
+        if entry.file_size > _ZIP_MAX_SIZE or entry.compress_size > _ZIP_MAX_SIZE:
+            raise ValueError(f"Entry too large for a zip archive: {entry.arcname}")
+
+        offset = self.offset
+        if offset > _ZIP_MAX_SIZE:
+            raise ValueError("Archive too large for a zip archive.")
+
+        name = entry.arcname.encode("utf-8")
+        flags = 0 if entry.arcname.isascii() else _UTF8_FLAG
+        dos_time, dos_date = _dos_date_time(entry.date_time)
+
+        self._write(
+            _LOCAL_HEADER.pack(
+                0x04034B50,
+                _ZIP_VERSION,
+                flags,
+                entry.compress_type,
+                dos_time,
+                dos_date,
+                entry.crc,
+                entry.compress_size,
+                entry.file_size,
+                len(name),
+                0,
+            )
+        )
+        self._write(name)
+        for chunk in self._chunks(entry.data):
+            self._write(chunk)
+
+        self.central_directory.append(
+            _CENTRAL_HEADER.pack(
+                0x02014B50,
+                (3 << 8) | _ZIP_VERSION,
+                _ZIP_VERSION,
+                flags,
+                entry.compress_type,
+                dos_time,
+                dos_date,
+                entry.crc,
+                entry.compress_size,
+                entry.file_size,
+                len(name),
+                0,
+                0,
+                0,
+                0,
+                (0o100000 | entry.mode) << 16,
+                offset,
+            )
+            + name
+        )
+
+    def close(self) -> None:
+        """
+        Write the central directory.
+        """
+        offset = self.offset
+        for record in self.central_directory:
+            self._write(record)
+        size = self.offset - offset
+
+        count = len(self.central_directory)
+        self._write(
+            _END_OF_CENTRAL_DIR.pack(0x06054B50, 0, 0, count, count, size, offset, 0)
+        )
+
+    def hexdigest(self) -> str:
+        """
+        Return the SHA-256 of everything written so far.
+        """
+        return self.digest.hexdigest()
+
+
+def _dos_date_time(date_time: tuple[int, int, int, int, int, int]) -> tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    dos_date = (year - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_time, dos_date
+
+
+class _ArchiveSlice(io.RawIOBase):
+    """
+    A read-only view of a byte range of a shared, already open archive.
+    """
+
+    def __init__(self, file: IO[bytes], offset: int, size: int):
+        super().__init__()
+        self.file = file
+        self.offset = offset
+        self.remaining = size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        self.file.seek(self.offset)
+        data = self.file.read(size)
+        buffer[: len(data)] = data
+        self.offset += len(data)
+        self.remaining -= len(data)
+        return len(data)
+
+
+class ReusableArchive:
+    """
+    A previously built archive whose compressed entries can be copied verbatim.
+    """
+
+    def __init__(self, zip_path: str, arcnames: set[str]):
+        """
+        Open a previous archive.
+
+        :param zip_path: The path of the previous archive.
+        :param arcnames: The entries known to be unchanged since it was built.
+        """
+        with zipfile.ZipFile(zip_path) as archive:
+            self.infos = {
+                info.filename: info
+                for info in archive.infolist()
+                if info.filename in arcnames
+                and info.compress_type in (_ZIP_STORED, _ZIP_DEFLATED)
+            }
+        # pylint: disable=consider-using-with
+        self.file: IO[bytes] = open(zip_path, "rb")
+
+    def entry(self, arcname: str) -> Optional[ZipEntry]:
+        """
+        Return the raw compressed entry for an archive name, if reusable.
+        """
+        info = self.infos.get(arcname)
+        if info is None:
+            return None
+
+        self.file.seek(info.header_offset)
+        header = self.file.read(_LOCAL_HEADER.size)
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        offset = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+        return ZipEntry(
+            arcname=arcname,
+            data=_ArchiveSlice(self.file, offset, info.compress_size),
+            crc=info.CRC,
+            file_size=info.file_size,
+            compress_size=info.compress_size,
+            compress_type=info.compress_type,
+            mode=normalize_mode(info.external_attr >> 16),
+            date_time=FIXED_DATE_TIME,
+        )
+
+    def close(self) -> None:
+        """
+        Close the previous archive.
+        """
+        self.file.close()
+
+
+def _compress_in_order(  # pylint: disable=too-many-arguments
+    sources: list[ZipSource],
+    workers: Optional[int],
+    *,
+    chunk_size: int,
+    compresslevel: int,
+    reuse: Optional[ReusableArchive] = None,
+    store_suffixes: tuple[str, ...] = (),
+) -> Iterator[ZipEntry]:
+    """
+    Compress files concurrently, yielding them in their original order.
+
+    At most ``2 * workers`` entries are in flight, which bounds the memory held
+    by spooled buffers.  Entries available from ``reuse`` are not recompressed,
+    and files ending in one of ``store_suffixes`` are stored, not deflated.
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    window = 2 * workers
+
+    def result(item: Union[ZipEntry, "Future[ZipEntry]"]) -> ZipEntry:
+        return item if isinstance(item, ZipEntry) else item.result()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: list[Union[ZipEntry, Future[ZipEntry]]] = []
+        for source in sources:
+            reused = reuse.entry(source.arcname) if reuse is not None else None
+            if reused is not None:
+                pending.append(reused)
+            elif source.arcname.lower().endswith(store_suffixes):
+                pending.append(executor.submit(store_file, source, chunk_size))
+            else:
+                pending.append(
+                    executor.submit(compress_file, source, chunk_size, compresslevel)
+                )
+            if len(pending) >= window:
+                yield result(pending.pop(0))
+        for item in pending:
+            yield result(item)
+
+
+def write_zip(  # pylint: disable=too-many-arguments
+    sources: list[ZipSource],
+    zip_path: str,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compresslevel: int = DEFAULT_COMPRESS_LEVEL,
+    reuse: Optional[ReusableArchive] = None,
+    store_suffixes: tuple[str, ...] = (),
+) -> PackageResult:
+    """
+    Write a list of files into a zip archive.
+
+    :param sources: The files to package, in archive order.
+    :param zip_path: The path of the archive to create.
+    :param workers: The number of compression threads.
+    :param chunk_size: The number of bytes read per chunk.
+    :param compresslevel: The zlib compression level.
+    :param reuse: A previous archive to copy unchanged entries from.
+    :param store_suffixes: File suffixes to store without compression, such as
+        ``STORED_SUFFIXES``.
+    :return: A summary of the packaging run.
+    """
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(zip_path)), exist_ok=True)
+
+    bytes_read = 0
+    reused_count = 0
+    entries = _compress_in_order(
+        sources,
+        workers,
+        chunk_size=chunk_size,
+        compresslevel=compresslevel,
+        reuse=reuse,
+        store_suffixes=store_suffixes,
+    )
+    with open(zip_path, "wb") as file:
+        writer = ZipWriter(file, chunk_size)
+        for entry in entries:
+            with entry.data:
+                writer.write_entry(entry)
+            if isinstance(entry.data, _ArchiveSlice):
+                reused_count += 1
+            else:
+                bytes_read += entry.file_size
+        writer.close()
+        bytes_written = writer.offset
+
+    return PackageResult(
+        zip_path=zip_path,
+        file_count=len(sources),
+        bytes_read=bytes_read,
+        bytes_written=bytes_written,
+        elapsed=time.perf_counter() - start,
+        reused_count=reused_count,
+        sha256=writer.hexdigest(),
+    )
+
+
+def build_zip(
+    source_dir: str,
+    zip_path: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compresslevel: int = DEFAULT_COMPRESS_LEVEL,
+) -> PackageResult:
+    """
+    Package a directory into a zip archive.
+
+    :param source_dir: The directory to package.
+    :param zip_path: The path of the archive to create.
+    :param workers: The number of compression threads.
+    :param chunk_size: The number of bytes read per chunk.
+    :param compresslevel: The zlib compression level.
+    :return: A summary of the packaging run.
+    """
+    zip_abspath = os.path.abspath(zip_path)
+    sources = collect_files(source_dir, exclude=lambda path: path == zip_abspath)
+
+    return write_zip(
+        sources,
+        zip_path,
+        workers=workers,
+        chunk_size=chunk_size,
+        compresslevel=compresslevel,
+    )
@@ -0,0 +1,275 @@
+"""
+This module contains utility functions for slimming Lambda artifacts.
+
+Pruning works on the list of files to package rather than on the files
+themselves, so source directories are never modified.  Each rule is a list of
+glob patterns matched against ``"/" + arcname``; a file matching any rule is
+left out of the archive.  Rules for tests and docs leave importable packages
+alone: a directory such as ``botocore/docs`` that holds an ``__init__.py`` is
+code, however it is named.  Shared objects can additionally be stripped of debug
+symbols into a staging directory when a ``strip`` binary is available.
+"""
+
+# prune.py
+
+import fnmatch
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from lambda_kit.utils.cache import hash_file
+from lambda_kit.utils.packaging import ZipSource
+
+STRIP_RULE_NAME = "strip"
+
+
+@dataclass
+class PruneRule:
+    """
+    A named set of glob patterns for files Lambda never needs.
+    """
+
+    name: str
+    patterns: list[str]
+    skip_packages: bool = False
+
+    def matches(self, arcname: str) -> bool:
+        """
+        Determine if a file matches any of the rule's patterns.
+        """
+        path = f"/{arcname}"
+        return any(fnmatch.fnmatchcase(path, pattern) for pattern in self.patterns)
+
+    def spares(self, arcname: str, packages: set[str]) -> bool:
+        """
+        Determine if a matching file is spared because the rule matches it
+        through a directory that is an importable package.
+
+        :param arcname: The file's name in the archive.
+        :param packages: The directories, as archive names, that hold an
+            ``__init__.py``.
+        """
+        if not self.skip_packages:
+            return False
+        parts = arcname.split("/")[:-1]
+        for depth in range(1, len(parts) + 1):
+            directory = "/".join(parts[:depth])
+            if directory in packages and self.matches(f"{directory}/__init__.py"):
+                return True
+        return False
+
+
+DEFAULT_PRUNE_RULES = [
+    PruneRule("bytecode", ["*/__pycache__/*", "*.pyc", "*.pyo"]),
+    PruneRule("tests", ["*/tests/*", "*/test/*"], skip_packages=True),
+    PruneRule(
+        "dist-info",
+        [
+            "*.dist-info/RECORD",
+            "*.dist-info/INSTALLER",
+            "*.dist-info/REQUESTED",
+            "*.dist-info/WHEEL",
+            "*.dist-info/direct_url.json",
+        ],
+    ),
+    PruneRule("docs", ["*/docs/*", "*/doc/*", "*.md", "*.rst"], skip_packages=True),
+    PruneRule("stubs", ["*.pyi", "*/py.typed"]),
+    PruneRule("sources", ["*.pyx", "*.pxd", "*.pxi", "*.c", "*.cpp", "*.h", "*.hpp"]),
+]
+
+
+@dataclass
+class PruneConfig:
+    """
+    The pruning settings of a function or layer.
+    """
+
+    enabled: bool = False
+    rules: list[PruneRule] = field(default_factory=lambda: list(DEFAULT_PRUNE_RULES))
+    keep: list[str] = field(default_factory=list)
+    strip: bool = True
+
+
+@dataclass
+class RuleSavings:
+    """
+    The files and bytes removed by one rule.
+    """
+
+    files: int = 0
+    bytes: int = 0
+
+
+def load_prune_config(config: dict[str, Any]) -> PruneConfig:
+    """
+    Build the pruning settings from the ``[prune]`` table of a settings file.
+
+    Recognized keys are ``enabled``, ``strip``, ``disable`` (names of default
+    rules to turn off), ``keep`` (patterns that are never pruned) and ``rules``
+    (a table of additional named pattern lists).
+
+    :param config: The parsed settings file.
+    :return: The pruning settings.
+    :raises ValueError: If a disabled rule is unknown.
+    """
+    table = config.get("prune", {})
+    disabled = set(table.get("disable", []))
+
+    known = {rule.name for rule in DEFAULT_PRUNE_RULES}
+    unknown = disabled - known - set(table.get("rules", {}))
+    if unknown:
+        raise ValueError(f"Unknown prune rules: {', '.join(sorted(unknown))}")
+
+    rules = [rule for rule in DEFAULT_PRUNE_RULES if rule.name not in disabled]
+    for name, patterns in table.get("rules", {}).items():
+        if name not in disabled:
+            rules.append(PruneRule(name, list(patterns)))
+
+    return PruneConfig(
+        enabled=bool(table.get("enabled", False)),
+        rules=rules,
+        keep=list(table.get("keep", [])),
+        strip=bool(table.get("strip", True)),
+    )
+
+
+def _strip_shared_object(strip: str, source: ZipSource, staging_dir: str) -> str:
+    """
+    Write a copy of a shared object without debug symbols.
+
+    The copy is reused while the original's hash matches the one recorded next
+    to it; modification times are not trusted, since copies, archives and
+    installers can make a replaced object look older than its stripped copy.
+    """
+    path = os.path.join(staging_dir, *source.arcname.split("/"))
+    hash_path = f"{path}.sha256"
+    sha256 = hash_file(source.path)
+    try:
+        with open(hash_path, "r", encoding="utf-8") as file:
+            if os.path.isfile(path) and file.read() == sha256:
+                return path
+    except OSError:
+        pass
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    shutil.copyfile(source.path, path)
+    subprocess.run(
+        [strip, "--strip-debug", path], capture_output=True, check=True, text=True
+    )
+    with open(hash_path, "w", encoding="utf-8") as file:
+        file.write(sha256)
+    return path
+
+
+def strip_shared_objects(
+    sources: list[ZipSource],
+    staging_dir: str,
+    workers: Optional[int] = None,
+) -> tuple[list[ZipSource], RuleSavings]:
+    """
+    Replace shared objects with stripped copies when ``strip`` is available.
+
+    Objects that ``strip`` cannot process are packaged unchanged.
+
+    :param sources: The files to package.
+    :param staging_dir: Where stripped copies are written.
+    :param workers: The number of concurrent ``strip`` processes.
+    :return: The updated file list and the bytes saved.
+    """
+    strip = shutil.which("strip")
+    savings = RuleSavings()
+    if strip is None:
+        return sources, savings
+
+    def process(source: ZipSource) -> ZipSource:
+        if not source.arcname.endswith(".so") and ".so." not in source.arcname:
+            return source
+        try:
+            path = _strip_shared_object(strip, source, staging_dir)
+        except (OSError, subprocess.CalledProcessError):
+            return source
+        return ZipSource(path=path, arcname=source.arcname)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        stripped = list(executor.map(process, sources))
+
+    for before, after in zip(sources, stripped):
+        if before.path != after.path:
+            saved = os.path.getsize(before.path) - os.path.getsize(after.path)
+            if saved > 0:
+                savings.files += 1
+                savings.bytes += saved
+
+    return stripped, savings
+
+
+def prune_sources(
+    sources: list[ZipSource],
+    config: PruneConfig,
+    staging_dir: str,
+    workers: Optional[int] = None,
+) -> tuple[list[ZipSource], dict[str, RuleSavings]]:
+    """
+    Drop files Lambda never needs and strip shared objects.
+
+    :param sources: The files to package.
+    :param config: The pruning settings.
+    :param staging_dir: Where stripped shared objects are written.
+    :param workers: The number of concurrent ``strip`` processes.
+    :return: The remaining files and the savings per rule.
+    """
+    report = {rule.name: RuleSavings() for rule in config.rules}
+    kept = []
+    packages = {
+        source.arcname[: -len("/__init__.py")]
+        for source in sources
+        if source.arcname.endswith("/__init__.py")
+    }
+
+    for source in sources:
+        path = f"/{source.arcname}"
+        if any(fnmatch.fnmatchcase(path, pattern) for pattern in config.keep):
+            kept.append(source)
+            continue
+
+        rule = next(
+            (
+                rule
+                for rule in config.rules
+                if rule.matches(source.arcname)
+                and not rule.spares(source.arcname, packages)
+            ),
+            None,
+        )
+        if rule is None:
+            kept.append(source)
+            continue
+
+        report[rule.name].files += 1
+        report[rule.name].bytes += os.path.getsize(source.path)
+
+    if config.strip:
+        kept, report[STRIP_RULE_NAME] = strip_shared_objects(kept, staging_dir, workers)
+
+    return kept, report
+
+
+def describe_prune_report(report: dict[str, RuleSavings]) -> list[str]:
+    """
+    Format one summary line per pruning rule, plus a total.
+    """
+    lines = []
+    for name, savings in report.items():
+        if name == STRIP_RULE_NAME:
+            lines.append(
+                f"Stripped {savings.files} shared objects, saving {savings.bytes} bytes"
+            )
+        else:
+            lines.append(f"Pruned {name}: {savings.files} files, {savings.bytes} bytes")
+
+    total_bytes = sum(savings.bytes for savings in report.values())
+    lines.append(f"Total saved: {total_bytes} bytes")
+    return lines
@@ -0,0 +1,786 @@
+"""
+This module contains an emulator of the Lambda Runtime API for load testing.
+
+Every execution environment is a worker process running a stdlib-only runtime
+client (``_runtime_worker.py``) against its own Runtime API endpoint, the way
+Lambda gives each environment its own ``AWS_LAMBDA_RUNTIME_API``.  The client
+polls ``/runtime/invocation/next`` and posts each result to
+``/runtime/invocation/{id}/response`` or ``/runtime/invocation/{id}/error``.
+
+Environments are started on demand, as Lambda does: an invocation goes to an
+idle environment if there is one, to a newly started environment while fewer
+than the maximum are running, and otherwise waits for one to become idle.
+The first invocation of an environment is its cold start.  An environment that
+times out or crashes is discarded, so the next invocation starts a new one.
+"""
+
+# runtime_api.py
+
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Callable, Optional
+
+from lambda_kit.utils.invoke import DEFAULT_MEMORY_MB, DEFAULT_TIMEOUT_MS, percentile
+
+RUNTIME_API_PREFIX = "/2018-06-01/runtime"
+
+# The path of the Runtime Interface Emulator's invoke endpoint.
+INVOKE_PATH = "/2015-03-31/functions/function/invocations"
+
+# Lambda allows this long for an environment to initialize.
+INIT_TIMEOUT_MS = 10_000
+
+# Upper bounds of the latency histogram buckets.
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_runtime_worker.py")
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+}
+_ACCEPTED = b'{"status":"OK"}'
+
+
+@dataclass
+class InvocationRecord:
+    """
+    The outcome of one invocation.
+    """
+
+    environment: int
+    cold: bool
+    latency_ms: float
+    duration_ms: float
+    error: Optional[str] = None
+
+
+@dataclass
+class EnvironmentRecord:
+    """
+    The life of one execution environment.
+    """
+
+    environment: int
+    started_s: float
+    init_ms: float
+    invocations: int
+    errors: int
+
+
+@dataclass
+class LoadResult:
+    """
+    Throughput and latency measurements of a load test.
+    """
+
+    concurrency: int
+    elapsed_s: float
+    invocations: list[InvocationRecord]
+    environments: list[EnvironmentRecord]
+
+    @property
+    def throughput(self) -> float:
+        """
+        The completed invocations per second.
+        """
+        return len(self.invocations) / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def cold_starts(self) -> int:
+        """
+        The number of invocations that started an environment.
+        """
+        return sum(record.cold for record in self.invocations)
+
+    @property
+    def errors(self) -> list[str]:
+        """
+        The error of every failed invocation.
+        """
+        return [record.error for record in self.invocations if record.error]
+
+    def latency_percentile_ms(
+        self, percent: float, cold: Optional[bool] = None
+    ) -> float:
+        """
+        Return a latency percentile, optionally of cold or warm invocations only.
+        """
+        return percentile(
+            [
+                record.latency_ms
+                for record in self.invocations
+                if cold is None or record.cold == cold
+            ],
+            percent,
+        )
+
+    def histogram(self) -> list[tuple[str, int]]:
+        """
+        Count the invocations per latency bucket.
+
+        :return: A label and a count per bucket, from the first non-empty
+            bucket to the last.
+        """
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for record in self.invocations:
+            index = next(
+                (
+                    index
+                    for index, bound in enumerate(HISTOGRAM_BOUNDS_MS)
+                    if record.latency_ms <= bound
+                ),
+                len(HISTOGRAM_BOUNDS_MS),
+            )
+            counts[index] += 1
+
+        labels = [f"<= {bound}" for bound in HISTOGRAM_BOUNDS_MS]
+        labels.append(f"> {HISTOGRAM_BOUNDS_MS[-1]}")
+        used = [index for index, count in enumerate(counts) if count]
+        if not used:
+            return []
+        first, last = used[0], used[-1] + 1
+        return list(zip(labels, counts))[first:last]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the measurements to plain data for JSON output.
+
+        Latencies are summarized as percentiles and a histogram rather than
+        listed.
+        """
+        init_ms = [record.init_ms for record in self.environments if record.init_ms]
+        return {
+            "invocation_count": len(self.invocations),
+            "concurrency": self.concurrency,
+            "elapsed_s": self.elapsed_s,
+            "throughput": self.throughput,
+            "cold_starts": self.cold_starts,
+            "error_count": len(self.errors),
+            "latency_p50_ms": self.latency_percentile_ms(50),
+            "latency_p90_ms": self.latency_percentile_ms(90),
+            "latency_p99_ms": self.latency_percentile_ms(99),
+            "warm_p50_ms": self.latency_percentile_ms(50, cold=False),
+            "warm_p99_ms": self.latency_percentile_ms(99, cold=False),
+            "cold_p50_ms": self.latency_percentile_ms(50, cold=True),
+            "init_median_ms": statistics.median(init_ms) if init_ms else 0.0,
+            "histogram": dict(self.histogram()),
+            "environments": [asdict(record) for record in self.environments],
+        }
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[tuple[str, str, bytes]]:
+    """
+    Read one HTTP/1.1 request; return None when the client disconnects.
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", "0"))
+    body = await reader.readexactly(length) if length else b""
+    return method, path, body
+
+
+def _write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: bytes,
+    headers: Optional[dict[str, str]] = None,
+) -> None:
+    """
+    Write one HTTP/1.1 response with a JSON body.
+    """
+    lines = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        *(f"{name}: {value}" for name, value in (headers or {}).items()),
+    ]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def _error_message(body: bytes) -> str:
+    """
+    Format an error posted by a runtime client as ``Type: message``.
+    """
+    try:
+        error = json.loads(body)
+        return f"{error.get('errorType', 'Error')}: {error.get('errorMessage', '')}"
+    except (ValueError, AttributeError):
+        return body.decode("utf-8", errors="replace") or "Unknown error"
+
+
+@dataclass
+class _Invocation:
+    """
+    An invocation on its way through an environment.
+    """
+
+    payload: bytes
+    future: "asyncio.Future[tuple[bytes, Optional[str]]]"
+    request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    delivered: Optional[float] = None
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+@dataclass
+class FunctionSettings:
+    """
+    The function an emulator runs, and the settings Lambda would run it with.
+    """
+
+    task_root: str
+    handler: str
+    function_name: str
+    timeout_ms: int = DEFAULT_TIMEOUT_MS
+    memory_mb: int = DEFAULT_MEMORY_MB
+    python: str = sys.executable
+
+    @property
+    def function_arn(self) -> str:
+        """
+        The ARN reported to the handler.
+        """
+        return f"arn:aws:lambda:us-east-1:000000000000:function:{self.function_name}"
+
+    def environment_variables(self) -> dict[str, str]:
+        """
+        Return the variables Lambda sets in every execution environment.
+        """
+        return {
+            "_HANDLER": self.handler,
+            "LAMBDA_TASK_ROOT": self.task_root,
+            "AWS_LAMBDA_FUNCTION_NAME": self.function_name,
+            "AWS_LAMBDA_FUNCTION_VERSION": "$LATEST",
+            "AWS_LAMBDA_FUNCTION_MEMORY_SIZE": str(self.memory_mb),
+            "AWS_LAMBDA_LOG_GROUP_NAME": f"/aws/lambda/{self.function_name}",
+            "AWS_REGION": os.environ.get("AWS_REGION", "us-east-1"),
+            "PYTHONDONTWRITEBYTECODE": "1",
+        }
+
+
+@dataclass
+class _RuntimeClient:
+    """
+    An environment's runtime client process, its Runtime API and its output.
+    """
+
+    server: Optional[asyncio.AbstractServer] = None
+    process: Optional["asyncio.subprocess.Process"] = None
+    watcher: Optional["asyncio.Future[None]"] = None
+    log: IO[bytes] = field(default_factory=tempfile.TemporaryFile)
+    init_error: Optional[str] = None
+
+
+@dataclass
+class _Usage:
+    """
+    When an environment started and became ready, and what it has run.
+    """
+
+    started: float = 0.0
+    ready: Optional[float] = None
+    invocations: int = 0
+    errors: int = 0
+
+
+class _Environment:
+    """
+    One execution environment: a runtime client process and its Runtime API.
+    """
+
+    def __init__(self, index: int, emulator: "RuntimeEmulator"):
+        self.index = index
+        self.emulator = emulator
+        self.queue: "asyncio.Queue[_Invocation]" = asyncio.Queue()
+        self.current: Optional[_Invocation] = None
+        self.client = _RuntimeClient()
+        self.usage = _Usage()
+        self.alive = True
+
+    @property
+    def init_error(self) -> Optional[str]:
+        """
+        The error the runtime client reported while initializing, if any.
+        """
+        return self.client.init_error
+
+    async def start(self) -> None:
+        """
+        Start the environment's Runtime API and its runtime client.
+        """
+        self.client.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self.client.server.sockets[0].getsockname()[1]
+        env = dict(
+            os.environ,
+            **self.emulator.function.environment_variables(),
+            AWS_LAMBDA_RUNTIME_API=f"127.0.0.1:{port}",
+            AWS_LAMBDA_LOG_STREAM_NAME=f"local/{self.index}",
+        )
+        self.usage.started = time.perf_counter()
+        self.client.process = await asyncio.create_subprocess_exec(
+            self.emulator.function.python,
+            _WORKER,
+            cwd=self.emulator.function.task_root,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=self.client.log,
+            stderr=self.client.log,
+        )
+        self.client.watcher = asyncio.ensure_future(self._watch())
+
+    async def _watch(self) -> None:
+        """
+        Fail the pending invocations when the runtime client exits.
+        """
+        if self.client.process is None:
+            return
+        status = await self.client.process.wait()
+        self.alive = False
+        reason = (
+            self.client.init_error or f"Runtime.ExitError: exited with status {status}"
+        )
+        pending = [self.current] if self.current else []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for invocation in pending:
+            if not invocation.future.done():
+                invocation.future.set_result((b"", reason))
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                status, headers, body = await self._route(*request)
+                _write_response(writer, status, body, headers)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Connections still waiting for an invocation are cancelled when
+            # the loop shuts down; end quietly rather than as an error.
+            pass
+        finally:
+            writer.close()
+
+    async def _route(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        """
+        Answer one Runtime API request.
+        """
+        if method == "GET" and path == f"{RUNTIME_API_PREFIX}/invocation/next":
+            if self.usage.ready is None:
+                self.usage.ready = time.perf_counter()
+            invocation = await self.queue.get()
+            invocation.delivered = time.perf_counter()
+            invocation.started.set()
+            self.current = invocation
+            function = self.emulator.function
+            deadline_ms = int(time.time() * 1000) + function.timeout_ms
+            return (
+                200,
+                {
+                    "Lambda-Runtime-Aws-Request-Id": invocation.request_id,
+                    "Lambda-Runtime-Deadline-Ms": str(deadline_ms),
+                    "Lambda-Runtime-Invoked-Function-Arn": function.function_arn,
+                    "Lambda-Runtime-Trace-Id": f"Root=1-{uuid.uuid4().hex[:24]}",
+                },
+                invocation.payload,
+            )
+
+        if method == "POST" and path == f"{RUNTIME_API_PREFIX}/init/error":
+            self.client.init_error = _error_message(body)
+            return 202, {}, _ACCEPTED
+
+        parts = path.split("/")
+        if (
+            method == "POST"
+            and path.startswith(f"{RUNTIME_API_PREFIX}/invocation/")
+            and len(parts) == 6
+            and parts[5] in ("response", "error")
+        ):
+            current = self.current
+            if current is None or current.request_id != parts[4]:
+                return 400, {}, b'{"errorMessage":"Invalid request ID"}'
+            self.current = None
+            error = _error_message(body) if parts[5] == "error" else None
+            if not current.future.done():
+                current.future.set_result((body, error))
+            return 202, {}, _ACCEPTED
+
+        return 404, {}, b'{"errorMessage":"Not found"}'
+
+    @staticmethod
+    async def _delivery(invocation: _Invocation) -> None:
+        """
+        Wait until the runtime client takes the invocation, or it fails first.
+        """
+        started = asyncio.ensure_future(invocation.started.wait())
+        waiters: list["asyncio.Future[Any]"] = [started, invocation.future]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            started.cancel()
+
+    async def run(
+        self, invocation: _Invocation, start: float
+    ) -> tuple[InvocationRecord, bytes]:
+        """
+        Run one invocation in this environment.
+
+        :param invocation: The invocation.
+        :param start: When the invocation was requested.
+        :return: The outcome and the response payload.
+        """
+        cold = self.usage.invocations == 0
+        self.usage.invocations += 1
+        self.queue.put_nowait(invocation)
+
+        try:
+            if cold:
+                await asyncio.wait_for(
+                    self._delivery(invocation), INIT_TIMEOUT_MS / 1000
+                )
+            response, error = await asyncio.wait_for(
+                asyncio.shield(invocation.future),
+                self.emulator.function.timeout_ms / 1000,
+            )
+        except asyncio.TimeoutError:
+            response = b""
+            if invocation.delivered is None:
+                error = f"Init timed out after {INIT_TIMEOUT_MS / 1000:.2f} seconds"
+            else:
+                timeout_s = self.emulator.function.timeout_ms / 1000
+                error = f"Task timed out after {timeout_s:.2f} seconds"
+            await self.close()
+
+        finished = time.perf_counter()
+        if error:
+            self.usage.errors += 1
+        record = InvocationRecord(
+            environment=self.index,
+            cold=cold,
+            latency_ms=(finished - start) * 1000,
+            duration_ms=(finished - (invocation.delivered or finished)) * 1000,
+            error=error,
+        )
+        return record, response
+
+    def read_log(self) -> str:
+        """
+        Return what the runtime client has written to stdout and stderr.
+        """
+        self.client.log.seek(0)
+        return self.client.log.read().decode("utf-8", errors="replace")
+
+    def to_record(self, epoch: float) -> EnvironmentRecord:
+        """
+        Summarize the environment.
+
+        :param epoch: When the emulator started.
+        """
+        return EnvironmentRecord(
+            environment=self.index,
+            started_s=self.usage.started - epoch,
+            init_ms=(
+                (self.usage.ready - self.usage.started) * 1000
+                if self.usage.ready
+                else 0.0
+            ),
+            invocations=self.usage.invocations,
+            errors=self.usage.errors,
+        )
+
+    async def close(self) -> None:
+        """
+        Stop the runtime client and the Runtime API.
+        """
+        self.alive = False
+        if self.client.process is not None and self.client.process.returncode is None:
+            self.client.process.kill()
+            await self.client.process.wait()
+        if self.client.watcher is not None:
+            await self.client.watcher
+        if self.client.server is not None:
+            self.client.server.close()
+
+
+class RuntimeEmulator:
+    """
+    Runs a handler in a pool of execution environments, started on demand.
+
+    It must be created inside a running event loop.
+    """
+
+    def __init__(self, function: FunctionSettings, max_environments: int):
+        """
+        Initialize a new RuntimeEmulator.
+
+        :param function: The function to run.
+        :param max_environments: The most environments to run at once.
+        """
+        self.function = function
+        self.max_environments = max_environments
+        self.environments: list[_Environment] = []
+        self.idle: "asyncio.Queue[_Environment]" = asyncio.Queue()
+        self.epoch = time.perf_counter()
+
+    @property
+    def init_error(self) -> Optional[str]:
+        """
+        The first initialization error of any environment, with its output.
+        """
+        for environment in self.environments:
+            if environment.init_error:
+                log = environment.read_log().strip()
+                return environment.init_error + (f"\n{log}" if log else "")
+        return None
+
+    async def _acquire(self) -> _Environment:
+        """
+        Take an idle environment, start a new one, or wait for one to be idle.
+        """
+        while True:
+            if not self.idle.empty():
+                environment = self.idle.get_nowait()
+            elif (
+                sum(environment.alive for environment in self.environments)
+                < self.max_environments
+            ):
+                environment = _Environment(len(self.environments), self)
+                self.environments.append(environment)
+                await environment.start()
+                return environment
+            else:
+                environment = await self.idle.get()
+            if environment.alive:
+                return environment
+
+    async def invoke(self, payload: bytes) -> tuple[InvocationRecord, bytes]:
+        """
+        Invoke the handler with a JSON payload.
+
+        :param payload: The event, as JSON.
+        :return: The outcome and the response payload.
+        """
+        start = time.perf_counter()
+        environment = await self._acquire()
+        future = asyncio.get_running_loop().create_future()
+        record, response = await environment.run(_Invocation(payload, future), start)
+        if environment.alive:
+            self.idle.put_nowait(environment)
+        return record, response
+
+    def environment_records(self) -> list[EnvironmentRecord]:
+        """
+        Summarize every environment started so far.
+        """
+        return [environment.to_record(self.epoch) for environment in self.environments]
+
+    async def close(self) -> None:
+        """
+        Stop every environment.
+        """
+        for environment in self.environments:
+            await environment.close()
+            environment.client.log.close()
+
+
+async def _run_load(
+    emulator: RuntimeEmulator, payloads: list[bytes], requests: int, concurrency: int
+) -> LoadResult:
+    records: list[InvocationRecord] = []
+    counter = itertools.count()
+
+    async def client() -> None:
+        for index in iter(counter.__next__, None):
+            if index >= requests:
+                return
+            record, _ = await emulator.invoke(payloads[index % len(payloads)])
+            records.append(record)
+            init_error = emulator.init_error
+            if init_error is not None:
+                raise RuntimeError(
+                    f"Could not initialize {emulator.function.handler}: {init_error}"
+                )
+
+    start = time.perf_counter()
+    clients = [asyncio.ensure_future(client()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*clients)
+    finally:
+        # Stop the other clients before the environments are closed.
+        for task in clients:
+            task.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+    return LoadResult(
+        concurrency=concurrency,
+        elapsed_s=time.perf_counter() - start,
+        invocations=records,
+        environments=emulator.environment_records(),
+    )
+
+
+def run_load_test(  # pylint: disable=too-many-arguments
+    task_root: str,
+    handler: str,
+    function_name: str,
+    payloads: list[bytes],
+    *,
+    requests: int = 100,
+    concurrency: int = 10,
+    max_environments: Optional[int] = None,
+    timeout_ms: int = DEFAULT_TIMEOUT_MS,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    python: str = sys.executable,
+) -> LoadResult:
+    """
+    Fire concurrent invocations at a handler and measure them.
+
+    :param task_root: The directory the function is unpacked in.
+    :param handler: The handler as ``module.function``.
+    :param function_name: The function's name.
+    :param payloads: The JSON events, used in turn.
+    :param requests: The number of invocations.
+    :param concurrency: The number of invocations in flight at once.
+    :param max_environments: The most environments to run at once; as many
+        as the concurrency if omitted.
+    :param timeout_ms: The invocation timeout.
+    :param memory_mb: The memory size reported to the handler.
+    :param python: The interpreter to run environments with.
+    :return: The measurements.
+    :raises RuntimeError: If the handler cannot be initialized.
+    """
+    function = FunctionSettings(
+        task_root=os.path.abspath(task_root),
+        handler=handler,
+        function_name=function_name,
+        timeout_ms=timeout_ms,
+        memory_mb=memory_mb,
+        python=python,
+    )
+
+    async def main() -> LoadResult:
+        emulator = RuntimeEmulator(function, max_environments or concurrency)
+        try:
+            return await _run_load(emulator, payloads, requests, concurrency)
+        finally:
+            await emulator.close()
+
+    return asyncio.run(main())
+
+
+def serve_invocations(  # pylint: disable=too-many-arguments
+    task_root: str,
+    handler: str,
+    function_name: str,
+    *,
+    host: str,
+    port: int,
+    max_environments: int,
+    on_ready: Callable[[str], None],
+    on_invocation: Callable[[InvocationRecord], None],
+    timeout_ms: int = DEFAULT_TIMEOUT_MS,
+    memory_mb: int = DEFAULT_MEMORY_MB,
+    python: str = sys.executable,
+) -> None:
+    """
+    Serve the Runtime Interface Emulator's invoke endpoint until interrupted.
+
+    ``POST /2015-03-31/functions/function/invocations`` with a JSON event
+    invokes the handler and returns its response.  Failed invocations are
+    answered with the error and an ``X-Amz-Function-Error`` header.
+
+    :param task_root: The directory the function is unpacked in.
+    :param handler: The handler as ``module.function``.
+    :param function_name: The function's name.
+    :param host: The address to listen on.
+    :param port: The port to listen on; any free port if 0.
+    :param max_environments: The most environments to run at once.
+    :param on_ready: Called with the endpoint's URL once listening.
+    :param on_invocation: Called with the outcome of every invocation.
+    :param timeout_ms: The invocation timeout.
+    :param memory_mb: The memory size reported to the handler.
+    :param python: The interpreter to run environments with.
+    """
+    function = FunctionSettings(
+        task_root=os.path.abspath(task_root),
+        handler=handler,
+        function_name=function_name,
+        timeout_ms=timeout_ms,
+        memory_mb=memory_mb,
+        python=python,
+    )
+
+    async def main() -> None:
+        emulator = RuntimeEmulator(function, max_environments)
+
+        async def serve(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            try:
+                while True:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, path, body = request
+                    if method != "POST" or path.split("?")[0] != INVOKE_PATH:
+                        _write_response(writer, 404, b'{"errorMessage":"Not found"}')
+                    else:
+                        record, response = await emulator.invoke(body or b"{}")
+                        on_invocation(record)
+                        if record.error:
+                            _write_response(
+                                writer,
+                                200,
+                                response or json.dumps(record.error).encode("utf-8"),
+                                {"X-Amz-Function-Error": "Unhandled"},
+                            )
+                        else:
+                            _write_response(writer, 200, response)
+                    await writer.drain()
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                pass
+            except asyncio.CancelledError:
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(serve, host, port)
+        bound_host, bound_port = server.sockets[0].getsockname()[:2]
+        on_ready(f"http://{bound_host}:{bound_port}{INVOKE_PATH}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            server.close()
+            await emulator.close()
+
+    asyncio.run(main())
@@ -0,0 +1,238 @@
+"""
+This module contains the catalog of handler templates used to scaffold functions.
+
+Templates ship inside the package and are rendered through one Jinja2
+environment per process, so each template is compiled at most once per run.
+Compiled templates are also kept in a ``FileSystemBytecodeCache``, so later
+runs skip compiling altogether.  Extra template directories can add templates
+to the catalog or replace the packaged ones.
+
+Templates under ``tuned/`` are the performance-tuned set, and the default.
+They keep clients, configuration and worker pools at module level, so they are
+created once per execution environment.  Logging is lazy and guarded by level,
+and batch consumers process records concurrently and report partial batch
+failures.
+"""
+
+# templates.py
+
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+import toml
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates"
+)
+TEMPLATE_SUFFIX = ".py.jinja2"
+DEFAULT_TEMPLATE = "tuned/api-gateway"
+DEFAULT_BYTECODE_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "lambda-kit", "jinja2"
+)
+
+# The file each scaffolded function's handler is written to.
+HANDLER_FILE_NAME = "handler.py"
+
+
+@dataclass
+class HandlerTemplate:
+    """
+    A handler template and the values it is rendered with by default.
+    """
+
+    name: str
+    description: str
+    context: dict[str, Any] = field(default_factory=dict)
+
+
+CATALOG = {
+    template.name: template
+    for template in [
+        HandlerTemplate(
+            name="api-gateway",
+            description="API Gateway proxy integration returning a JSON response",
+            context={"status_code": 200, "body_message": "Hello, World!"},
+        ),
+        HandlerTemplate(
+            name="sqs",
+            description="SQS batch consumer reporting partial batch failures",
+        ),
+        HandlerTemplate(
+            name="s3",
+            description="S3 event notification processor",
+        ),
+        HandlerTemplate(
+            name="eventbridge",
+            description="EventBridge rule target filtering on detail-type",
+            context={"detail_type": "Example Event"},
+        ),
+        HandlerTemplate(
+            name="tuned/api-gateway",
+            description="API Gateway proxy integration with a prebuilt response "
+            "and level-guarded logging",
+            context={"status_code": 200, "body_message": "Hello, World!"},
+        ),
+        HandlerTemplate(
+            name="tuned/sqs",
+            description="SQS consumer processing messages on a bounded thread "
+            "pool, reporting partial batch failures",
+            context={"max_workers": 8},
+        ),
+        HandlerTemplate(
+            name="tuned/kinesis",
+            description="Kinesis consumer processing records on a bounded thread "
+            "pool, reporting partial batch failures",
+            context={"max_workers": 8},
+        ),
+        HandlerTemplate(
+            name="tuned/s3",
+            description="S3 event notification processor streaming objects "
+            "through a shared client",
+        ),
+        HandlerTemplate(
+            name="tuned/eventbridge",
+            description="EventBridge rule target with level-guarded logging",
+            context={"detail_type": "Example Event"},
+        ),
+    ]
+}
+
+
+@dataclass
+class ScaffoldSpec:
+    """
+    A function to scaffold: where, from which template, with which values.
+    """
+
+    source_dir: str
+    template: str = DEFAULT_TEMPLATE
+    context: dict[str, Any] = field(default_factory=dict)
+
+
+def file_name(template: str) -> str:
+    """
+    Return the file name of a template in the catalog.
+    """
+    return template.replace("-", "_") + TEMPLATE_SUFFIX
+
+
+@lru_cache(maxsize=None)
+def get_environment(
+    template_dirs: tuple[str, ...] = (),
+    bytecode_cache_dir: Optional[str] = DEFAULT_BYTECODE_CACHE,
+) -> "Environment":
+    """
+    Return the shared Jinja2 environment for a set of template directories.
+
+    :param template_dirs: Directories searched before the packaged templates.
+    :param bytecode_cache_dir: Where compiled templates are kept between runs,
+        or None to compile on every run.
+    :return: The environment.
+    """
+    # pylint: disable=import-outside-toplevel
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        try:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        except OSError:
+            pass
+
+    return Environment(
+        loader=FileSystemLoader([*template_dirs, TEMPLATE_DIR]),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        keep_trailing_newline=True,
+    )
+
+
+def list_templates(template_dirs: Sequence[str] = ()) -> dict[str, str]:
+    """
+    List the templates available, with their descriptions.
+
+    :param template_dirs: Directories searched before the packaged templates.
+    :return: The description per template name, sorted by name.
+    """
+    templates = {name: template.description for name, template in CATALOG.items()}
+    for directory in template_dirs:
+        for name in os.listdir(directory):
+            if name.endswith(TEMPLATE_SUFFIX):
+                template = name[: -len(TEMPLATE_SUFFIX)].replace("_", "-")
+                templates.setdefault(template, f"Custom template in {directory}")
+    return dict(sorted(templates.items()))
+
+
+def render_handler(
+    template: str,
+    context: Optional[dict[str, Any]] = None,
+    template_dirs: Sequence[str] = (),
+    bytecode_cache_dir: Optional[str] = DEFAULT_BYTECODE_CACHE,
+) -> str:
+    """
+    Render a handler module from a template.
+
+    :param template: The template name, e.g. ``sqs``.
+    :param context: Values overriding the template's defaults.
+    :param template_dirs: Directories searched before the packaged templates.
+    :param bytecode_cache_dir: Where compiled templates are kept between runs.
+    :return: The handler's source code.
+    :raises ValueError: If there is no such template.
+    """
+    if template not in list_templates(template_dirs):
+        raise ValueError(
+            f"Unknown template: {template}. "
+            f"Choose from: {', '.join(list_templates(template_dirs))}."
+        )
+
+    values: dict[str, Any] = {"description": "A new Lambda function"}
+    if template in CATALOG:
+        values.update(CATALOG[template].context)
+    values.update(context or {})
+
+    environment = get_environment(tuple(template_dirs), bytecode_cache_dir)
+    return environment.get_template(file_name(template)).render(values)
+
+
+def load_scaffold_manifest(path: str) -> list[ScaffoldSpec]:
+    """
+    Load a manifest describing many functions to scaffold.
+
+    The manifest is a TOML file with a ``[[functions]]`` table per function.
+    Each needs a ``source_dir``, relative to the manifest, and may name a
+    ``template``; every other key is passed to the template.  Keys in an
+    optional ``[defaults]`` table apply to every function.
+
+    :param path: The manifest file.
+    :return: The functions to scaffold, in manifest order.
+    :raises ValueError: If the manifest is invalid.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            manifest = toml.load(file)
+    except toml.TomlDecodeError as err:
+        raise ValueError(f"Invalid manifest {path}: {err}") from err
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = dict(manifest.get("defaults", {}))
+
+    specs = []
+    for index, entry in enumerate(manifest.get("functions", [])):
+        values = {**defaults, **entry}
+        source_dir = values.pop("source_dir", None)
+        if not isinstance(source_dir, str):
+            raise ValueError(f"Function {index + 1} in {path} has no source_dir.")
+        specs.append(
+            ScaffoldSpec(
+                source_dir=os.path.join(base_dir, source_dir),
+                template=str(values.pop("template", DEFAULT_TEMPLATE)),
+                context=values,
+            )
+        )
+    return specs
@@ -0,0 +1,257 @@
+"""
+This module contains utility functions for timing the phases of a packaging run.
+
+Each phase records its wall time, CPU time, bytes read and written, and peak
+memory.  CPU time is summed over all threads and includes child processes such
+as pip.  A phase whose CPU time is well below its wall time is waiting on
+I/O, the network or a lock.  A phase whose CPU time matches or exceeds its wall
+time is CPU-bound.
+
+Bytes are the bytes a phase reports handling, or otherwise the bytes its read
+and write system calls moved.  Memory-mapped reads are not system calls, so
+phases that read through mappings report their bytes themselves.  Peak memory
+is reset at the start of each phase where Linux allows it, so phases must not
+be nested.
+
+Phases can be exported as a Chrome trace-event file for ``chrome://tracing`` or
+https://ui.perfetto.dev.
+"""
+
+# tracing.py
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+from lambda_kit.utils.artifact import format_size
+
+PHASE_HEADERS = ["Phase", "Wall (s)", "CPU (s)", "CPU %", "Read", "Written", "Peak RSS"]
+
+
+@dataclass
+class Phase:  # pylint: disable=too-many-instance-attributes
+    """
+    The measurements of one phase of a packaging run.
+
+    The byte counts are None until the phase reports them or ends.
+    """
+
+    name: str
+    start: float
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    bytes_read: Optional[int] = None
+    bytes_written: Optional[int] = None
+    peak_rss_bytes: int = 0
+    pid: int = field(default_factory=os.getpid)
+    args: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def cpu_percent(self) -> float:
+        """
+        CPU time as a percentage of wall time; above 100 means parallel work.
+        """
+        return self.cpu_s / self.wall_s * 100 if self.wall_s > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the phase to plain data for JSON output.
+        """
+        return {
+            "phase": self.name,
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "cpu_percent": self.cpu_percent,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            **self.args,
+        }
+
+
+def _cpu_time() -> float:
+    """
+    Return the CPU time of this process's threads and its finished children.
+    """
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def _io_counters() -> tuple[int, int]:
+    """
+    Return the bytes this process has read and written through system calls.
+    """
+    counters = {}
+    try:
+        with open("/proc/self/io", "r", encoding="ascii") as file:
+            for line in file:
+                key, _, value = line.partition(":")
+                counters[key] = int(value)
+    except (OSError, ValueError):
+        return 0, 0
+    return counters.get("rchar", 0), counters.get("wchar", 0)
+
+
+def _reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int:
+    """
+    Return the peak resident set size of this process, in bytes.
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PhaseTracer:  # pylint: disable=too-few-public-methods
+    """
+    Records the phases of a packaging run.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize a new PhaseTracer with no phases.
+        """
+        self.phases: list[Phase] = []
+
+    @contextmanager
+    def phase(self, name: str, **args: Any) -> Iterator[Phase]:
+        """
+        Measure a phase.
+
+        The phase is recorded when the block exits, even if it raises.  Set
+        ``bytes_read`` and ``bytes_written`` on the yielded phase to report the
+        bytes it handled instead of the bytes its system calls moved.
+
+        :param name: The phase name, e.g. ``zip``.
+        :param args: Extra values recorded with the phase.
+        :return: The phase being measured.
+        """
+        _reset_peak_rss()
+        phase = Phase(name=name, start=time.time(), args=args)
+        read, written = _io_counters()
+        cpu = _cpu_time()
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.wall_s = time.perf_counter() - start
+            phase.cpu_s = _cpu_time() - cpu
+            read_after, written_after = _io_counters()
+            if phase.bytes_read is None:
+                phase.bytes_read = read_after - read
+            if phase.bytes_written is None:
+                phase.bytes_written = written_after - written
+            phase.peak_rss_bytes = _peak_rss()
+            self.phases.append(phase)
+
+
+def summarize_phases(phases: list[Phase]) -> list[Phase]:
+    """
+    Combine phases with the same name, e.g. across the artifacts of a batch.
+
+    Times and bytes are summed; peak memory is the largest of the peaks.
+
+    :param phases: The phases to combine.
+    :return: One phase per name, in order of first appearance.
+    """
+    totals: dict[str, Phase] = {}
+    for phase in phases:
+        total = totals.setdefault(
+            phase.name,
+            Phase(
+                name=phase.name,
+                start=phase.start,
+                bytes_read=0,
+                bytes_written=0,
+                pid=phase.pid,
+            ),
+        )
+        total.wall_s += phase.wall_s
+        total.cpu_s += phase.cpu_s
+        total.bytes_read = (total.bytes_read or 0) + (phase.bytes_read or 0)
+        total.bytes_written = (total.bytes_written or 0) + (phase.bytes_written or 0)
+        total.peak_rss_bytes = max(total.peak_rss_bytes, phase.peak_rss_bytes)
+    return list(totals.values())
+
+
+def phase_rows(phases: list[Phase]) -> list[tuple[str, ...]]:
+    """
+    Format phases as table rows under ``PHASE_HEADERS``.
+    """
+    return [
+        (
+            phase.name,
+            f"{phase.wall_s:.3f}",
+            f"{phase.cpu_s:.3f}",
+            f"{phase.cpu_percent:.0f}%",
+            format_size(phase.bytes_read or 0),
+            format_size(phase.bytes_written or 0),
+            format_size(phase.peak_rss_bytes),
+        )
+        for phase in phases
+    ]
+
+
+def write_chrome_trace(phases: list[Phase], path: str) -> None:
+    """
+    Write phases as a Chrome trace-event file.
+
+    Each phase is a complete ("X") event on its process's track, so the phases
+    of a batch packaged by several processes appear side by side.
+
+    :param phases: The phases to export.
+    :param path: The file to write.
+    """
+    origin = min((phase.start for phase in phases), default=0.0)
+    events: list[dict[str, Any]] = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": pid,
+            "args": {"name": f"lambda-kit ({pid})"},
+        }
+        for pid in sorted({phase.pid for phase in phases})
+    ]
+    for phase in phases:
+        events.append(
+            {
+                "name": phase.name,
+                "cat": "package",
+                "ph": "X",
+                "ts": round((phase.start - origin) * 1_000_000, 3),
+                "dur": round(phase.wall_s * 1_000_000, 3),
+                "pid": phase.pid,
+                "tid": phase.pid,
+                "args": phase.to_dict(),
+            }
+        )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
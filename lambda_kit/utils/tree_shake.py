@@ -0,0 +1,395 @@
+"""
+This module contains utility functions for tree shaking Lambda functions.
+
+Tree shaking follows the imports of a function's handler modules through the
+files staged for packaging, and leaves out every module that can never be
+imported.  Imports are found statically by ``find_imports``, so modules that
+are only loaded by computed name (plugins, ``importlib.import_module(name)``)
+must be kept with allowlist patterns; the modules that load them are reported.
+
+``.py`` files are kept if their module is reachable.  Every other file,
+including extension modules and package data, is kept if the regular package
+containing it is reachable, and always kept outside of any package, since
+imports from C code and data lookups cannot be followed.
+"""
+
+# tree_shake.py
+
+import fnmatch
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from lambda_kit.utils.aws_lambda import (
+    PARALLEL_SCAN_THRESHOLD,
+    ScanCache,
+    scan_imports,
+)
+from lambda_kit.utils.cache import hash_file
+from lambda_kit.utils.packaging import ZipSource
+from lambda_kit.utils.prune import RuleSavings
+
+IMPORTS_CACHE_NAME = "imports.json"
+
+# Bump when the rules for finding imports change.
+IMPORTS_FORMAT_VERSION = 1
+
+# Beyond this many entries, the cache is trimmed to the files of the last scan.
+MAX_IMPORTS_CACHE_ENTRIES = 50_000
+
+
+@dataclass
+class TreeShakeConfig:
+    """
+    The tree shaking settings of a function.
+    """
+
+    enabled: bool = False
+    keep: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ModuleImports:
+    """
+    The imports found in one module.
+    """
+
+    imports: list[tuple[int, str, list[str]]]
+    dynamic: bool
+
+
+@dataclass
+class TreeShakeReport:
+    """
+    The outcome of tree shaking a function.
+    """
+
+    modules: int = 0
+    reachable: int = 0
+    removed: dict[str, RuleSavings] = field(default_factory=dict)
+    dynamic: list[str] = field(default_factory=list)
+
+
+def load_tree_shake_config(config: dict[str, Any]) -> TreeShakeConfig:
+    """
+    Build the tree shaking settings from the ``[tree_shake]`` table of a
+    settings file.
+
+    Recognized keys are ``enabled`` and ``keep`` (module name patterns that
+    are always kept, with their submodules).
+
+    :param config: The parsed settings file.
+    :return: The tree shaking settings.
+    """
+    table = config.get("tree_shake", {})
+    return TreeShakeConfig(
+        enabled=bool(table.get("enabled", False)),
+        keep=list(table.get("keep", [])),
+    )
+
+
+class ImportScanner:  # pylint: disable=too-few-public-methods
+    """
+    Finds imports in Python files, in parallel, remembering the results.
+
+    Results are cached on disk keyed by the SHA-256 of each file, so a file is
+    parsed once however often it is renamed, copied or vendored again.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, workers: Optional[int] = None):
+        """
+        Initialize a new ImportScanner.
+
+        :param cache_path: The cache file, or None to not cache on disk.
+        :param workers: The number of parser processes.
+        """
+        self.cache_path = cache_path
+        self.workers = workers
+        self._cache = ScanCache(cache_path, IMPORTS_FORMAT_VERSION)
+
+    def scan(self, paths: Sequence[str]) -> dict[str, ModuleImports]:
+        """
+        Find the imports of each of the given files.
+
+        :param paths: The Python files to check.
+        :return: The imports per file, in the order given.
+        """
+        entries = self._cache.load()
+        digests = {path: hash_file(path) for path in paths}
+        missing: dict[str, str] = {}
+        for path, digest in digests.items():
+            if digest not in entries:
+                missing.setdefault(digest, path)
+
+        if missing:
+            missing_paths = list(missing.values())
+            if len(missing_paths) < PARALLEL_SCAN_THRESHOLD or self.workers == 1:
+                results = [scan_imports(path) for path in missing_paths]
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    results = list(
+                        executor.map(scan_imports, missing_paths, chunksize=8)
+                    )
+            for digest, (imports, dynamic) in zip(missing, results):
+                entries[digest] = {"imports": imports, "dynamic": dynamic}
+            if len(entries) > MAX_IMPORTS_CACHE_ENTRIES:
+                used = set(digests.values())
+                for digest in [digest for digest in entries if digest not in used]:
+                    del entries[digest]
+            self._cache.save(entries)
+
+        found = {}
+        for path, digest in digests.items():
+            entry = entries[digest]
+            found[path] = ModuleImports(
+                imports=[
+                    (int(level), str(module), list(names))
+                    for level, module, names in entry["imports"]
+                ],
+                dynamic=bool(entry["dynamic"]),
+            )
+        return found
+
+
+def source_module(arcname: str) -> Optional[tuple[str, bool]]:
+    """
+    Return the module a staged file defines, if it is a Python source file.
+
+    :param arcname: The file's name in the archive.
+    :return: The dotted module name and whether it is a package, or None if the
+        file is not an importable ``.py`` file.
+    """
+    if not arcname.endswith(".py"):
+        return None
+
+    parts = os.path.splitext(arcname)[0].split("/")
+    is_package = parts[-1] == "__init__"
+    if is_package:
+        parts.pop()
+    if not parts or not all(part.isidentifier() for part in parts):
+        return None
+    return ".".join(parts), is_package
+
+
+def resolve_import(
+    module: str, is_package: bool, level: int, target: str
+) -> Optional[str]:
+    """
+    Resolve a possibly relative import to an absolute module name.
+
+    :param module: The importing module.
+    :param is_package: Whether the importing module is a package.
+    :param level: The number of leading dots of the import.
+    :param target: The imported module, without the leading dots.
+    :return: The absolute module name, or None if the import reaches above the
+        top-level package.
+    """
+    if level == 0:
+        return target
+
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    if level - 1 >= len(package):
+        return None
+    base = package[: len(package) - (level - 1)]
+    return ".".join([*base, target] if target else base)
+
+
+def _enclosing_package(arcname: str, packages: set[str]) -> Optional[str]:
+    """
+    Return the innermost regular package containing a staged file.
+    """
+    parts = arcname.split("/")[:-1]
+    while parts:
+        if all(part.isidentifier() for part in parts):
+            name = ".".join(parts)
+            if name in packages:
+                return name
+        parts.pop()
+    return None
+
+
+def _is_kept(module: str, patterns: list[str]) -> bool:
+    """
+    Determine if a module or one of its parents matches an allowlist pattern.
+    """
+    return any(
+        fnmatch.fnmatchcase(module, pattern)
+        or fnmatch.fnmatchcase(module, f"{pattern}.*")
+        for pattern in patterns
+    )
+
+
+def _index_modules(sources: list[ZipSource]) -> tuple[dict[str, ZipSource], set[str]]:
+    """
+    Map the staged Python files to the modules they define.
+
+    :return: The file defining each module and the names of the regular
+        packages.
+    """
+    modules: dict[str, ZipSource] = {}
+    packages: set[str] = set()
+    for source in sources:
+        parsed = source_module(source.arcname)
+        if parsed is None:
+            continue
+        name, is_package = parsed
+        # A package directory shadows a module of the same name.
+        if is_package:
+            packages.add(name)
+            modules[name] = source
+        elif name not in packages:
+            modules[name] = source
+    return modules, packages
+
+
+def _imported_modules(
+    name: str,
+    is_package: bool,
+    module_imports: ModuleImports,
+    submodules: dict[str, list[str]],
+) -> list[str]:
+    """
+    List the modules one module's imports may load.
+    """
+    imported_modules = []
+    for level, target, names in module_imports.imports:
+        base = resolve_import(name, is_package, level, target)
+        if base is None:
+            continue
+        if base:
+            imported_modules.append(base)
+        for imported in names:
+            if imported == "*":
+                imported_modules.extend(submodules.get(base, []))
+            else:
+                imported_modules.append(f"{base}.{imported}" if base else imported)
+    return imported_modules
+
+
+def _find_reachable(
+    modules: dict[str, ZipSource],
+    packages: set[str],
+    roots: list[str],
+    scanner: ImportScanner,
+) -> tuple[set[str], list[str]]:
+    """
+    Follow imports, level by level, from a set of root modules.
+
+    :return: The reachable modules and those that import by computed name.
+    """
+    submodules: dict[str, list[str]] = {}
+    for name in modules:
+        submodules.setdefault(name.rpartition(".")[0], []).append(name)
+
+    reachable: set[str] = set()
+    frontier: list[str] = []
+    dynamic: list[str] = []
+
+    def reach(name: str) -> None:
+        # Importing a submodule imports every package above it first.
+        parts = name.split(".")
+        for index in range(1, len(parts) + 1):
+            prefix = ".".join(parts[:index])
+            if prefix in modules and prefix not in reachable:
+                reachable.add(prefix)
+                frontier.append(prefix)
+
+    for name in roots:
+        reach(name)
+    while frontier:
+        level, frontier = frontier, []
+        found = scanner.scan([modules[name].path for name in level])
+        for name in level:
+            module_imports = found[modules[name].path]
+            if module_imports.dynamic:
+                dynamic.append(name)
+            for imported in _imported_modules(
+                name, name in packages, module_imports, submodules
+            ):
+                reach(imported)
+    return reachable, sorted(dynamic)
+
+
+def _is_reachable(
+    source: ZipSource,
+    modules: dict[str, ZipSource],
+    packages: set[str],
+    reachable: set[str],
+) -> bool:
+    """
+    Decide whether a staged file is kept, given the reachable modules.
+    """
+    parsed = source_module(source.arcname)
+    if parsed is not None and parsed[0] in modules:
+        return parsed[0] in reachable and modules[parsed[0]] is source
+    package = _enclosing_package(source.arcname, packages)
+    return package is None or package in reachable
+
+
+def _record_removal(report: TreeShakeReport, source: ZipSource) -> None:
+    """
+    Add a dropped file to the savings of its top-level package.
+    """
+    top_level = source.arcname.split("/")[0]
+    if top_level.endswith(".py"):
+        top_level = top_level[: -len(".py")]
+    savings = report.removed.setdefault(top_level, RuleSavings())
+    savings.files += 1
+    savings.bytes += os.path.getsize(source.path)
+
+
+def shake_sources(
+    sources: list[ZipSource],
+    handler_modules: list[str],
+    config: TreeShakeConfig,
+    scanner: Optional[ImportScanner] = None,
+) -> tuple[list[ZipSource], TreeShakeReport]:
+    """
+    Drop the modules a function's handlers can never import.
+
+    :param sources: The files to package.
+    :param handler_modules: The modules defining the function's handlers.
+    :param config: The tree shaking settings.
+    :param scanner: The import scanner to use; one without a cache if omitted.
+    :return: The remaining files and a report of what was removed.
+    """
+    modules, packages = _index_modules(sources)
+    roots = handler_modules + [name for name in modules if _is_kept(name, config.keep)]
+    reachable, dynamic = _find_reachable(
+        modules, packages, roots, scanner or ImportScanner()
+    )
+
+    report = TreeShakeReport(
+        modules=len(modules), reachable=len(reachable), dynamic=dynamic
+    )
+    kept = []
+    for source in sources:
+        if _is_reachable(source, modules, packages, reachable):
+            kept.append(source)
+        else:
+            _record_removal(report, source)
+    return kept, report
+
+
+def describe_tree_shake_report(report: TreeShakeReport) -> list[str]:
+    """
+    Format a summary line, one line per removed top-level package and a total.
+    """
+    lines = [
+        f"Tree shaking kept {report.reachable} of {report.modules} modules "
+        "reachable from the handlers"
+    ]
+    for name, savings in sorted(
+        report.removed.items(), key=lambda item: item[1].bytes, reverse=True
+    ):
+        lines.append(f"Removed {name}: {savings.files} files, {savings.bytes} bytes")
+
+    total_bytes = sum(savings.bytes for savings in report.removed.values())
+    lines.append(f"Total removed: {total_bytes} bytes")
+    lines.extend(
+        f"{name} imports modules by computed name; "
+        "keep what it loads with [tree_shake] keep"
+        for name in report.dynamic
+    )
+    return lines
@@ -0,0 +1,365 @@
+"""
+This module contains utility functions for linting the warm path of Lambda
+handlers.
+
+A handler body runs on every invocation, while module-level code runs once
+per execution environment.  Work that only needs doing once, but is done in
+the handler, shows up as warm latency on every call: creating SDK or HTTP
+clients, opening database connections, compiling regular expressions,
+importing modules, or pretty-printing whole events.
+
+Names are resolved through the module's imports, so ``from boto3 import
+client`` and ``import json as j`` are followed, while unrelated objects that
+happen to have a ``client`` or ``compile`` attribute are not flagged.  A
+finding is suppressed by a ``# kit: ignore`` comment on its line.
+
+Module-level code can also be checked for work that is not safe to snapshot,
+as SnapStart does after init: every environment restored from one snapshot
+shares the random values and timestamps init produced, and the connections it
+opened may be stale.
+"""
+
+# warm_path.py
+
+import ast
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, Sequence, Union
+
+from lambda_kit.utils.aws_lambda import (
+    PARALLEL_SCAN_THRESHOLD,
+    has_lambda_handler_signature,
+)
+
+IGNORE_COMMENT = "# kit: ignore"
+
+CLIENT_FACTORIES = {
+    "boto3.client",
+    "boto3.resource",
+    "boto3.Session",
+    "boto3.session.Session",
+    "botocore.session.get_session",
+    "requests.Session",
+    "httpx.Client",
+    "httpx.AsyncClient",
+    "urllib3.PoolManager",
+    "aiohttp.ClientSession",
+}
+
+CONNECTION_FACTORIES = {
+    "psycopg.connect",
+    "psycopg2.connect",
+    "pymysql.connect",
+    "mysql.connector.connect",
+    "sqlite3.connect",
+    "redis.Redis",
+    "redis.StrictRedis",
+    "redis.from_url",
+    "pymongo.MongoClient",
+    "sqlalchemy.create_engine",
+}
+
+REGEX_COMPILERS = {"re.compile", "regex.compile"}
+
+TIMESTAMP_FACTORIES = {
+    "time.time",
+    "time.time_ns",
+    "datetime.datetime.now",
+    "datetime.datetime.utcnow",
+    "datetime.datetime.today",
+    "datetime.date.today",
+}
+
+UNIQUE_VALUE_FACTORIES = {"uuid.uuid1", "uuid.uuid4", "os.urandom"}
+UNIQUE_VALUE_MODULES = ("random.", "secrets.")
+
+SOCKET_FACTORIES = {"socket.socket", "socket.create_connection"}
+
+# The calls a handler should not make, and the rule each breaks.
+_HANDLER_CALL_RULES = (
+    (CLIENT_FACTORIES, "client-in-handler"),
+    (CONNECTION_FACTORIES, "connection-in-handler"),
+    (REGEX_COMPILERS, "regex-compile"),
+)
+
+RULES = {
+    "client-in-handler": "creates a client on every invocation; "
+    "create it once at module level",
+    "connection-in-handler": "opens a connection on every invocation; "
+    "open it once at module level and reuse it",
+    "json-indent": "pretty-prints JSON on every invocation; "
+    "drop indent, or log only the fields you need",
+    "regex-compile": "compiles a regular expression on every invocation; "
+    "compile it once at module level",
+    "import-in-handler": "imports on every invocation and delays the first one; "
+    "import at module level",
+}
+
+INIT_RULES = {
+    "init-unique-value": "generates a random value during init, which every "
+    "environment restored from a snapshot shares; generate it in the handler",
+    "init-timestamp": "reads the clock during init, which is stale after a "
+    "snapshot is restored; read it in the handler",
+    "init-connection": "opens a connection during init, which may be stale after "
+    "a snapshot is restored; check or reopen it before use",
+}
+
+
+@dataclass
+class Finding:
+    """
+    One piece of per-invocation work that belongs outside a handler.
+    """
+
+    path: str
+    line: int
+    column: int
+    handler: str
+    rule: str
+    message: str
+
+    @property
+    def location(self) -> str:
+        """
+        The finding's location as ``path:line:column``.
+        """
+        return f"{self.path}:{self.line}:{self.column}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return a JSON-serializable dict of the finding.
+        """
+        return asdict(self)
+
+
+def _import_aliases(tree: ast.AST) -> dict[str, str]:
+    """
+    Map each name bound by an absolute import to the dotted name it refers to.
+    """
+    aliases = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+                else:
+                    top_level = alias.name.split(".")[0]
+                    aliases[top_level] = top_level
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+    return aliases
+
+
+def _qualified_name(node: ast.expr, aliases: dict[str, str]) -> Optional[str]:
+    """
+    Resolve a name or attribute chain rooted in an imported name.
+    """
+    attributes = []
+    while isinstance(node, ast.Attribute):
+        attributes.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name) or node.id not in aliases:
+        return None
+    return ".".join([aliases[node.id], *reversed(attributes)])
+
+
+def _check_node(
+    node: Union[ast.Import, ast.ImportFrom, ast.Call], aliases: dict[str, str]
+) -> Optional[tuple[str, str]]:
+    """
+    Return the rule a node breaks and what it calls, if it breaks one.
+    """
+    if isinstance(node, ast.Import):
+        return "import-in-handler", ", ".join(alias.name for alias in node.names)
+    if isinstance(node, ast.ImportFrom):
+        return "import-in-handler", "." * node.level + (node.module or "")
+    name = _qualified_name(node.func, aliases)
+    for factories, rule in _HANDLER_CALL_RULES:
+        if name in factories:
+            return rule, f"{name}()"
+    if name == "json.dumps" and any(
+        keyword.arg == "indent"
+        and not (
+            isinstance(keyword.value, ast.Constant) and keyword.value.value is None
+        )
+        for keyword in node.keywords
+    ):
+        return "json-indent", "json.dumps(..., indent=...)"
+    return None
+
+
+def _check_init_call(
+    node: ast.Call, aliases: dict[str, str]
+) -> Optional[tuple[str, str]]:
+    """
+    Return the snapshot rule a module-level call breaks and what it calls.
+    """
+    name = _qualified_name(node.func, aliases)
+    if name is None:
+        return None
+    if name in UNIQUE_VALUE_FACTORIES or name.startswith(UNIQUE_VALUE_MODULES):
+        return "init-unique-value", f"{name}()"
+    if name in TIMESTAMP_FACTORIES:
+        return "init-timestamp", f"{name}()"
+    if name in CONNECTION_FACTORIES or name in SOCKET_FACTORIES:
+        return "init-connection", f"{name}()"
+    return None
+
+
+def _init_calls(tree: ast.Module) -> list[ast.Call]:
+    """
+    Find the calls that run when a module is imported.
+
+    Function bodies, lambdas and default arguments are not followed, except
+    that class bodies run at import.
+    """
+    calls = []
+    pending: list[ast.AST] = list(tree.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            continue
+        if isinstance(node, ast.Call):
+            calls.append(node)
+        pending.extend(ast.iter_child_nodes(node))
+    return calls
+
+
+def lint_init_source(
+    python_source_code: Union[str, bytes], path: str = "<string>"
+) -> list[Finding]:
+    """
+    Find module-level work that is not safe to snapshot after init.
+
+    :param python_source_code: The Python code to check.
+    :param path: The file the code came from, for the findings.
+    :return: The findings, in source order; empty if the code cannot be parsed.
+    """
+    try:
+        tree = ast.parse(python_source_code)
+    except (SyntaxError, ValueError):
+        return []
+
+    if isinstance(python_source_code, bytes):
+        python_source_code = python_source_code.decode("utf-8", errors="replace")
+    lines = python_source_code.splitlines()
+    aliases = _import_aliases(tree)
+
+    findings = []
+    for node in _init_calls(tree):
+        broken = _check_init_call(node, aliases)
+        if broken is None or IGNORE_COMMENT in lines[node.lineno - 1]:
+            continue
+        rule, subject = broken
+        findings.append(
+            Finding(
+                path=path,
+                line=node.lineno,
+                column=node.col_offset + 1,
+                handler="<module>",
+                rule=rule,
+                message=f"{subject} {INIT_RULES[rule]}.",
+            )
+        )
+
+    findings.sort(key=lambda finding: (finding.line, finding.column))
+    return findings
+
+
+def lint_init_files(paths: Sequence[str]) -> list[Finding]:
+    """
+    Find module-level work that is not safe to snapshot in many files.
+
+    :param paths: The Python files to check.
+    :return: The findings, by file in the order given, then in source order.
+    """
+    findings = []
+    for path in paths:
+        try:
+            with open(path, "rb") as file:
+                findings.extend(lint_init_source(file.read(), path))
+        except OSError:
+            continue
+    return findings
+
+
+def lint_handler_source(
+    python_source_code: Union[str, bytes], path: str = "<string>"
+) -> list[Finding]:
+    """
+    Find per-invocation work in the bodies of the handlers in the given code.
+
+    :param python_source_code: The Python code to check.
+    :param path: The file the code came from, for the findings.
+    :return: The findings, in source order; empty if the code cannot be parsed.
+    """
+    try:
+        tree = ast.parse(python_source_code)
+    except (SyntaxError, ValueError):
+        return []
+
+    if isinstance(python_source_code, bytes):
+        python_source_code = python_source_code.decode("utf-8", errors="replace")
+    lines = python_source_code.splitlines()
+    aliases = _import_aliases(tree)
+
+    findings = []
+    for handler in tree.body:
+        if not isinstance(
+            handler, (ast.FunctionDef, ast.AsyncFunctionDef)
+        ) or not has_lambda_handler_signature(handler):
+            continue
+        for statement in handler.body:
+            for node in ast.walk(statement):
+                if not isinstance(node, (ast.Import, ast.ImportFrom, ast.Call)):
+                    continue
+                broken = _check_node(node, aliases)
+                if broken is None or IGNORE_COMMENT in lines[node.lineno - 1]:
+                    continue
+                rule, subject = broken
+                findings.append(
+                    Finding(
+                        path=path,
+                        line=node.lineno,
+                        column=node.col_offset + 1,
+                        handler=handler.name,
+                        rule=rule,
+                        message=f"{subject} {RULES[rule]}.",
+                    )
+                )
+
+    findings.sort(key=lambda finding: (finding.line, finding.column))
+    return findings
+
+
+def lint_handler_file(path: str) -> list[Finding]:
+    """
+    Find per-invocation work in the handlers of a file.
+
+    :param path: The Python file to check.
+    :return: The findings; empty if the file cannot be read.
+    """
+    try:
+        with open(path, "rb") as file:
+            return lint_handler_source(file.read(), path)
+    except OSError:
+        return []
+
+
+def lint_handler_files(
+    paths: Sequence[str], workers: Optional[int] = None
+) -> list[Finding]:
+    """
+    Find per-invocation work in the handlers of many files, in parallel.
+
+    :param paths: The Python files to check.
+    :param workers: The number of parser processes.
+    :return: The findings, by file in the order given, then in source order.
+    """
+    if len(paths) < PARALLEL_SCAN_THRESHOLD or workers == 1:
+        results = [lint_handler_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lint_handler_file, paths, chunksize=8))
+    return [finding for findings in results for finding in findings]
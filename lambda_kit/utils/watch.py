@@ -0,0 +1,323 @@
+"""
+This module contains utility functions for watching a source tree for changes.
+
+On Linux, changes are reported by inotify as they happen.  Elsewhere, or when
+inotify is unavailable or out of watches, the tree is polled instead, comparing
+each file's size, modification time and mode with the previous poll.
+
+Editors often save a file in several steps (write a temporary file, rename it
+over the original, update its metadata), so changes are debounced: a burst of
+changes is collected until the tree has been quiet for a moment, and reported
+once.
+"""
+
+# watch.py
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+DEFAULT_DEBOUNCE = 0.2
+DEFAULT_POLL_INTERVAL = 0.5
+
+# A burst of changes is reported after at most this many debounce periods,
+# even if the tree never goes quiet.
+MAX_DEBOUNCE_PERIODS = 10
+
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+# struct inotify_event: wd, mask, cookie and the length of the name after it.
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _is_excluded(
+    exclude: Optional[Callable[[str], bool]], path: str, is_dir: bool
+) -> bool:
+    """
+    Apply a collect_files exclude predicate to a file or directory.
+
+    Directories are passed with a trailing separator, so ``exclude_under``
+    predicates match the excluded directory itself.
+    """
+    if exclude is None:
+        return False
+    path = os.path.abspath(path)
+    return exclude(os.path.join(path, "") if is_dir else path)
+
+
+class SourceWatcher(ABC):
+    """
+    Abstract base class for source tree watchers.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def wait(self, timeout: Optional[float] = None) -> set[str]:
+        """
+        Wait for files to change.
+
+        :param timeout: The most seconds to wait; wait indefinitely if omitted.
+        :return: The changed paths; empty if the timeout passed first.
+        """
+
+    def close(self) -> None:
+        """
+        Stop watching.
+        """
+
+
+class PollingWatcher(SourceWatcher):
+    """
+    Watches a tree by comparing snapshots of its files' metadata.
+    """
+
+    name = "polling"
+
+    def __init__(
+        self,
+        directory: str,
+        exclude: Optional[Callable[[str], bool]] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Initialize a new PollingWatcher and take the first snapshot.
+
+        :param directory: The directory to watch.
+        :param exclude: A collect_files exclude predicate for paths to ignore.
+        :param interval: The seconds between polls.
+        """
+        self.directory = directory
+        self.exclude = exclude
+        self.interval = interval
+        self.snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int, int]]:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [
+                name
+                for name in dirs
+                if not _is_excluded(self.exclude, os.path.join(root, name), True)
+            ]
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                if _is_excluded(self.exclude, path, False):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_size, stat.st_mtime_ns, stat.st_mode)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+            snapshot = self._take_snapshot()
+            changes = {
+                path
+                for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changes:
+                return changes
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+
+class InotifyWatcher(SourceWatcher):
+    """
+    Watches a tree with Linux inotify, one watch per directory.
+    """
+
+    name = "inotify"
+
+    def __init__(self, directory: str, exclude: Optional[Callable[[str], bool]] = None):
+        """
+        Initialize a new InotifyWatcher and watch every directory in the tree.
+
+        :param directory: The directory to watch.
+        :param exclude: A collect_files exclude predicate for paths to ignore.
+        :raises OSError: If inotify is unavailable or out of watches.
+        """
+        self.directory = directory
+        self.exclude = exclude
+        self.watches: dict[int, str] = {}
+
+        library = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform.")
+        self.libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        try:
+            self._watch_tree(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, directory: str) -> list[str]:
+        """
+        Watch a directory and the directories below it.
+
+        :return: The files already in the tree.
+        """
+        files: list[str] = []
+        for root, dirs, file_names in os.walk(directory):
+            dirs[:] = [
+                name
+                for name in dirs
+                if not _is_excluded(self.exclude, os.path.join(root, name), True)
+            ]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), _WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if os.path.isdir(root):
+                    raise OSError(errno, os.strerror(errno), root)
+                # The directory was removed while the tree was being walked.
+                continue
+            self.watches[wd] = root
+            files.extend(
+                os.path.join(root, name)
+                for name in file_names
+                if not _is_excluded(self.exclude, os.path.join(root, name), False)
+            )
+        return files
+
+    def _read_events(self) -> set[str]:
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changes = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            start = offset + _EVENT.size
+            offset = start + length
+            name = data[start:offset].rstrip(b"\0")
+
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped, so anything may have changed.
+                changes.add(self.directory)
+                continue
+            if mask & _IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            is_dir = bool(mask & _IN_ISDIR)
+            if _is_excluded(self.exclude, path, is_dir):
+                continue
+            if is_dir and mask & (_IN_CREATE | _IN_MOVED_TO):
+                # Files created before the new directory was watched are
+                # reported as changed too.
+                changes.update(self._watch_tree(path))
+            changes.add(path)
+        return changes
+
+    def wait(self, timeout: Optional[float] = None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changes = self._read_events()
+            if changes:
+                return changes
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(
+    directory: str,
+    exclude: Optional[Callable[[str], bool]] = None,
+    interval: float = DEFAULT_POLL_INTERVAL,
+) -> SourceWatcher:
+    """
+    Watch a tree with inotify, or by polling where inotify is unavailable.
+
+    :param directory: The directory to watch.
+    :param exclude: A collect_files exclude predicate for paths to ignore.
+    :param interval: The seconds between polls, if polling.
+    :return: The watcher.
+    """
+    try:
+        return InotifyWatcher(directory, exclude)
+    except OSError:
+        return PollingWatcher(directory, exclude, interval)
+
+
+def wait_for_changes(
+    watcher: SourceWatcher,
+    debounce: float = DEFAULT_DEBOUNCE,
+    timeout: Optional[float] = None,
+) -> set[str]:
+    """
+    Wait for a burst of changes to end.
+
+    :param watcher: The watcher.
+    :param debounce: The seconds of quiet that end a burst.
+    :param timeout: The most seconds to wait for the first change; wait
+        indefinitely if omitted.
+    :return: Every path changed in the burst; empty if the timeout passed first.
+    """
+    changes = watcher.wait(timeout)
+    deadline = time.monotonic() + debounce * MAX_DEBOUNCE_PERIODS
+    while changes and time.monotonic() < deadline:
+        more = watcher.wait(debounce)
+        if not more:
+            break
+        changes |= more
+    return changes
@@ -0,0 +1,548 @@
+"""
+This module contains utility functions for selecting wheels for a Lambda target.
+
+A target is a Lambda architecture (``x86_64`` or ``arm64``) and a Python
+version.  Wheels are chosen from a local wheelhouse by their tags, so only
+prebuilt wheels compatible with the target's CPython and glibc are picked,
+whatever the machine building the layer.  Nothing is ever built from source.
+
+The wheelhouse is indexed once: the name, version and dependencies of each
+wheel are read from its metadata, concurrently, and cached in the wheelhouse
+keyed by each wheel's size and modification time.  Requirements are then
+resolved against the index without starting pip: the best wheel satisfying
+every constraint is picked for each distribution, and its dependencies are
+followed, until the selection stops changing.
+"""
+
+# wheel_index.py
+
+import json
+import os
+import struct
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from email.parser import HeaderParser
+from typing import Any, Optional
+
+from packaging.markers import UndefinedEnvironmentName
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.tags import Tag, compatible_tags, cpython_tags
+from packaging.utils import (
+    InvalidWheelFilename,
+    canonicalize_name,
+    parse_wheel_filename,
+)
+from packaging.version import InvalidVersion, Version
+
+from lambda_kit.utils.packaging import ZipSource
+
+# Lambda architectures and the machine names in their wheel tags.
+ARCHITECTURES = {"x86_64": "x86_64", "arm64": "aarch64"}
+
+# The glibc of each Python runtime: Amazon Linux 2 up to 3.11, and Amazon
+# Linux 2023 from 3.12.
+LAMBDA_GLIBC = {
+    "3.8": (2, 26),
+    "3.9": (2, 26),
+    "3.10": (2, 26),
+    "3.11": (2, 26),
+}
+DEFAULT_GLIBC = (2, 34)
+
+INDEX_FILE_NAME = ".kit-wheel-index.json"
+INDEX_FORMAT_VERSION = 1
+
+# ELF e_machine values, by the machine names used in wheel tags.
+_ELF_MACHINES = {3: "i686", 40: "armv7l", 62: "x86_64", 183: "aarch64"}
+
+# The legacy names of manylinux tags, by glibc version.
+_LEGACY_MANYLINUX = {
+    (2, 17): "manylinux2014",
+    (2, 12): "manylinux2010",
+    (2, 5): "manylinux1",
+}
+
+# Resolution stops if the selection is still changing after this many passes.
+_MAX_PASSES = 100
+
+
+@dataclass(frozen=True)
+class TargetPlatform:
+    """
+    A Lambda architecture and Python runtime to select wheels for.
+    """
+
+    architecture: str
+    python_version: str
+
+    def __post_init__(self) -> None:
+        if self.architecture not in ARCHITECTURES:
+            raise ValueError(
+                f"Unknown architecture '{self.architecture}'; "
+                f"expected one of {', '.join(ARCHITECTURES)}."
+            )
+        major, _, minor = self.python_version.partition(".")
+        if not (major.isdigit() and minor.isdigit()):
+            raise ValueError(
+                f"Invalid Python version '{self.python_version}'; expected e.g. 3.12."
+            )
+
+    @property
+    def machine(self) -> str:
+        """
+        The machine name used in wheel tags, e.g. ``aarch64``.
+        """
+        return ARCHITECTURES[self.architecture]
+
+    @property
+    def version_info(self) -> tuple[int, int]:
+        """
+        The Python version as a tuple, e.g. ``(3, 12)``.
+        """
+        major, _, minor = self.python_version.partition(".")
+        return int(major), int(minor)
+
+    @property
+    def abi(self) -> str:
+        """
+        The CPython ABI tag, e.g. ``cp312``.
+        """
+        major, minor = self.version_info
+        return f"cp{major}{minor}"
+
+    def platforms(self) -> list[str]:
+        """
+        The manylinux platform tags the runtime supports, most specific first.
+        """
+        glibc_major, glibc_minor = LAMBDA_GLIBC.get(self.python_version, DEFAULT_GLIBC)
+        oldest = 5 if self.machine == "x86_64" else 17
+        platforms = []
+        for minor in range(glibc_minor, oldest - 1, -1):
+            platforms.append(f"manylinux_{glibc_major}_{minor}_{self.machine}")
+            legacy = _LEGACY_MANYLINUX.get((glibc_major, minor))
+            if legacy is not None:
+                platforms.append(f"{legacy}_{self.machine}")
+        return platforms
+
+    def tags(self) -> list[Tag]:
+        """
+        The wheel tags the runtime supports, most preferred first.
+        """
+        platforms = self.platforms()
+        return [
+            *cpython_tags(self.version_info, [self.abi], platforms),
+            *compatible_tags(self.version_info, self.abi, platforms),
+        ]
+
+    def environment(self) -> dict[str, str]:
+        """
+        The environment markers of the runtime.
+        """
+        return {
+            "implementation_name": "cpython",
+            "implementation_version": f"{self.python_version}.0",
+            "os_name": "posix",
+            "platform_machine": self.machine,
+            "platform_python_implementation": "CPython",
+            "platform_release": "",
+            "platform_system": "Linux",
+            "platform_version": "",
+            "python_full_version": f"{self.python_version}.0",
+            "python_version": self.python_version,
+            "sys_platform": "linux",
+        }
+
+    def pip_arguments(self) -> list[str]:
+        """
+        The pip options that download wheels for the runtime.
+        """
+        arguments = []
+        for platform in self.platforms():
+            arguments.extend(["--platform", platform])
+        arguments.extend(
+            [
+                "--python-version",
+                self.python_version,
+                "--implementation",
+                "cp",
+                "--abi",
+                self.abi,
+            ]
+        )
+        return arguments
+
+    def __str__(self) -> str:
+        return f"python{self.python_version}-{self.architecture}"
+
+
+@dataclass
+class WheelRecord:
+    """
+    The metadata of one wheel in a wheelhouse.
+    """
+
+    filename: str
+    size: int
+    mtime_ns: int
+    name: str
+    version: str
+    requires_dist: list[str] = field(default_factory=list)
+    requires_python: Optional[str] = None
+
+    def tags(self) -> frozenset[Tag]:
+        """
+        The tags in the wheel's file name.
+        """
+        return parse_wheel_filename(self.filename)[3]
+
+
+def read_wheel_metadata(path: str) -> tuple[list[str], Optional[str]]:
+    """
+    Read the dependencies and the supported Python versions of a wheel.
+
+    :param path: The wheel.
+    :return: The ``Requires-Dist`` lines and ``Requires-Python``, if any.
+    """
+    with zipfile.ZipFile(path) as wheel:
+        metadata_name = next(
+            (
+                name
+                for name in wheel.namelist()
+                if name.count("/") == 1 and name.endswith(".dist-info/METADATA")
+            ),
+            None,
+        )
+        if metadata_name is None:
+            return [], None
+        text = wheel.read(metadata_name).decode("utf-8", errors="replace")
+
+    headers = HeaderParser().parsestr(text)
+    return headers.get_all("Requires-Dist") or [], headers.get("Requires-Python")
+
+
+def _index_wheel(wheelhouse: str, filename: str, stat: os.stat_result) -> WheelRecord:
+    name, version, _, _ = parse_wheel_filename(filename)
+    requires_dist, requires_python = read_wheel_metadata(
+        os.path.join(wheelhouse, filename)
+    )
+    return WheelRecord(
+        filename=filename,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        name=str(name),
+        version=str(version),
+        requires_dist=requires_dist,
+        requires_python=requires_python,
+    )
+
+
+def index_wheelhouse(
+    wheelhouse: str, workers: Optional[int] = None
+) -> dict[str, list[WheelRecord]]:
+    """
+    Index the wheels in a wheelhouse, reusing the cached index where possible.
+
+    Only wheels that are new or changed since the index was cached are opened,
+    and they are read concurrently.  Files that are not valid wheels are
+    skipped.
+
+    :param wheelhouse: The wheelhouse directory.
+    :param workers: The number of reader threads.
+    :return: The wheels, by canonical distribution name.
+    """
+    index_path = os.path.join(wheelhouse, INDEX_FILE_NAME)
+    cached = _load_index(index_path)
+
+    records: dict[str, WheelRecord] = {}
+    missing: list[tuple[str, os.stat_result]] = []
+    file_names = sorted(os.listdir(wheelhouse)) if os.path.isdir(wheelhouse) else []
+    for filename in file_names:
+        if not filename.endswith(".whl"):
+            continue
+        try:
+            parse_wheel_filename(filename)
+            stat = os.stat(os.path.join(wheelhouse, filename))
+        except (InvalidWheelFilename, InvalidVersion, OSError):
+            continue
+        entry = cached.get(filename)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        ):
+            records[filename] = WheelRecord(**entry)
+        else:
+            missing.append((filename, stat))
+
+    if missing:
+        records.update(_index_wheels(wheelhouse, missing, workers))
+        _save_index(index_path, records)
+
+    index: dict[str, list[WheelRecord]] = {}
+    for record in records.values():
+        index.setdefault(record.name, []).append(record)
+    return index
+
+
+def _load_index(index_path: str) -> dict[str, dict[str, Any]]:
+    try:
+        with open(index_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") == INDEX_FORMAT_VERSION:
+            return dict(data["wheels"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return {}
+
+
+def _index_wheels(
+    wheelhouse: str,
+    missing: list[tuple[str, os.stat_result]],
+    workers: Optional[int],
+) -> dict[str, WheelRecord]:
+    records: dict[str, WheelRecord] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_index_wheel, wheelhouse, filename, stat)
+            for filename, stat in missing
+        ]
+        for future in futures:
+            try:
+                record = future.result()
+            except (OSError, zipfile.BadZipFile):
+                continue
+            records[record.filename] = record
+    return records
+
+
+def _save_index(index_path: str, records: dict[str, WheelRecord]) -> None:
+    data = {
+        "version": INDEX_FORMAT_VERSION,
+        "wheels": {filename: asdict(record) for filename, record in records.items()},
+    }
+    try:
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(index_path))
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temporary_path, index_path)
+    except OSError:
+        pass
+
+
+def _tag_rank(record: WheelRecord, tag_ranks: dict[Tag, int]) -> Optional[int]:
+    """
+    Rank a wheel by its most preferred tag; None if the target supports none.
+    """
+    ranks = [tag_ranks[tag] for tag in record.tags() if tag in tag_ranks]
+    return min(ranks) if ranks else None
+
+
+def _best_wheel(
+    candidates: list[WheelRecord],
+    specifier: SpecifierSet,
+    target: TargetPlatform,
+    tag_ranks: dict[Tag, int],
+) -> Optional[WheelRecord]:
+    """
+    Pick the newest version satisfying a specifier, and its best-tagged wheel.
+    """
+    python_version = Version(target.python_version)
+    best_key: Optional[tuple[Version, int]] = None
+    best: Optional[WheelRecord] = None
+    for record in candidates:
+        version = Version(record.version)
+        if not specifier.contains(version):
+            continue
+        if record.requires_python and not SpecifierSet(record.requires_python).contains(
+            python_version, prereleases=True
+        ):
+            continue
+        rank = _tag_rank(record, tag_ranks)
+        if rank is None:
+            continue
+        key = (version, -rank)
+        if best_key is None or key > best_key:
+            best_key, best = key, record
+    return best
+
+
+def _applies(
+    requirement: Requirement, environment: dict[str, str], extras: set[str]
+) -> bool:
+    """
+    Evaluate a requirement's marker for a runtime and a set of extras.
+    """
+    if requirement.marker is None:
+        return True
+    try:
+        return any(
+            requirement.marker.evaluate({**environment, "extra": extra})
+            for extra in sorted(extras) or [""]
+        )
+    except UndefinedEnvironmentName:
+        return False
+
+
+def _parse_requirements(lines: list[str]) -> list[Requirement]:
+    requirements = []
+    for line in lines:
+        try:
+            requirements.append(Requirement(line))
+        except InvalidRequirement as err:
+            raise ValueError(
+                f"Unsupported requirement '{line}'; selecting wheels for a "
+                "target needs plain specifiers such as 'name==1.0'."
+            ) from err
+    return requirements
+
+
+def _collect_specifiers(
+    roots: list[Requirement],
+    selected: dict[str, WheelRecord],
+    environment: dict[str, str],
+) -> tuple[dict[str, SpecifierSet], dict[str, str]]:
+    """
+    Walk the requirements and the dependencies of the selected wheels.
+
+    :return: The combined specifier of every distribution needed, and the
+        name of the first distribution that wanted each one.
+    """
+    specifiers: dict[str, SpecifierSet] = {}
+    extras: dict[str, set[str]] = {}
+    wanted_by: dict[str, str] = {}
+    pending = [(requirement, "requirements.txt") for requirement in roots]
+    seen: set[tuple[str, str]] = set()
+    while pending:
+        requirement, parent = pending.pop(0)
+        name = str(canonicalize_name(requirement.name))
+        parent_extras = extras.get(canonicalize_name(parent), set())
+        if not _applies(requirement, environment, parent_extras):
+            continue
+        specifiers[name] = specifiers.get(name, SpecifierSet()) & (
+            requirement.specifier
+        )
+        extras.setdefault(name, set()).update(requirement.extras)
+        wanted_by.setdefault(name, parent)
+
+        record = selected.get(name)
+        key = (name, ",".join(sorted(extras[name])))
+        if record is None or key in seen:
+            continue
+        seen.add(key)
+        for line in record.requires_dist:
+            try:
+                pending.append((Requirement(line), record.name))
+            except InvalidRequirement:
+                continue
+    return specifiers, wanted_by
+
+
+def _choose_wheels(
+    specifiers: dict[str, SpecifierSet],
+    wanted_by: dict[str, str],
+    index: dict[str, list[WheelRecord]],
+    target: TargetPlatform,
+    tag_ranks: dict[Tag, int],
+) -> dict[str, WheelRecord]:
+    """
+    Pick a wheel for every distribution needed.
+
+    :raises RuntimeError: If no compatible wheel satisfies a specifier.
+    """
+    choice: dict[str, WheelRecord] = {}
+    for name, specifier in specifiers.items():
+        record = _best_wheel(index.get(name, []), specifier, target, tag_ranks)
+        if record is None:
+            raise RuntimeError(
+                f"No wheel for {name}{specifier} (required by "
+                f"{wanted_by[name]}) is compatible with {target}."
+            )
+        choice[name] = record
+    return choice
+
+
+def select_wheels(
+    requirements: list[str],
+    index: dict[str, list[WheelRecord]],
+    target: TargetPlatform,
+    constraints: Optional[list[str]] = None,
+) -> list[WheelRecord]:
+    """
+    Select a wheel for every distribution a set of requirements needs.
+
+    The newest version satisfying every constraint on a distribution is picked,
+    and among its wheels the one whose tag the target prefers most.  The
+    selection is recomputed from the requirements and the dependencies of the
+    selected wheels until it no longer changes.
+
+    :param requirements: Requirement specifiers, e.g. ``requests>=2``.
+    :param index: The wheelhouse index, from ``index_wheelhouse``.
+    :param target: The runtime to select for.
+    :param constraints: Constraint specifiers, as in pip's ``-c`` files; they
+        narrow the versions of distributions that are needed anyway.
+    :return: The selected wheels, sorted by distribution name.
+    :raises ValueError: If a requirement is not a plain specifier.
+    :raises RuntimeError: If no compatible wheel satisfies a requirement.
+    """
+    roots = _parse_requirements(requirements)
+    limits = _parse_requirements(constraints or [])
+    environment = target.environment()
+    tag_ranks = {tag: rank for rank, tag in enumerate(target.tags())}
+    selected: dict[str, WheelRecord] = {}
+
+    for _ in range(_MAX_PASSES):
+        specifiers, wanted_by = _collect_specifiers(roots, selected, environment)
+        for limit in limits:
+            name = str(canonicalize_name(limit.name))
+            if name in specifiers and _applies(limit, environment, set()):
+                specifiers[name] &= limit.specifier
+
+        choice = _choose_wheels(specifiers, wanted_by, index, target, tag_ranks)
+        if choice == selected:
+            return [selected[name] for name in sorted(selected)]
+        selected = choice
+
+    raise RuntimeError("The requirements did not resolve to a stable selection.")
+
+
+def elf_machine(path: str) -> Optional[str]:
+    """
+    Read the machine an ELF binary was built for.
+
+    :param path: The file to check.
+    :return: The machine name, e.g. ``aarch64``; None if it is not ELF.
+    """
+    try:
+        with open(path, "rb") as file:
+            header = file.read(20)
+    except OSError:
+        return None
+    if len(header) < 20 or header[:4] != b"\x7fELF":
+        return None
+    byte_order = "<" if header[5] == 1 else ">"
+    (machine,) = struct.unpack(f"{byte_order}H", header[18:20])
+    return _ELF_MACHINES.get(machine, f"machine {machine}")
+
+
+def find_foreign_binaries(
+    sources: list[ZipSource], target: TargetPlatform
+) -> list[tuple[str, str]]:
+    """
+    Find the shared objects built for another machine than the target's.
+
+    :param sources: The files to check.
+    :param target: The runtime the files are packaged for.
+    :return: The archive name and machine of each foreign shared object.
+    """
+    foreign = []
+    for source in sources:
+        name = os.path.basename(source.arcname)
+        if not (name.endswith(".so") or ".so." in name):
+            continue
+        machine = elf_machine(source.path)
+        if machine is not None and machine != target.machine:
+            foreign.append((source.arcname, machine))
+    return foreign
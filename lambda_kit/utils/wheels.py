@@ -0,0 +1,351 @@
+"""
+This module contains utility functions for installing layer dependencies.
+
+Requirements are resolved by pip against a local wheelhouse (``--find-links``),
+which can be shared between layers and works offline once populated.  The
+resolved wheels are then unpacked into the layer's ``python/`` directory
+concurrently, without going through pip's installer.
+
+For a target architecture and Python version, pip only downloads wheels for
+that target, and they are selected from the wheelhouse by their tags instead
+of by pip, which only resolves for the host.
+"""
+
+# wheels.py
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from lambda_kit.utils.cache import hash_requirements, read_requirements
+from lambda_kit.utils.tracing import PhaseTracer
+from lambda_kit.utils.wheel_index import TargetPlatform, index_wheelhouse, select_wheels
+
+DEFAULT_WHEELHOUSE = os.path.join(
+    os.path.expanduser("~"), ".cache", "lambda-kit", "wheelhouse"
+)
+
+_MARKER_FILE = ".requirements.sha256"
+
+
+def _run_pip(arguments: list[str]) -> str:
+    """
+    Run pip with the current interpreter and return its standard output.
+
+    :raises RuntimeError: If pip fails.
+    """
+    command = [sys.executable, "-m", "pip", "--disable-pip-version-check"]
+    process = subprocess.run(
+        command + arguments, capture_output=True, text=True, check=False
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"pip {arguments[0]} failed:\n{process.stderr.strip()}")
+    return process.stdout
+
+
+def populate_wheelhouse(
+    requirements_path: str,
+    wheelhouse: str,
+    target: Optional[TargetPlatform] = None,
+) -> None:
+    """
+    Download binary wheels for a requirements file into a wheelhouse.
+
+    Wheels already present in the wheelhouse are not downloaded again.
+
+    :param requirements_path: The path to the requirements file.
+    :param wheelhouse: The wheelhouse directory.
+    :param target: The runtime to download wheels for; the host if omitted.
+    """
+    os.makedirs(wheelhouse, exist_ok=True)
+    _run_pip(
+        [
+            "download",
+            "--quiet",
+            "--only-binary=:all:",
+            "--find-links",
+            wheelhouse,
+            "--dest",
+            wheelhouse,
+            "--requirement",
+            requirements_path,
+            *(target.pip_arguments() if target is not None else []),
+        ]
+    )
+
+
+# A requirement's own options, such as ``--hash``, start at the first option.
+_OPTION = re.compile(r"\s+--?[A-Za-z]")
+_COMMENT = re.compile(r"(^|\s)#.*$")
+_INCLUDE_OPTIONS = {
+    "-r": False,
+    "--requirement": False,
+    "-c": True,
+    "--constraint": True,
+}
+
+
+def _split_option(line: str) -> tuple[str, str]:
+    """
+    Split an option line such as ``-r base.txt`` or ``--constraint=c.txt``.
+    """
+    if line.startswith("--"):
+        head, _, rest = line.partition(" ")
+        name, equals, value = head.partition("=")
+        return name, (value if equals else rest).strip()
+    return line[:2], line[2:].strip()
+
+
+def read_requirement_specifiers(
+    requirements_path: str, constraint: bool = False
+) -> tuple[list[str], list[str]]:
+    """
+    Read the requirement specifiers and constraints of a requirements file.
+
+    Included (``-r``) and constraint (``-c``) files are followed relative to
+    the file that names them.  Other option lines, such as ``--index-url``, and
+    per-requirement options, such as ``--hash``, only matter to pip and are
+    skipped.
+
+    :param requirements_path: The path to the requirements file.
+    :param constraint: If True, the file's specifiers are all constraints.
+    :return: The requirement specifiers and the constraint specifiers.
+    :raises ValueError: If the file installs an editable requirement.
+    """
+    with open(requirements_path, "r", encoding="utf-8") as file:
+        text = file.read().replace("\\\n", "")
+
+    requirements: list[str] = []
+    constraints: list[str] = []
+    for line in text.splitlines():
+        line = _COMMENT.sub("", line).strip()
+        if not line:
+            continue
+        if not line.startswith("-"):
+            specifier = _OPTION.split(line, 1)[0]
+            (constraints if constraint else requirements).append(specifier)
+            continue
+
+        name, value = _split_option(line)
+        if name in ("-e", "--editable"):
+            raise ValueError(
+                f"Unsupported requirement '{line}'; selecting wheels for a "
+                "target needs plain specifiers such as 'name==1.0'."
+            )
+        if name in _INCLUDE_OPTIONS:
+            included = os.path.join(os.path.dirname(requirements_path), value)
+            more, more_constraints = read_requirement_specifiers(
+                included, constraint or _INCLUDE_OPTIONS[name]
+            )
+            requirements.extend(more)
+            constraints.extend(more_constraints)
+    return requirements, constraints
+
+
+def select_requirements(
+    requirements_path: str,
+    wheelhouse: str,
+    target: TargetPlatform,
+    workers: Optional[int] = None,
+) -> list[str]:
+    """
+    Select wheels for a requirements file and a target from a wheelhouse.
+
+    :param requirements_path: The path to the requirements file.
+    :param wheelhouse: The wheelhouse directory.
+    :param target: The runtime to select wheels for.
+    :param workers: The number of threads indexing the wheelhouse.
+    :return: The paths of the wheels to install.
+    :raises RuntimeError: If no compatible wheel satisfies a requirement.
+    """
+    index = index_wheelhouse(wheelhouse, workers)
+    requirements, constraints = read_requirement_specifiers(requirements_path)
+    records = select_wheels(requirements, index, target, constraints)
+    return sorted(os.path.join(wheelhouse, record.filename) for record in records)
+
+
+def resolve_requirements(requirements_path: str, wheelhouse: str) -> list[str]:
+    """
+    Resolve a requirements file to a list of wheels in a wheelhouse.
+
+    Resolution never touches the network.
+
+    :param requirements_path: The path to the requirements file.
+    :param wheelhouse: The wheelhouse directory.
+    :return: The paths of the wheels to install.
+    :raises RuntimeError: If the requirements cannot be satisfied from the
+        wheelhouse.
+    """
+    output = _run_pip(
+        [
+            "install",
+            "--dry-run",
+            "--quiet",
+            "--ignore-installed",
+            "--no-index",
+            "--only-binary=:all:",
+            "--find-links",
+            wheelhouse,
+            "--report",
+            "-",
+            "--requirement",
+            requirements_path,
+        ]
+    )
+    report = json.loads(output)
+
+    wheels = []
+    for item in report.get("install", []):
+        url = urlparse(item["download_info"]["url"])
+        wheels.append(url2pathname(unquote(url.path)))
+    return sorted(wheels)
+
+
+def _is_within(path: str, directory: str) -> bool:
+    return os.path.commonpath([path, directory]) == directory
+
+
+def install_wheel(wheel_path: str, target_dir: str) -> int:
+    """
+    Unpack a wheel into a target directory, the way ``pip install --target``
+    lays it out.
+
+    Files under ``<name>.data/purelib`` and ``<name>.data/platlib`` are moved to
+    the root; scripts, headers and data files are not needed in a layer and are
+    skipped.
+
+    :param wheel_path: The path to the wheel.
+    :param target_dir: The directory to install into.
+    :return: The number of files installed.
+    :raises ValueError: If the wheel contains paths outside the target.
+    """
+    target_dir = os.path.abspath(target_dir)
+    installed = 0
+
+    with zipfile.ZipFile(wheel_path) as wheel:
+        for info in wheel.infolist():
+            if info.is_dir():
+                continue
+
+            name = info.filename
+            top_level, _, rest = name.partition("/")
+            if top_level.endswith(".data"):
+                scheme, _, rest = rest.partition("/")
+                if scheme not in ("purelib", "platlib"):
+                    continue
+                name = rest
+
+            path = os.path.abspath(os.path.join(target_dir, name))
+            if not _is_within(path, target_dir):
+                raise ValueError(f"Unsafe path in {wheel_path}: {info.filename}")
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with wheel.open(info) as source, open(path, "wb") as destination:
+                shutil.copyfileobj(source, destination)
+
+            mode = (info.external_attr >> 16) & 0o777
+            if mode & 0o111:
+                os.chmod(path, 0o755)
+            installed += 1
+
+    return installed
+
+
+def install_wheels(
+    wheel_paths: list[str], target_dir: str, workers: Optional[int] = None
+) -> int:
+    """
+    Unpack several wheels into a target directory concurrently.
+
+    :param wheel_paths: The wheels to install.
+    :param target_dir: The directory to install into.
+    :param workers: The number of installer threads.
+    :return: The number of files installed.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        counts = executor.map(
+            lambda wheel_path: install_wheel(wheel_path, target_dir), wheel_paths
+        )
+        return sum(counts)
+
+
+def install_requirements(  # pylint: disable=too-many-arguments
+    requirements_path: str,
+    target_dir: str,
+    info: Callable[[str], None],
+    *,
+    wheelhouse: str = DEFAULT_WHEELHOUSE,
+    offline: bool = False,
+    workers: Optional[int] = None,
+    tracer: Optional[PhaseTracer] = None,
+    target: Optional[TargetPlatform] = None,
+) -> bool:
+    """
+    Install a requirements file into a target directory from a wheelhouse.
+
+    A marker file next to the target directory records the hash of the
+    requirements, and the target, it was built for; when it matches, nothing
+    is reinstalled.
+
+    :param requirements_path: The path to the requirements file.
+    :param target_dir: The directory to install into.
+    :param info: The callable function to use for output.
+    :param wheelhouse: The wheelhouse directory.
+    :param offline: If True, only wheels already in the wheelhouse are used.
+    :param workers: The number of installer threads.
+    :param tracer: Records the resolve and install phases.
+    :param target: The runtime to select wheels for; the host if omitted.
+    :return: True if dependencies were installed, False if they were current.
+    """
+    tracer = tracer or PhaseTracer()
+    requirements_hash = hash_requirements(requirements_path)
+    if target is not None:
+        requirements_hash = f"{requirements_hash} {target}"
+    marker_path = os.path.join(os.path.dirname(target_dir), _MARKER_FILE)
+
+    if os.path.isfile(marker_path):
+        with open(marker_path, "r", encoding="utf-8") as file:
+            if file.read().strip() == requirements_hash:
+                info(f"Dependencies in {target_dir} are up to date.")
+                return False
+
+    wheel_paths: list[str] = []
+    with tracer.phase("resolve"):
+        if read_requirements(requirements_path):
+            if not offline:
+                info(f"Updating wheelhouse: {wheelhouse}")
+                populate_wheelhouse(requirements_path, wheelhouse, target)
+
+            if target is None:
+                wheel_paths = resolve_requirements(requirements_path, wheelhouse)
+                info(f"Resolved {len(wheel_paths)} wheels from {wheelhouse}")
+            else:
+                wheel_paths = select_requirements(
+                    requirements_path, wheelhouse, target, workers
+                )
+                info(
+                    f"Selected {len(wheel_paths)} wheels for {target} "
+                    f"from {wheelhouse}"
+                )
+
+    with tracer.phase("install"):
+        if os.path.isfile(marker_path):
+            os.remove(marker_path)
+        if os.path.isdir(target_dir):
+            shutil.rmtree(target_dir)
+        file_count = install_wheels(wheel_paths, target_dir, workers)
+        info(f"Installed {file_count} files into {target_dir}")
+
+    with open(marker_path, "w", encoding="utf-8") as file:
+        file.write(requirements_hash)
+
+    return True
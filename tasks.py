@@ -50,19 +50,19 @@ def format_code(c: Context) -> None:
     c.run("echo 'Formatting code ...'")
 
     # Format code
-    c.run("black lambda_kit/ tests/ tasks.py update_version.py")
+    c.run("black lambda_kit/ tests/ benchmarks/ tasks.py update_version.py")
 
     # Sort imports
-    c.run("isort lambda_kit/ tests/ tasks.py update_version.py")
+    c.run("isort lambda_kit/ tests/ benchmarks/ tasks.py update_version.py")
 
 
 @task(aliases=["l"], pre=[format_code])
 def lint(c: Context) -> None:
     """Run linters (flake8 and pylint)."""
     c.run("echo 'Analyzing Syntax ...'")
-    c.run("flake8 lambda_kit/ tests/ tasks.py update_version.py")
-    c.run("pylint lambda_kit/ tests/ tasks.py update_version.py")
-    c.run("mypy lambda_kit/ tests/ tasks.py")
+    c.run("flake8 lambda_kit/ tests/ benchmarks/ tasks.py update_version.py")
+    c.run("pylint lambda_kit/ tests/ benchmarks/ tasks.py update_version.py")
+    c.run("mypy lambda_kit/ tests/ benchmarks/ tasks.py")
 
 
 @task(aliases=["t"])
@@ -81,6 +81,21 @@ def coverage(c: Context) -> None:
     c.run("coverage xml")
 
 
+@task(
+    help={
+        "scale": "The fixture size: quick or full.",
+        "save": "Record the results as the new baseline.",
+    }
+)
+def bench(c: Context, scale: str = "quick", save: bool = False) -> None:
+    """Run the benchmarks and compare them against the stored baseline."""
+    c.run("echo 'Running benchmarks ...'")
+    command = f"python -m benchmarks --scale {scale}"
+    if save:
+        command += " --save"
+    c.run(command)
+
+
 @task(aliases=["p"])
 def package(c: Context) -> None:
     """Package the CLI tool."""
@@ -217,6 +232,7 @@ ns = Collection(
     test,
     build,
     coverage,
+    bench,
     semantic_release,
     format_code,
     package,
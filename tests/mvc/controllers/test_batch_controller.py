@@ -0,0 +1,70 @@
+"""
+This module contains tests for the BatchController class.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.mvc.controllers.batch_controller import BatchController
+
+HANDLER_CODE = """
+from aws_lambda_typing import context as lambda_context
+
+
+def handler(event: dict, context: lambda_context.Context) -> dict:
+    return {}
+"""
+
+
+def test_batch_controller_packages_tree(tmp_path: Path) -> None:
+    """
+    Test that every function is packaged under a name unique within the tree.
+    """
+    # Arrange
+    for directory in ["orders/api", "users/api"]:
+        (tmp_path / "src" / directory).mkdir(parents=True)
+        (tmp_path / "src" / directory / "app.py").write_text(HANDLER_CODE)
+    messages: list[str] = []
+    controller = BatchController.create()
+    controller.view.info_display_func = messages.append
+    controller.model.root_dir = str(tmp_path / "src")
+    controller.model.output_dir = str(tmp_path / "dist")
+    controller.model.jobs = 2
+
+    # Act
+    results = controller.package()
+
+    # Assert
+    assert [(result.name, result.succeeded) for result in results] == [
+        ("orders-api", True),
+        ("users-api", True),
+    ]
+    assert (tmp_path / "dist" / "orders-api.zip").is_file()
+    assert (tmp_path / "dist" / "users-api.zip").is_file()
+    assert messages[-1].startswith("Packaged 2 artifacts")
+
+
+def test_batch_controller_reports_failures(tmp_path: Path) -> None:
+    """
+    Test that a failed package is reported and fails the batch.
+    """
+    # Arrange
+    (tmp_path / "src" / "api").mkdir(parents=True)
+    (tmp_path / "src" / "api" / "app.py").write_text(HANDLER_CODE)
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "api.zip").mkdir()
+    errors: list[str] = []
+    controller = BatchController.create()
+    controller.view.info_display_func = lambda message: None
+    controller.view.error_display_func = errors.append
+    controller.model.root_dir = str(tmp_path / "src")
+    controller.model.output_dir = str(tmp_path / "dist")
+    controller.model.cache = False
+
+    # Act
+    with pytest.raises(SystemExit):
+        controller.package()
+
+    # Assert
+    assert errors[0] == "function api failed:"
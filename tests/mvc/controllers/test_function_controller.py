@@ -0,0 +1,86 @@
+"""
+This module contains tests for the FunctionController class.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.mvc.controllers.function_controller import FunctionController
+
+HANDLER_CODE = """
+from aws_lambda_typing import context as lambda_context
+
+
+def handler(event: dict, context: lambda_context.Context) -> dict:
+    return {}
+"""
+
+
+def test_watch_repackages_only_changed_entries(tmp_path: Path) -> None:
+    """
+    Test that a change while watching rebuilds the artifact, reusing the
+    compressed entries of the files that did not change.
+    """
+    # Arrange
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text(HANDLER_CODE)
+    (tmp_path / "src" / "settings.py").write_text("DEBUG = False\n")
+    messages: list[str] = []
+    controller = FunctionController.create()
+    controller.view.info_display_func = messages.append
+    controller.model.source_dir = str(tmp_path / "src")
+    controller.model.output_dir = str(tmp_path / "src" / "dist")
+    done = threading.Event()
+
+    def edit_until_done() -> None:
+        count = 0
+        while not done.wait(0.2):
+            count += 1
+            (tmp_path / "src" / "settings.py").write_text(f"DEBUG = {count}\n")
+
+    editor = threading.Thread(target=edit_until_done)
+
+    # Act
+    editor.start()
+    try:
+        results = controller.watch(debounce=0.05, max_rebuilds=1)
+    finally:
+        done.set()
+        editor.join()
+
+    # Assert
+    initial, rebuilt = results
+    assert initial.reused_count == 0
+    assert rebuilt.reused_count == 1
+    assert rebuilt.sha256 != initial.sha256
+    assert "1 file changed; repackaging." in messages
+
+
+def test_lint_reports_findings_across_functions(tmp_path: Path) -> None:
+    """
+    Test that every function under a directory is linted and that findings
+    fail the command.
+    """
+    # Arrange
+    for name in ("clean", "slow"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "clean" / "app.py").write_text(HANDLER_CODE)
+    (tmp_path / "slow" / "app.py").write_text(
+        HANDLER_CODE.replace("return {}", "import json\n    return {}")
+    )
+    messages: list[str] = []
+    controller = FunctionController.create()
+    controller.view.info_display_func = messages.append
+    controller.model.source_dir = str(tmp_path)
+
+    # Act
+    with pytest.raises(SystemExit):
+        controller.lint()
+
+    # Assert
+    assert any(
+        "slow" in message and "import-in-handler" in message for message in messages
+    )
+    assert messages[-1] == "Found 1 warm-path issues in 2 handler files."
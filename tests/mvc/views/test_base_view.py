@@ -0,0 +1,80 @@
+"""
+This module contains tests for the BaseView class.
+"""
+
+import json
+
+from lambda_kit.mvc.views import FunctionView
+from lambda_kit.mvc.views.base_view import FLUSH_THRESHOLD, JSON_OUTPUT
+
+
+def make_view(output_format: str = "text") -> tuple[FunctionView, list[str]]:
+    lines: list[str] = []
+    view = FunctionView()
+    view.info_display_func = lines.append
+    view.error_display_func = lines.append
+    view.output_format = output_format
+    return view, lines
+
+
+def test_event_renders_messages_as_text() -> None:
+    """
+    Test that text output renders an event's messages and not its fields.
+    """
+    # Arrange
+    view, lines = make_view()
+
+    # Act
+    view.event("package", "Packaged 3 files.", "SHA-256: abc", file_count=3)
+
+    # Assert
+    assert lines == ["Packaged 3 files.", "SHA-256: abc"]
+
+
+def test_json_output_is_buffered_ndjson() -> None:
+    """
+    Test that JSON output is held until flushed, then written in one batch.
+    """
+    # Arrange
+    view, lines = make_view(JSON_OUTPUT)
+
+    # Act
+    view.info("Checking file: handler.py")
+    view.error("Something failed")
+    view.event("package", "Packaged 3 files.", file_count=3, sha256="abc")
+    view.table(["Metric", "Value"], [("Files", 3)])
+    buffered = list(lines)
+    view.flush()
+
+    # Assert
+    assert not buffered
+    assert len(lines) == 1
+    records = [json.loads(line) for line in lines[0].splitlines()]
+    assert [record["event"] for record in records] == [
+        "message",
+        "message",
+        "package",
+        "table",
+    ]
+    assert records[1]["level"] == "error"
+    assert records[2]["file_count"] == 3
+    assert records[2]["sha256"] == "abc"
+    assert records[3]["rows"] == [["Files", 3]]
+    assert all(record["t"] >= 0 for record in records)
+
+
+def test_json_output_flushes_when_buffer_is_full() -> None:
+    """
+    Test that a full buffer is written out without waiting for flush.
+    """
+    # Arrange
+    view, lines = make_view(JSON_OUTPUT)
+
+    # Act
+    for index in range(FLUSH_THRESHOLD + 1):
+        view.info(f"Checking file: {index}.py")
+
+    # Assert
+    assert len(lines) == 1
+    assert len(lines[0].splitlines()) == FLUSH_THRESHOLD
+    assert len(view.buffer) == 1
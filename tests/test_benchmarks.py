@@ -0,0 +1,101 @@
+"""
+This module contains tests for the benchmark suite.
+"""
+
+from pathlib import Path
+
+from benchmarks.__main__ import DEFAULT_BASELINE
+from benchmarks.fixtures import large_module_source, write_package_tree
+from benchmarks.suite import (
+    BENCHMARKS,
+    CALIBRATION,
+    SCALES,
+    BenchmarkResult,
+    Scale,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+from lambda_kit.utils.aws_lambda import contains_lambda_handler_code
+
+TINY_SCALE = Scale(
+    handler_functions=5,
+    function_modules=5,
+    small_files=20,
+    huge_files=1,
+    huge_file_size=64 * 1024,
+    rounds=1,
+)
+
+
+def test_fixtures_are_deterministic(tmp_path: Path) -> None:
+    """
+    Test that the generated fixtures are the same on every run.
+    """
+    # Act
+    first = write_package_tree(str(tmp_path / "first"), 3, 1, 4096)
+    second = write_package_tree(str(tmp_path / "second"), 3, 1, 4096)
+
+    # Assert
+    files = sorted(path.relative_to(first) for path in Path(first).rglob("*.*"))
+    assert len(files) == 5
+    for path in files:
+        assert (Path(first) / path).read_bytes() == (Path(second) / path).read_bytes()
+    assert contains_lambda_handler_code(large_module_source(3))
+
+
+def test_run_benchmarks_times_every_benchmark() -> None:
+    """
+    Test that every benchmark runs and is timed relative to the calibration.
+    """
+    # Act
+    results = run_benchmarks(TINY_SCALE)
+
+    # Assert
+    assert [result.name for result in results] == list(BENCHMARKS)
+    assert results[0].name == CALIBRATION
+    assert results[0].relative == 1.0
+    assert all(result.min_s > 0 and result.relative > 0 for result in results)
+
+
+def test_find_regressions_flags_slowdowns_beyond_tolerance(tmp_path: Path) -> None:
+    """
+    Test that only benchmarks slower than the tolerance allows are flagged.
+    """
+    # Arrange
+    baseline_path = str(tmp_path / "baseline.json")
+    recorded = [
+        BenchmarkResult(CALIBRATION, 1, 0.1, 0.1, 1.0),
+        BenchmarkResult("scan_cold", 1, 0.2, 0.2, 2.0),
+        BenchmarkResult("zip_huge_files", 1, 0.4, 0.4, 4.0),
+    ]
+    save_baseline(baseline_path, "quick", recorded)
+    current = [
+        BenchmarkResult(CALIBRATION, 1, 0.2, 0.2, 1.0),
+        BenchmarkResult("scan_cold", 1, 0.5, 0.5, 2.5),
+        BenchmarkResult("zip_huge_files", 1, 1.2, 1.2, 6.0),
+        BenchmarkResult("zip_incremental", 1, 1.0, 1.0, 5.0),
+    ]
+
+    # Act
+    regressions = find_regressions(
+        load_baseline(baseline_path), "quick", current, tolerance=0.3
+    )
+
+    # Assert
+    assert [regression.name for regression in regressions] == ["zip_huge_files"]
+    assert regressions[0].slowdown == 1.5
+    assert not find_regressions(load_baseline(baseline_path), "full", current)
+
+
+def test_stored_baseline_covers_every_benchmark() -> None:
+    """
+    Test that the committed baseline has every benchmark at every scale.
+    """
+    # Act
+    baseline = load_baseline(DEFAULT_BASELINE)
+
+    # Assert
+    for scale_name in SCALES:
+        assert set(baseline["scales"][scale_name]) == set(BENCHMARKS)
@@ -0,0 +1,194 @@
+"""
+This module contains tests for the CLI's startup cost and output formats.
+"""
+
+import json
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from lambda_kit.__main__ import cli
+from lambda_kit.utils.import_profile import parse_importtime
+
+HEAVY_MODULES = ["jinja2", "pydantic", "lambda_kit.mvc"]
+
+IMPORT_MODULES = [
+    *HEAVY_MODULES,
+    "boto3",
+    "lambda_kit.mvc.controllers.function_controller",
+    "lambda_kit.mvc.controllers.layer_controller",
+]
+
+# Importing the CLI costs about 7x importing logging; eager controller imports
+# cost about 45x.
+IMPORT_BUDGET_FACTOR = 15
+
+
+def test_help_does_not_import_heavy_modules() -> None:
+    """
+    Test that ``kit --help`` loads no controllers or their dependencies.
+    """
+    # Arrange
+    code = (
+        "import sys\n"
+        "from lambda_kit.__main__ import cli\n"
+        "try:\n"
+        "    cli(['function', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print([name for name in {HEAVY_MODULES!r} if name in sys.modules])\n"
+    )
+
+    # Act
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    # Assert
+    assert "pack" in process.stdout
+    assert process.stdout.splitlines()[-1] == "[]"
+
+
+def test_import_does_not_load_heavy_modules() -> None:
+    """
+    Test that importing the CLI loads no controllers or their dependencies.
+    """
+    # Arrange
+    code = (
+        "import sys\n"
+        "import lambda_kit.__main__\n"
+        f"print([name for name in {IMPORT_MODULES!r} if name in sys.modules])\n"
+    )
+
+    # Act
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    # Assert
+    assert process.stdout.splitlines()[-1] == "[]"
+
+
+def _import_time_us(module: str) -> int:
+    """
+    Return the fastest of three cumulative import times of a module.
+    """
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    timings: list[int] = []
+    for _ in range(3):
+        process = subprocess.run(command, capture_output=True, text=True, check=True)
+        roots = parse_importtime(process.stderr)
+        timings.extend(root.cumulative_us for root in roots if root.name == module)
+    return min(timings)
+
+
+def test_import_time_is_within_budget() -> None:
+    """
+    Test that importing the CLI costs a small multiple of a stdlib import.
+    """
+    # Arrange
+    reference_us = _import_time_us("logging")
+
+    # Act
+    cli_us = _import_time_us("lambda_kit.__main__")
+
+    # Assert
+    assert cli_us < IMPORT_BUDGET_FACTOR * reference_us
+
+
+def test_json_output_is_ndjson() -> None:
+    """
+    Test that ``--output json`` writes one JSON event per line.
+    """
+    # Arrange
+    runner = CliRunner()
+
+    # Act
+    result = runner.invoke(cli, ["--output", "json", "function", "templates"])
+
+    # Assert
+    assert result.exit_code == 0
+    events = [json.loads(line) for line in result.output.splitlines()]
+    assert {event["event"] for event in events} == {"template"}
+    assert "sqs" in [event["name"] for event in events]
+
+
+def test_layer_pack(tmp_path: Path) -> None:
+    """
+    Test that ``kit layer pack`` packages a layer's own modules.
+    """
+    # Arrange
+    layer = tmp_path / "layer"
+    (layer / "python" / "mylib").mkdir(parents=True)
+    (layer / "python" / "mylib" / "__init__.py").write_text("X = 1\n")
+    (layer / "requirements.txt").write_text("")
+    output = tmp_path / "out"
+    runner = CliRunner()
+
+    # Act
+    result = runner.invoke(
+        cli,
+        [
+            "layer",
+            "pack",
+            "--source-dir",
+            str(layer),
+            "--output-dir",
+            str(output),
+            "--offline",
+            "--wheelhouse",
+            str(tmp_path / "wheelhouse"),
+        ],
+    )
+
+    # Assert
+    assert result.exit_code == 0, result.output
+    with zipfile.ZipFile(output / "layer.zip") as archive:
+        assert archive.namelist() == ["python/mylib/__init__.py"]
+
+
+@pytest.mark.parametrize("kind", ["function", "layer"])
+@pytest.mark.parametrize("option", ["--max-size", "--max-cold-start"])
+def test_describe_rejects_zero_budgets(kind: str, option: str, tmp_path: Path) -> None:
+    """
+    Test that a zero budget is rejected rather than read as no budget.
+    """
+    # Arrange
+    runner = CliRunner()
+
+    # Act
+    result = runner.invoke(
+        cli,
+        [kind, "describe", str(tmp_path), "--output-dir", str(tmp_path), option, "0"],
+    )
+
+    # Assert
+    assert result.exit_code == 2
+    assert f"Invalid value for '{option}'" in result.output
+
+
+@pytest.mark.parametrize("kind", ["function", "layer"])
+def test_describe_reports_corrupt_package(kind: str, tmp_path: Path) -> None:
+    """
+    Test that describing a corrupt package prints an error instead of a traceback.
+    """
+    # Arrange
+    source_dir = tmp_path / "my_package"
+    source_dir.mkdir()
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "my_package.zip").write_bytes(b"not a zip file")
+    runner = CliRunner()
+
+    # Act
+    result = runner.invoke(
+        cli, [kind, "describe", str(source_dir), "--output-dir", str(output_dir)]
+    )
+
+    # Assert
+    assert result.exit_code == 1
+    assert "File is not a zip file" in result.output
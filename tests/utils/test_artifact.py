@@ -0,0 +1,77 @@
+"""
+This module contains tests for the artifact description utility functions.
+"""
+
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils.artifact import (
+    LAMBDA_UNZIPPED_LIMIT,
+    check_budgets,
+    describe_artifact,
+    parse_size,
+)
+
+
+def test_describe_artifact_layer(tmp_path: Path) -> None:
+    """
+    Test that layer files are grouped by package and bytecode replaces sources.
+    """
+    # Arrange
+    zip_path = tmp_path / "layer.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("python/big/__init__.py", "x" * 3000)
+        archive.writestr("python/big/__pycache__/__init__.cpython-312.pyc", "y" * 2000)
+        archive.writestr("python/big/_speedups.cpython-312-x86_64-linux-gnu.so", "z")
+        archive.writestr("python/lib/python3.12/site-packages/small.py", "s" * 10)
+        archive.writestr("python/libs/libfoo.so.1.2", "l" * 5)
+
+    # Act
+    report = describe_artifact(str(zip_path))
+
+    # Assert
+    assert report.file_count == 5
+    assert report.uncompressed_bytes == 5016
+    assert [package.name for package in report.packages] == ["big", "small", "libs"]
+    assert report.packages[0].file_count == 3
+    assert report.source_bytes == 10
+    assert report.bytecode_bytes == 2000
+    assert len(report.native_extensions) == 2
+    assert report.estimated_cold_start_ms > 0
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1048576", 1048576),
+        ("250MB", 250_000_000),
+        ("50 MiB", 52428800),
+        ("1.5k", 1500),
+    ],
+)
+def test_parse_size(value: str, expected: int) -> None:
+    """
+    Test that sizes are parsed with decimal and binary units.
+    """
+    assert parse_size(value) == expected
+
+
+def test_check_budgets(tmp_path: Path) -> None:
+    """
+    Test that the size budget never exceeds the Lambda limit.
+    """
+    # Arrange
+    zip_path = tmp_path / "function.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("handler.py", "x" * 100)
+    report = describe_artifact(str(zip_path))
+
+    # Act
+    within = check_budgets(report, max_size=LAMBDA_UNZIPPED_LIMIT * 2)
+    exceeded = check_budgets(report, max_size=99, max_cold_start_ms=0.0001)
+
+    # Assert
+    assert not within
+    assert len(exceeded) == 2
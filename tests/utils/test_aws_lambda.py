@@ -1,4 +1,24 @@
-from lambda_kit.utils.aws_lambda import contains_lambda_handler_code
+import os
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils import aws_lambda
+from lambda_kit.utils.aws_lambda import (
+    HandlerScanner,
+    contains_lambda_handler_code,
+    discover_components,
+    find_imports,
+    find_lambda_handler_names,
+)
+
+HANDLER_CODE = """
+from aws_lambda_typing import context as lambda_context
+
+
+def handler(event: dict, context: lambda_context.Context) -> dict:
+    return {}
+"""
 
 
 def test_contains_lambda_handler_code_empty() -> None:
@@ -39,3 +59,123 @@ def my_handler_function(event: dict, context: lambda_context.Context) -> dict[st
 
     # Assert
     assert result, "Expected the code to contain a lambda handler function."
+
+
+def test_discover_components(tmp_path: Path) -> None:
+    """
+    Test that functions and layers are found without descending into them.
+    """
+    # Arrange
+    for directory in ["services/a", "services/a/nested", "services/b", "dist/c"]:
+        (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / directory / "app.py").write_text(HANDLER_CODE)
+    (tmp_path / "layers" / "common" / "python").mkdir(parents=True)
+    (tmp_path / "layers" / "common" / "requirements.txt").write_text("")
+
+    # Act
+    functions, layers = discover_components(
+        str(tmp_path), exclude=[str(tmp_path / "dist")], scanner=HandlerScanner(None)
+    )
+
+    # Assert
+    assert functions == [
+        str(tmp_path / "services" / "a"),
+        str(tmp_path / "services" / "b"),
+    ]
+    assert layers == [str(tmp_path / "layers" / "common")]
+
+
+def test_find_lambda_handler_names_module_level_only() -> None:
+    """
+    Test that every module-level handler is found, async or not, but no others.
+    """
+    # Arrange
+    python_source_code = """
+from aws_lambda_typing import context as lambda_context
+
+
+def first(event: dict, context: lambda_context.Context) -> dict:
+    def nested(event: dict, context: lambda_context.Context) -> dict:
+        return {}
+    return {}
+
+
+async def second(event: dict, context: lambda_context.Context) -> dict:
+    return {}
+
+
+class Handlers:
+    def method(event: dict, context: lambda_context.Context) -> dict:
+        return {}
+"""
+
+    # Act
+    result = find_lambda_handler_names(python_source_code)
+
+    # Assert
+    assert result == ["first", "second"]
+
+
+def test_find_imports_everywhere() -> None:
+    """
+    Test that imports are found at any depth, relative or by literal name.
+    """
+    # Arrange
+    python_source_code = """
+import os.path, json
+from . import sibling
+from ..shared.models import Model
+
+
+def handler(event, context):
+    import boto3
+    importlib.import_module("plugins.csv")
+    return __import__("yaml")
+"""
+
+    # Act
+    imports, dynamic = find_imports(python_source_code)
+
+    # Assert
+    assert imports == [
+        (0, "os.path", []),
+        (0, "json", []),
+        (1, "", ["sibling"]),
+        (2, "shared.models", ["Model"]),
+        (0, "boto3", []),
+        (0, "plugins.csv", []),
+        (0, "yaml", []),
+    ]
+    assert not dynamic
+    assert find_imports("importlib.import_module(name)") == ([], True)
+    assert find_imports("def broken(:") == ([], True)
+
+
+@pytest.mark.parametrize("threshold", [64, 1])
+def test_handler_scanner_caches_results(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, threshold: int
+) -> None:
+    """
+    Test that unchanged files are served from the cache, serial or parallel.
+    """
+    # Arrange
+    monkeypatch.setattr(aws_lambda, "PARALLEL_SCAN_THRESHOLD", threshold)
+    handler_path = tmp_path / "app.py"
+    other_path = tmp_path / "util.py"
+    handler_path.write_text(HANDLER_CODE)
+    other_path.write_text("VALUE = 1\n")
+    cache_path = str(tmp_path / "cache" / "handlers.json")
+    paths = [str(handler_path), str(other_path)]
+
+    # Act
+    first = HandlerScanner(cache_path).scan(paths)
+    monkeypatch.setattr(aws_lambda, "scan_file", lambda path: ["stale"])
+    cached = HandlerScanner(cache_path, workers=1).scan(paths)
+    other_path.write_text("VALUE = 22\n")
+    os.utime(other_path, ns=(1, 1))
+    changed = HandlerScanner(cache_path, workers=1).scan(paths)
+
+    # Assert
+    assert first == {str(handler_path): ["handler"], str(other_path): []}
+    assert cached == first
+    assert changed == {str(handler_path): ["handler"], str(other_path): ["stale"]}
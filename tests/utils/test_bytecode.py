@@ -0,0 +1,92 @@
+"""
+This module contains tests for the bytecode compilation utility functions.
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils.bytecode import compile_sources, find_interpreter
+from lambda_kit.utils.packaging import collect_files
+
+
+def make_tree(root: Path) -> None:
+    (root / "pkg").mkdir(parents=True)
+    (root / "handler.py").write_text("def handler(event, context):\n    pass\n")
+    (root / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    (root / "pkg" / "broken.py").write_text("def broken(:\n")
+
+
+def test_compile_sources_unchecked_hash(tmp_path: Path) -> None:
+    """
+    Test that compiled files land in __pycache__ with unchecked-hash headers.
+    """
+    # Arrange
+    make_tree(tmp_path / "src")
+    sources = collect_files(str(tmp_path / "src"))
+    tag = sys.implementation.cache_tag
+
+    # Act
+    result = compile_sources(sources, str(tmp_path / "bytecode"), workers=2)
+
+    # Assert
+    arcnames = {source.arcname: source.path for source in result.sources}
+    assert result.compiled == 2
+    assert result.failed == ["pkg/broken.py"]
+    assert "handler.py" in arcnames
+    pyc_path = arcnames[f"pkg/__pycache__/__init__.{tag}.pyc"]
+    flags = int.from_bytes(Path(pyc_path).read_bytes()[4:8], "little")
+    assert flags == 0b01
+
+
+def test_compile_sources_pyc_only(tmp_path: Path) -> None:
+    """
+    Test that pyc-only mode replaces compiled sources but keeps failures.
+    """
+    # Arrange
+    make_tree(tmp_path / "src")
+    sources = collect_files(str(tmp_path / "src"))
+
+    # Act
+    result = compile_sources(sources, str(tmp_path / "bytecode"), pyc_only=True)
+
+    # Assert
+    assert [source.arcname for source in result.sources] == [
+        "handler.pyc",
+        "pkg/__init__.pyc",
+        "pkg/broken.py",
+    ]
+
+
+def test_find_interpreter_missing() -> None:
+    """
+    Test that a missing target interpreter is reported.
+    """
+    with pytest.raises(FileNotFoundError, match="python2.1"):
+        find_interpreter("2.1")
+
+
+def test_compile_sources_recompiles_older_replacement(tmp_path: Path) -> None:
+    """
+    Test that a source replaced by an older file is recompiled, since
+    unchecked-hash bytecode is never revalidated at run time.
+    """
+    # Arrange
+    make_tree(tmp_path / "src")
+    handler = tmp_path / "src" / "handler.py"
+    staging_dir = str(tmp_path / "bytecode")
+    compile_sources(collect_files(str(tmp_path / "src")), staging_dir)
+    handler.write_text("def handler(event, context):\n    return 2\n")
+    os.utime(handler, ns=(0, 0))
+
+    # Act
+    result = compile_sources(collect_files(str(tmp_path / "src")), staging_dir)
+
+    # Assert
+    tag = sys.implementation.cache_tag
+    arcnames = {source.arcname: source.path for source in result.sources}
+    header = Path(arcnames[f"__pycache__/handler.{tag}.pyc"]).read_bytes()[:16]
+    assert header[8:16] == importlib.util.source_hash(handler.read_bytes())
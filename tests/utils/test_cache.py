@@ -0,0 +1,144 @@
+"""
+This module contains tests for the packaging cache.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+
+from lambda_kit.utils.cache import (
+    PackageCache,
+    build_cached_zip,
+    hash_requirements,
+    scan_sources,
+)
+from lambda_kit.utils.packaging import collect_files
+
+
+def make_tree(root: Path) -> None:
+    root.mkdir()
+    (root / "handler.py").write_text("def handler(event, context):\n    pass\n")
+    (root / "util.py").write_text("VALUE = 1\n")
+
+
+def test_hash_requirements_ignores_formatting(tmp_path: Path) -> None:
+    """
+    Test that comments, blank lines and order do not change the hash.
+    """
+    # Arrange
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("requests==2.0\nclick\n")
+    second.write_text("# pinned\nclick  \n\nrequests == 2.0  # http\n")
+
+    # Act / Assert
+    assert hash_requirements(str(first)) == hash_requirements(str(second))
+    assert hash_requirements(str(tmp_path / "missing.txt")) == ""
+
+
+def test_hash_requirements_follows_includes(tmp_path: Path) -> None:
+    """
+    Test that changing an included or constraint file changes the hash.
+    """
+    # Arrange
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("-r base.txt\n--constraint=constraints.txt\nclick\n")
+    (tmp_path / "base.txt").write_text("requests==2.0\n-r requirements.txt\n")
+    (tmp_path / "constraints.txt").write_text("urllib3<2\n")
+    first = hash_requirements(str(requirements))
+
+    # Act
+    (tmp_path / "base.txt").write_text("requests==2.1\n-r requirements.txt\n")
+    second = hash_requirements(str(requirements))
+    (tmp_path / "constraints.txt").write_text("urllib3<3\n")
+    third = hash_requirements(str(requirements))
+
+    # Assert
+    assert len({first, second, third}) == 3
+
+
+def test_scan_sources_reuses_hash_when_unchanged(tmp_path: Path) -> None:
+    """
+    Test that scan_sources only rehashes files whose size or mtime changed.
+    """
+    # Arrange
+    make_tree(tmp_path / "src")
+    sources = collect_files(str(tmp_path / "src"))
+    previous = scan_sources(sources)
+    previous["util.py"].sha256 = "stale"
+
+    # Act
+    records = scan_sources(sources, previous)
+
+    # Assert
+    assert records["util.py"].sha256 == "stale"
+
+
+def test_build_cached_zip_hit_and_partial_reuse(tmp_path: Path) -> None:
+    """
+    Test cache hits and re-zipping of only the changed entries.
+    """
+    # Arrange
+    source_dir = tmp_path / "src"
+    make_tree(source_dir)
+    zip_path = str(tmp_path / "out" / "fn.zip")
+    cache = PackageCache(str(tmp_path / "out" / ".kit-cache"))
+
+    # Act
+    first = build_cached_zip(collect_files(str(source_dir)), zip_path, cache, "fn")
+    second = build_cached_zip(collect_files(str(source_dir)), zip_path, cache, "fn")
+    (source_dir / "util.py").write_text("VALUE = 2\n")
+    third = build_cached_zip(collect_files(str(source_dir)), zip_path, cache, "fn")
+
+    # Assert
+    assert not first.cache_hit
+    assert second.cache_hit
+    assert not third.cache_hit
+    assert third.reused_count == 1
+    assert third.bytes_read == len(b"VALUE = 2\n")
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.testzip() is None
+        assert archive.read("util.py") == b"VALUE = 2\n"
+        assert archive.read("handler.py").startswith(b"def handler")
+
+
+def test_build_cached_zip_rebuilds_on_mode_change(tmp_path: Path) -> None:
+    """
+    Test that making a file executable misses the cache and ships the new
+    mode, although its content and mtime are unchanged.
+    """
+    # Arrange
+    source_dir = tmp_path / "src"
+    make_tree(source_dir)
+    zip_path = str(tmp_path / "out" / "fn.zip")
+    cache = PackageCache(str(tmp_path / "out" / ".kit-cache"))
+    build_cached_zip(collect_files(str(source_dir)), zip_path, cache, "fn")
+
+    # Act
+    os.chmod(source_dir / "util.py", 0o755)
+    result = build_cached_zip(collect_files(str(source_dir)), zip_path, cache, "fn")
+
+    # Assert
+    assert not result.cache_hit
+    assert result.reused_count == 1
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.getinfo("util.py").external_attr >> 16 & 0o777 == 0o755
+        assert archive.getinfo("handler.py").external_attr >> 16 & 0o777 == 0o644
+
+
+def test_evict_least_recently_used(tmp_path: Path) -> None:
+    """
+    Test that the cache evicts the oldest artifacts past its size budget.
+    """
+    # Arrange
+    cache = PackageCache(str(tmp_path / "cache"), max_size=150)
+    artifact = tmp_path / "artifact.zip"
+    artifact.write_bytes(b"x" * 100)
+
+    # Act
+    cache.store("old", str(artifact))
+    cache.store("new", str(artifact))
+
+    # Assert
+    assert not os.path.exists(cache.artifact_path("old"))
+    assert os.path.exists(cache.artifact_path("new"))
@@ -0,0 +1,56 @@
+"""
+This module contains tests for the import profiling utility functions.
+"""
+
+from pathlib import Path
+
+from lambda_kit.utils.import_profile import parse_importtime, profile_imports
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       200 |        200 |   _io
+import time:       600 |        800 | _frozen_importlib_external
+import time:        50 |         50 |       json.scanner
+import time:       100 |        150 |     json.decoder
+import time:       300 |        300 |     json.encoder
+import time:       400 |        850 |   json
+import time:      1000 |       1850 | handler
+Traceback (most recent call last):
+"""
+
+
+def test_parse_importtime_builds_sorted_tree() -> None:
+    """
+    Test that the post-order importtime report is rebuilt into a sorted tree.
+    """
+    # Act
+    roots = parse_importtime(IMPORTTIME_OUTPUT)
+
+    # Assert
+    assert [root.name for root in roots] == ["handler", "_frozen_importlib_external"]
+    handler = roots[0]
+    assert (handler.self_us, handler.cumulative_us) == (1000, 1850)
+    json_node = handler.children[0]
+    assert json_node.name == "json"
+    assert [child.name for child in json_node.children] == [
+        "json.encoder",
+        "json.decoder",
+    ]
+    assert json_node.children[1].children[0].name == "json.scanner"
+    assert roots[1].children[0].name == "_io"
+
+
+def test_profile_imports_fresh_interpreter(tmp_path: Path) -> None:
+    """
+    Test profiling a handler module in a subprocess.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text("import json\n")
+
+    # Act
+    profile = profile_imports(str(tmp_path), "handler")
+
+    # Assert
+    assert profile.handler_us > 0
+    assert profile.to_dict()["module"] == "handler"
+    assert not (tmp_path / "__pycache__").exists()
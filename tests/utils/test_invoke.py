@@ -0,0 +1,139 @@
+"""
+This module contains tests for the local invoke utility functions.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils.invoke import analyze_init, invoke_handler, percentile
+
+HANDLER = """
+CALLS = []
+
+
+def handler(event: dict, context: object) -> dict:
+    print("chatty handler output " * 100)
+    CALLS.append(event["n"])
+    if event["n"] < 0:
+        raise ValueError("negative")
+    return {"remaining": context.get_remaining_time_in_millis()}
+"""
+
+INIT_HANDLER = """
+import socket
+import threading
+import time
+
+import helpers
+
+PAIR = socket.socketpair()
+threading.Thread(target=time.sleep, args=(5,), name="flusher", daemon=True).start()
+
+
+def handler(event: dict, context: object) -> dict:
+    import fractions
+
+    return {}
+"""
+
+
+@pytest.mark.parametrize(
+    "percent, expected",
+    [(50, 5.0), (95, 10.0), (99, 10.0), (10, 1.0)],
+)
+def test_percentile_nearest_rank(percent: float, expected: float) -> None:
+    """
+    Test nearest-rank percentiles over ten samples.
+    """
+    values = [float(value) for value in range(10, 0, -1)]
+    assert percentile(values, percent) == expected
+
+
+def test_invoke_handler_measures_latency(tmp_path: Path) -> None:
+    """
+    Test invoking a handler in a fresh interpreter with several events.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text(HANDLER)
+    events = []
+    for index, number in enumerate([1, -1]):
+        event_path = tmp_path / f"event{index}.json"
+        event_path.write_text(json.dumps({"n": number}))
+        events.append(str(event_path))
+
+    # Act
+    result = invoke_handler(
+        str(tmp_path), "handler", "handler", events, iterations=500, cold_starts=2
+    )
+
+    # Assert
+    assert len(result.cold_start_ms) == 2
+    assert len(result.warm_ms) == 500
+    assert result.cold_start_median_ms >= result.import_ms
+    assert result.peak_rss_bytes > 0
+    assert len(result.errors) == 250
+    assert result.errors[0] == "ValueError: negative"
+
+
+def test_invoke_handler_import_error(tmp_path: Path) -> None:
+    """
+    Test that a handler that cannot be imported is reported.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text("import does_not_exist\n")
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="does_not_exist"):
+        invoke_handler(str(tmp_path), "handler", "handler", iterations=1)
+
+
+def test_analyze_init_splits_init_from_first_invoke(tmp_path: Path) -> None:
+    """
+    Test that init and the first invocation are probed separately.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text(INIT_HANDLER)
+    (tmp_path / "helpers.py").write_text("VALUE = 1\n")
+
+    # Act
+    report = analyze_init(str(tmp_path), "handler", "handler", iterations=5)
+
+    # Assert
+    assert report.init_ms > 0
+    assert len(report.warm_ms) == 5
+    assert report.init.source_files == [
+        str(tmp_path / "handler.py"),
+        str(tmp_path / "helpers.py"),
+    ]
+    assert "helpers" in report.init.modules
+    opened = [(resource.kind, resource.detail) for resource in report.init.opened]
+    assert ("thread", "flusher (daemon)") in opened
+    assert [kind for kind, _ in opened].count("socket") == 2
+    assert report.init.opened[0].advice
+    assert "fractions" in report.first_invoke.top_level_modules
+    assert "fractions" not in report.init.modules
+
+
+def test_invoke_handler_does_not_see_worker_modules(tmp_path: Path) -> None:
+    """
+    Test that the worker's own directory is not importable by the handler.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text(
+        "import importlib.util\n"
+        "\n"
+        "\n"
+        "def handler(event: dict, context: object) -> None:\n"
+        "    for name in ('invoke', 'packaging', 'cache'):\n"
+        "        spec = importlib.util.find_spec(name)\n"
+        "        if spec is not None and 'lambda_kit' in (spec.origin or ''):\n"
+        "            raise ImportError(name)\n"
+    )
+
+    # Act
+    result = invoke_handler(str(tmp_path), "handler", "handler", iterations=0)
+
+    # Assert
+    assert not result.errors
@@ -0,0 +1,102 @@
+"""
+This module contains tests for the shared layer planning utility functions.
+"""
+
+import zipfile
+from pathlib import Path
+
+from lambda_kit.utils.aws_lambda import is_python_layer
+from lambda_kit.utils.layer_plan import (
+    plan_layers,
+    scan_artifact,
+    write_layer_sources,
+)
+
+
+def make_zip(path: Path, files: dict[str, str]) -> str:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for arcname, content in files.items():
+            archive.writestr(arcname, content)
+    return str(path)
+
+
+def shared_files(prefix: str = "") -> dict[str, str]:
+    return {
+        f"{prefix}big/__init__.py": "b" * 4000,
+        f"{prefix}big-1.0.dist-info/RECORD": "big/__init__.py,,\n",
+        f"{prefix}small.py": "s" * 500,
+    }
+
+
+def test_plan_layers_moves_duplicates(tmp_path: Path) -> None:
+    """
+    Test that identical packages are planned into a layer and others are not.
+    """
+    # Arrange
+    artifacts = [
+        scan_artifact(
+            make_zip(tmp_path / f"{name}.zip", {"app.py": name, **shared_files()})
+        )
+        for name in ["orders", "users"]
+    ]
+    artifacts.append(
+        scan_artifact(make_zip(tmp_path / "other.zip", {"big/__init__.py": "x"}))
+    )
+
+    # Act
+    plan = plan_layers(artifacts)
+
+    # Assert
+    assert [layer.name for layer in plan.layers] == ["shared-1"]
+    layer = plan.layers[0]
+    assert sorted(package.name for package in layer.packages) == ["big", "small"]
+    assert layer.functions == {"orders", "users"}
+    assert layer.to_dict()["requirements"] == ["big==1.0"]
+    assert plan.bytes_after < plan.bytes_before
+
+
+def test_plan_layers_respects_limits(tmp_path: Path) -> None:
+    """
+    Test that packages in an existing layer or over the size limit are not packed.
+    """
+    # Arrange
+    artifacts = [
+        scan_artifact(make_zip(tmp_path / f"{name}.zip", shared_files()))
+        for name in ["orders", "users"]
+    ]
+    artifacts.append(
+        scan_artifact(make_zip(tmp_path / "common.zip", {"python/small.py": "s" * 500}))
+    )
+
+    # Act
+    plan = plan_layers(artifacts, max_size=1000)
+
+    # Assert
+    assert [package.name for package in plan.in_existing_layers] == ["small"]
+    assert plan.in_existing_layers[0].layers == ["common"]
+    assert [package.name for package in plan.unplaced] == ["big"]
+    assert not plan.layers
+
+
+def test_write_layer_sources(tmp_path: Path) -> None:
+    """
+    Test that proposed layers are written as layer source directories.
+    """
+    # Arrange
+    artifacts = [
+        scan_artifact(make_zip(tmp_path / f"{name}.zip", shared_files()))
+        for name in ["orders", "users"]
+    ]
+    plan = plan_layers(artifacts)
+
+    # Act
+    layer_dirs = write_layer_sources(plan, str(tmp_path / "layers"))
+
+    # Assert
+    assert is_python_layer(layer_dirs[0], lambda message: None)
+    requirements = (Path(layer_dirs[0]) / "requirements.txt").read_text()
+    assert requirements.splitlines() == [
+        "big==1.0",
+        "# small: no package metadata found; copy it in by hand",
+    ]
+    assert (tmp_path / "layers" / "layer-plan.json").is_file()
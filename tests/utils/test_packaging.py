@@ -0,0 +1,219 @@
+"""
+This module contains tests for the packaging utility functions.
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils.packaging import (
+    STORED_SUFFIXES,
+    build_zip,
+    collect_files,
+    iter_file_views,
+    write_zip,
+)
+
+
+def make_tree(root: Path) -> None:
+    (root / "pkg").mkdir()
+    (root / "handler.py").write_text("def handler(event, context):\n    pass\n")
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "pkg" / "data.bin").write_bytes(os.urandom(300_000) + b"\0" * 300_000)
+
+
+def test_collect_files_sorted(tmp_path: Path) -> None:
+    """
+    Test that collect_files lists files sorted by archive name.
+    """
+    # Arrange
+    make_tree(tmp_path)
+
+    # Act
+    sources = collect_files(str(tmp_path))
+
+    # Assert
+    assert [source.arcname for source in sources] == [
+        "handler.py",
+        "pkg/__init__.py",
+        "pkg/data.bin",
+    ]
+
+
+def test_build_zip_round_trip(tmp_path: Path) -> None:
+    """
+    Test that build_zip produces an archive zipfile can read back.
+    """
+    # Arrange
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    make_tree(source_dir)
+    zip_path = tmp_path / "out" / "function.zip"
+
+    # Act
+    result = build_zip(str(source_dir), str(zip_path), workers=2, chunk_size=4096)
+
+    # Assert
+    assert result.file_count == 3
+    assert result.bytes_written == zip_path.stat().st_size
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["handler.py", "pkg/__init__.py", "pkg/data.bin"]
+        assert (
+            archive.read("pkg/data.bin") == (source_dir / "pkg/data.bin").read_bytes()
+        )
+
+
+def test_build_zip_skips_output_inside_source(tmp_path: Path) -> None:
+    """
+    Test that build_zip never packages the archive it is writing.
+    """
+    # Arrange
+    make_tree(tmp_path)
+    zip_path = tmp_path / "function.zip"
+    zip_path.write_bytes(b"stale")
+
+    # Act
+    build_zip(str(tmp_path), str(zip_path))
+
+    # Assert
+    with zipfile.ZipFile(zip_path) as archive:
+        assert "function.zip" not in archive.namelist()
+
+
+def test_build_zip_is_reproducible(tmp_path: Path) -> None:
+    """
+    Test that identical inputs produce byte-identical archives.
+    """
+    # Arrange
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    make_tree(source_dir)
+    first_path = tmp_path / "first.zip"
+    second_path = tmp_path / "second.zip"
+
+    # Act
+    first = build_zip(str(source_dir), str(first_path), workers=1)
+    os.utime(source_dir / "handler.py", (0, 1_700_000_000))
+    os.chmod(source_dir / "pkg" / "data.bin", 0o600)
+    second = build_zip(str(source_dir), str(second_path), workers=4)
+
+    # Assert
+    assert first_path.read_bytes() == second_path.read_bytes()
+    assert first.sha256 == second.sha256
+    assert first.sha256 == hashlib.sha256(first_path.read_bytes()).hexdigest()
+    with zipfile.ZipFile(first_path) as archive:
+        info = archive.getinfo("pkg/data.bin")
+        assert info.date_time == (1980, 1, 1, 0, 0, 0)
+        assert (info.external_attr >> 16) & 0o777 == 0o644
+
+
+def test_iter_file_views_covers_file(tmp_path: Path) -> None:
+    """
+    Test that the mapped windows of a file add up to its contents.
+    """
+    # Arrange
+    path = tmp_path / "data.bin"
+    data = os.urandom(200_000)
+    path.write_bytes(data)
+    (tmp_path / "empty").write_bytes(b"")
+
+    # Act
+    chunks = [bytes(view) for view in iter_file_views(str(path), chunk_size=4096)]
+    empty = list(iter_file_views(str(tmp_path / "empty")))
+
+    # Assert
+    assert len(chunks) > 1
+    assert b"".join(chunks) == data
+    assert not empty
+
+
+def test_write_zip_stores_compressed_formats(tmp_path: Path) -> None:
+    """
+    Test that files with a stored suffix are stored, not deflated again.
+    """
+    # Arrange
+    (tmp_path / "src").mkdir()
+    make_tree(tmp_path / "src")
+    (tmp_path / "src" / "pkg" / "dep.whl").write_bytes(os.urandom(100_000))
+    (tmp_path / "src" / "pkg" / "empty.png").write_bytes(b"")
+    zip_path = tmp_path / "layer.zip"
+
+    # Act
+    write_zip(
+        collect_files(str(tmp_path / "src")),
+        str(zip_path),
+        workers=2,
+        chunk_size=4096,
+        store_suffixes=STORED_SUFFIXES,
+    )
+
+    # Assert
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.testzip() is None
+        types = {info.filename: info.compress_type for info in archive.infolist()}
+        assert types["pkg/dep.whl"] == zipfile.ZIP_STORED
+        assert types["pkg/empty.png"] == zipfile.ZIP_STORED
+        assert types["pkg/data.bin"] == zipfile.ZIP_DEFLATED
+        assert (
+            archive.read("pkg/dep.whl")
+            == (tmp_path / "src" / "pkg" / "dep.whl").read_bytes()
+        )
+
+
+_MEASURE_PEAK_RSS = """
+import os, resource, sys
+from lambda_kit.utils.packaging import STORED_SUFFIXES, collect_files, write_zip
+
+source_dir, zip_path, file_count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+block = os.urandom(4096) * 256
+for index in range(file_count):
+    suffix = ".whl" if index % 2 else ".so"
+    with open(os.path.join(source_dir, f"file{index}{suffix}"), "wb") as file:
+        for _ in range(8):
+            file.write(block)
+
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+write_zip(collect_files(source_dir), zip_path, store_suffixes=STORED_SUFFIXES)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+"""
+
+
+def _peak_rss_growth_kib(tmp_path: Path, file_count: int) -> int:
+    source_dir = tmp_path / f"src{file_count}"
+    source_dir.mkdir()
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _MEASURE_PEAK_RSS,
+            str(source_dir),
+            str(tmp_path / f"layer{file_count}.zip"),
+            str(file_count),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return int(output)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="ru_maxrss in KiB")
+def test_write_zip_peak_memory_is_flat(tmp_path: Path) -> None:
+    """
+    Test that packaging eight times as much data does not raise peak memory.
+    """
+    # Arrange
+    small_files, large_files = 1, 8  # 8 MiB and 64 MiB
+
+    # Act
+    small = _peak_rss_growth_kib(tmp_path, small_files)
+    large = _peak_rss_growth_kib(tmp_path, large_files)
+
+    # Assert
+    assert large - small < 8 * 1024
@@ -0,0 +1,158 @@
+"""
+This module contains tests for the pruning utility functions.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from lambda_kit.utils.packaging import ZipSource, collect_files
+from lambda_kit.utils.prune import (
+    PruneConfig,
+    load_prune_config,
+    prune_sources,
+    strip_shared_objects,
+)
+
+
+def make_layer(root: Path) -> None:
+    files = {
+        "python/pkg/__init__.py": "VALUE = 1\n",
+        "python/pkg/__pycache__/__init__.cpython-312.pyc": "x" * 10,
+        "python/pkg/tests/test_pkg.py": "x" * 20,
+        "python/pkg/_speedups.pyx": "x" * 30,
+        "python/pkg/__init__.pyi": "x" * 40,
+        "python/pkg-1.0.dist-info/METADATA": "Name: pkg\n",
+        "python/pkg-1.0.dist-info/RECORD": "x" * 50,
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_prune_sources_default_rules(tmp_path: Path) -> None:
+    """
+    Test that the default rules drop what Lambda never needs and report savings.
+    """
+    # Arrange
+    make_layer(tmp_path / "layer")
+    sources = collect_files(str(tmp_path / "layer"))
+
+    # Act
+    kept, report = prune_sources(sources, PruneConfig(strip=False), str(tmp_path))
+
+    # Assert
+    assert [source.arcname for source in kept] == [
+        "python/pkg-1.0.dist-info/METADATA",
+        "python/pkg/__init__.py",
+    ]
+    assert report["bytecode"].bytes == 10
+    assert report["tests"].bytes == 20
+    assert report["sources"].bytes == 30
+    assert report["stubs"].bytes == 40
+    assert report["dist-info"].bytes == 50
+    assert report["docs"].files == 0
+
+
+def test_prune_sources_keeps_docs_and_tests_packages(tmp_path: Path) -> None:
+    """
+    Test that docs and tests directories that are importable packages are
+    kept, as botocore imports its ``botocore.docs`` subpackage.
+    """
+    # Arrange
+    files = {
+        "python/botocore/__init__.py": "",
+        "python/botocore/client.py": "import botocore.docs\n",
+        "python/botocore/docs/__init__.py": "",
+        "python/botocore/docs/docstring.py": "",
+        "python/botocore/docs/bcdoc/__init__.py": "",
+        "python/botocore/docs/bcdoc/restdoc.py": "",
+        "python/botocore/tests/__init__.py": "",
+        "python/botocore/doc/guide.txt": "x" * 10,
+        "python/botocore/test/test_client.py": "x" * 20,
+        "python/botocore/README.md": "x" * 30,
+    }
+    for name, content in files.items():
+        path = tmp_path / "layer" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    sources = collect_files(str(tmp_path / "layer"))
+
+    # Act
+    kept, report = prune_sources(sources, PruneConfig(strip=False), str(tmp_path))
+
+    # Assert
+    assert sorted(source.arcname for source in kept) == sorted(
+        name for name in files if name.endswith(".py") and "/test/" not in name
+    )
+    assert report["docs"].bytes == 40
+    assert report["tests"].bytes == 20
+
+
+def test_load_prune_config_overrides(tmp_path: Path) -> None:
+    """
+    Test disabling default rules, adding rules and keeping files.
+    """
+    # Arrange
+    make_layer(tmp_path / "layer")
+    sources = collect_files(str(tmp_path / "layer"))
+    config = load_prune_config(
+        {
+            "prune": {
+                "enabled": True,
+                "strip": False,
+                "disable": ["stubs"],
+                "keep": ["*/tests/*"],
+                "rules": {"metadata": ["*/METADATA"]},
+            }
+        }
+    )
+
+    # Act
+    kept, report = prune_sources(sources, config, str(tmp_path))
+
+    # Assert
+    assert config.enabled
+    assert "stubs" not in report
+    assert report["metadata"].files == 1
+    assert "python/pkg/__init__.pyi" in [source.arcname for source in kept]
+    assert "python/pkg/tests/test_pkg.py" in [source.arcname for source in kept]
+
+
+def test_load_prune_config_unknown_rule() -> None:
+    """
+    Test that disabling an unknown rule is reported.
+    """
+    with pytest.raises(ValueError, match="Unknown prune rules: nope"):
+        load_prune_config({"prune": {"disable": ["nope"]}})
+
+
+def test_strip_shared_objects_restrips_older_replacement(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """
+    Test that a stripped copy is replaced when the original changes, even if
+    the new original has an older modification time.
+    """
+    # Arrange
+    strip = tmp_path / "strip"
+    strip.write_text('#!/bin/sh\nhead -c 4 "$2" > "$2.tmp" && mv "$2.tmp" "$2"\n')
+    strip.chmod(0o755)
+    mocker.patch("lambda_kit.utils.prune.shutil.which", return_value=str(strip))
+    library = tmp_path / "lib" / "native.so"
+    library.parent.mkdir()
+    library.write_bytes(b"AAAA debug symbols")
+    sources = [ZipSource(path=str(library), arcname="native.so")]
+    strip_shared_objects(sources, str(tmp_path / "staging"))
+    library.write_bytes(b"BBBB debug symbols")
+    os.utime(library, ns=(0, 0))
+
+    # Act
+    stripped, savings = strip_shared_objects(sources, str(tmp_path / "staging"))
+
+    # Assert
+    assert Path(stripped[0].path).read_bytes() == b"BBBB"
+    assert savings.files == 1
@@ -0,0 +1,120 @@
+"""
+This module contains tests for the Runtime API emulator.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils.runtime_api import (
+    InvocationRecord,
+    LoadResult,
+    run_load_test,
+)
+
+HANDLER = """
+import os
+import time
+
+
+def handler(event: dict, context: object) -> dict:
+    time.sleep(event.get("sleep", 0))
+    if event["n"] < 0:
+        raise ValueError("negative")
+    return {"pid": os.getpid(), "function": context.function_name}
+"""
+
+
+def test_run_load_test_spreads_invocations(tmp_path: Path) -> None:
+    """
+    Test that concurrent invocations start environments up to the limit and
+    reuse them once warm.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text(HANDLER)
+    payloads = [json.dumps({"n": 1}).encode(), json.dumps({"n": -1}).encode()]
+
+    # Act
+    result = run_load_test(
+        str(tmp_path),
+        "handler.handler",
+        "example",
+        payloads,
+        requests=12,
+        concurrency=4,
+        max_environments=2,
+    )
+
+    # Assert
+    assert len(result.invocations) == 12
+    assert result.cold_starts == 2
+    assert [record.environment for record in result.environments] == [0, 1]
+    assert sum(record.invocations for record in result.environments) == 12
+    assert all(record.init_ms > 0 for record in result.environments)
+    assert result.errors == ["ValueError: negative"] * 6
+    assert result.throughput > 0
+
+
+def test_run_load_test_times_out_and_replaces_environment(tmp_path: Path) -> None:
+    """
+    Test that a timed-out invocation discards its environment.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text(HANDLER)
+    payloads = [json.dumps({"n": 1, "sleep": 0.5}).encode()]
+
+    # Act
+    result = run_load_test(
+        str(tmp_path),
+        "handler.handler",
+        "example",
+        payloads,
+        requests=2,
+        concurrency=1,
+        timeout_ms=100,
+    )
+
+    # Assert
+    assert len(result.environments) == 2
+    assert result.cold_starts == 2
+    assert result.errors == ["Task timed out after 0.10 seconds"] * 2
+
+
+def test_run_load_test_init_error(tmp_path: Path) -> None:
+    """
+    Test that a handler that cannot be imported is reported.
+    """
+    # Arrange
+    (tmp_path / "handler.py").write_text("import does_not_exist\n")
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="does_not_exist"):
+        run_load_test(str(tmp_path), "handler.handler", "example", [b"{}"])
+
+
+def test_histogram_trims_empty_buckets() -> None:
+    """
+    Test that the histogram runs from the first to the last used bucket.
+    """
+    # Arrange
+    result = LoadResult(
+        concurrency=1,
+        elapsed_s=1.0,
+        invocations=[
+            InvocationRecord(
+                environment=0, cold=False, latency_ms=latency, duration_ms=latency
+            )
+            for latency in (3.0, 4.0, 30.0, 20000.0)
+        ],
+        environments=[],
+    )
+
+    # Act
+    histogram = result.histogram()
+
+    # Assert
+    assert histogram[0] == ("<= 5", 2)
+    assert histogram[3] == ("<= 50", 1)
+    assert histogram[-1] == ("> 10000", 1)
+    assert sum(count for _, count in histogram) == 4
@@ -0,0 +1,171 @@
+"""
+This module contains tests for the handler template catalog.
+"""
+
+import ast
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from lambda_kit.utils.aws_lambda import find_lambda_handler_names
+from lambda_kit.utils.templates import (
+    CATALOG,
+    DEFAULT_TEMPLATE,
+    list_templates,
+    load_scaffold_manifest,
+    render_handler,
+)
+from lambda_kit.utils.warm_path import lint_handler_source
+
+TUNED_TEMPLATES = sorted(name for name in CATALOG if name.startswith("tuned/"))
+
+
+@pytest.mark.parametrize("template", sorted(CATALOG))
+def test_render_handler_catalog(tmp_path: Path, template: str) -> None:
+    """
+    Test that every packaged template renders a valid, detectable handler.
+    """
+    # Act
+    source = render_handler(
+        template, {"description": "Test handler"}, bytecode_cache_dir=str(tmp_path)
+    )
+
+    # Assert
+    ast.parse(source)
+    assert find_lambda_handler_names(source) == ["lambda_handler"]
+    assert "Test handler" in source
+    assert os.listdir(tmp_path)
+
+
+@pytest.mark.parametrize("template", TUNED_TEMPLATES)
+def test_tuned_templates_keep_the_warm_path_clean(
+    tmp_path: Path, template: str
+) -> None:
+    """
+    Test that no tuned template does per-invocation work the linter flags.
+    """
+    # Act
+    source = render_handler(template, bytecode_cache_dir=str(tmp_path))
+
+    # Assert
+    assert DEFAULT_TEMPLATE in TUNED_TEMPLATES
+    assert not lint_handler_source(source)
+
+
+@pytest.mark.parametrize(
+    "template, record, failing, expected",
+    [
+        (
+            "tuned/sqs",
+            lambda index: {"messageId": f"m{index}", "body": "{}"},
+            {"m1", "m3"},
+            ["m1", "m3"],
+        ),
+        (
+            "tuned/sqs",
+            lambda index: {
+                "messageId": f"m{index}",
+                "body": "{}",
+                "eventSourceARN": "arn:aws:sqs:us-east-1:123456789012:orders.fifo",
+            },
+            {"m1", "m3"},
+            ["m1", "m2", "m3"],
+        ),
+        (
+            "tuned/kinesis",
+            lambda index: {"kinesis": {"sequenceNumber": f"s{index}", "data": "e30="}},
+            {"s2"},
+            ["s2"],
+        ),
+    ],
+)
+def test_tuned_batch_templates_report_partial_failures(
+    tmp_path: Path,
+    template: str,
+    record: Callable[[int], dict[str, Any]],
+    failing: set[str],
+    expected: list[str],
+) -> None:
+    """
+    Test that batch consumers report exactly the records to retry, stopping at
+    the first failure on FIFO queues.
+    """
+    # Arrange
+    namespace: dict[str, Any] = {}
+    exec(  # pylint: disable=exec-used
+        render_handler(template, bytecode_cache_dir=str(tmp_path)), namespace
+    )
+    process_record = namespace["process_record"]
+
+    def fail_some(record: dict[str, Any]) -> None:
+        identifier = record.get("messageId") or record["kinesis"]["sequenceNumber"]
+        if identifier in failing:
+            raise RuntimeError(identifier)
+        process_record(record)
+
+    namespace["process_record"] = fail_some
+    event = {"Records": [record(index) for index in range(4)]}
+
+    # Act
+    response = namespace["lambda_handler"](event, None)
+
+    # Assert
+    assert [
+        failure["itemIdentifier"] for failure in response["batchItemFailures"]
+    ] == expected
+
+
+def test_render_handler_custom_template_dir(tmp_path: Path) -> None:
+    """
+    Test that template directories add templates and override packaged ones.
+    """
+    # Arrange
+    (tmp_path / "sqs.py.jinja2").write_text("# custom {{ description }}\n")
+    (tmp_path / "kinesis_stream.py.jinja2").write_text("# kinesis\n")
+
+    # Act
+    templates = list_templates([str(tmp_path)])
+    source = render_handler("sqs", template_dirs=[str(tmp_path)])
+
+    # Assert
+    assert "kinesis-stream" in templates
+    assert source == "# custom A new Lambda function\n"
+
+
+def test_render_handler_unknown_template() -> None:
+    """
+    Test that an unknown template is reported with the available choices.
+    """
+    with pytest.raises(ValueError, match="Choose from: api-gateway"):
+        render_handler("nope")
+
+
+def test_load_scaffold_manifest(tmp_path: Path) -> None:
+    """
+    Test that manifest defaults apply and paths are relative to the manifest.
+    """
+    # Arrange
+    manifest = tmp_path / "services.toml"
+    manifest.write_text(
+        "[defaults]\n"
+        'template = "sqs"\n'
+        "\n"
+        "[[functions]]\n"
+        'source_dir = "orders"\n'
+        "\n"
+        "[[functions]]\n"
+        'source_dir = "events"\n'
+        'template = "eventbridge"\n'
+        'detail_type = "Order Placed"\n'
+    )
+
+    # Act
+    specs = load_scaffold_manifest(str(manifest))
+
+    # Assert
+    assert [(spec.source_dir, spec.template, spec.context) for spec in specs] == [
+        (str(tmp_path / "orders"), "sqs", {}),
+        (str(tmp_path / "events"), "eventbridge", {"detail_type": "Order Placed"}),
+    ]
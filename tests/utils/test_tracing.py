@@ -0,0 +1,121 @@
+"""
+This module contains tests for the phase tracing utility functions.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils.tracing import (
+    Phase,
+    PhaseTracer,
+    summarize_phases,
+    write_chrome_trace,
+)
+
+
+def test_phase_records_time_and_bytes() -> None:
+    """
+    Test that a phase records wall time, CPU time and the bytes it reports.
+    """
+    # Arrange
+    tracer = PhaseTracer()
+
+    # Act
+    with tracer.phase("zip", cache_hit=False) as phase:
+        time.sleep(0.02)
+        sum(range(200_000))
+        phase.bytes_read = 1000
+
+    # Assert
+    assert len(tracer.phases) == 1
+    recorded = tracer.phases[0]
+    assert recorded.name == "zip"
+    assert recorded.wall_s >= 0.02
+    assert 0 < recorded.cpu_s < recorded.wall_s
+    assert recorded.bytes_read == 1000
+    assert recorded.peak_rss_bytes > 0
+    assert recorded.to_dict()["cache_hit"] is False
+
+
+def test_phase_keeps_reported_zero_bytes() -> None:
+    """
+    Test that a phase that reports zero bytes is not given the syscall counts.
+    """
+    # Arrange
+    tracer = PhaseTracer()
+
+    # Act
+    with tracer.phase("zip") as phase:
+        phase.bytes_read = 0
+        phase.bytes_written = 0
+        Path(__file__).read_bytes()
+
+    # Assert
+    assert tracer.phases[0].bytes_read == 0
+    assert tracer.phases[0].bytes_written == 0
+
+
+def test_phase_is_recorded_when_it_raises() -> None:
+    """
+    Test that a failing phase is still recorded.
+    """
+    # Arrange
+    tracer = PhaseTracer()
+
+    # Act
+    with pytest.raises(RuntimeError):
+        with tracer.phase("install"):
+            raise RuntimeError("pip failed")
+
+    # Assert
+    assert [phase.name for phase in tracer.phases] == ["install"]
+
+
+def test_summarize_phases_totals_by_name() -> None:
+    """
+    Test that phases with the same name are combined.
+    """
+    # Arrange
+    phases = [
+        Phase(name="zip", start=1.0, wall_s=1.0, cpu_s=0.5, peak_rss_bytes=10),
+        Phase(name="hash", start=1.5, wall_s=0.25, bytes_read=100),
+        Phase(name="zip", start=2.0, wall_s=2.0, cpu_s=1.5, peak_rss_bytes=30),
+    ]
+
+    # Act
+    totals = summarize_phases(phases)
+
+    # Assert
+    assert [phase.name for phase in totals] == ["zip", "hash"]
+    assert totals[0].wall_s == 3.0
+    assert totals[0].cpu_s == 2.0
+    assert totals[0].peak_rss_bytes == 30
+    assert totals[1].bytes_read == 100
+
+
+def test_write_chrome_trace(tmp_path: Path) -> None:
+    """
+    Test that phases are written as complete events relative to the first.
+    """
+    # Arrange
+    phases = [
+        Phase(name="discover", start=100.0, wall_s=0.5, pid=1),
+        Phase(name="zip", start=100.5, wall_s=1.25, pid=2, args={"artifact": "a"}),
+    ]
+    trace_path = tmp_path / "trace.json"
+
+    # Act
+    write_chrome_trace(phases, str(trace_path))
+
+    # Assert
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert [event["ph"] for event in events].count("M") == 2
+    assert [(span["name"], span["ts"], span["dur"]) for span in spans] == [
+        ("discover", 0.0, 500_000.0),
+        ("zip", 500_000.0, 1_250_000.0),
+    ]
+    assert spans[1]["args"]["artifact"] == "a"
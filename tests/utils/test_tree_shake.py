@@ -0,0 +1,158 @@
+"""
+This module contains tests for the tree shaking utility functions.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils import tree_shake
+from lambda_kit.utils.packaging import collect_files
+from lambda_kit.utils.tree_shake import (
+    ImportScanner,
+    TreeShakeConfig,
+    load_tree_shake_config,
+    resolve_import,
+    shake_sources,
+)
+
+
+def make_function(root: Path) -> None:
+    files = {
+        "app.py": "import sdk.client\nfrom helpers import *\n",
+        "helpers/__init__.py": "",
+        "helpers/format.py": "from .. import nothing\n",
+        "sdk/__init__.py": "from . import core\n",
+        "sdk/core.py": "import importlib\nimportlib.import_module(NAME)\n",
+        "sdk/client.py": "from .models import Model\n",
+        "sdk/models.py": "",
+        "sdk/_speedups.so": "x" * 10,
+        "sdk/data/endpoints.json": "{}",
+        "sdk/services/__init__.py": "",
+        "sdk/services/storage.py": "x = 1\n",
+        "sdk/services/queue.py": "x = 1\n",
+        "sdk/services/queue.json": "{}",
+        "unused/__init__.py": "import sdk\n",
+        "unused/big.py": "x" * 100,
+        "plugins/__init__.py": "",
+        "plugins/csv.py": "",
+        "templates/page.html": "<html></html>",
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_shake_sources_drops_unreachable_modules(tmp_path: Path) -> None:
+    """
+    Test that only modules reachable from the handler are kept, with their
+    package data, and that what was removed is reported.
+    """
+    # Arrange
+    make_function(tmp_path / "function")
+    sources = collect_files(str(tmp_path / "function"))
+
+    # Act
+    kept, report = shake_sources(sources, ["app"], TreeShakeConfig(enabled=True))
+
+    # Assert
+    assert [source.arcname for source in kept] == [
+        "app.py",
+        "helpers/__init__.py",
+        "helpers/format.py",
+        "sdk/__init__.py",
+        "sdk/_speedups.so",
+        "sdk/client.py",
+        "sdk/core.py",
+        "sdk/data/endpoints.json",
+        "sdk/models.py",
+        "templates/page.html",
+    ]
+    assert report.modules == 14
+    assert report.reachable == 7
+    assert {name: savings.files for name, savings in report.removed.items()} == {
+        "plugins": 2,
+        "sdk": 4,
+        "unused": 2,
+    }
+    assert report.removed["unused"].bytes == 111
+    assert report.dynamic == ["sdk.core"]
+
+
+def test_shake_sources_keeps_allowlisted_modules(tmp_path: Path) -> None:
+    """
+    Test that allowlist patterns keep modules and their submodules.
+    """
+    # Arrange
+    make_function(tmp_path / "function")
+    sources = collect_files(str(tmp_path / "function"))
+    config = load_tree_shake_config(
+        {"tree_shake": {"enabled": True, "keep": ["plugins", "sdk.services.st*"]}}
+    )
+
+    # Act
+    kept, report = shake_sources(sources, ["app"], config)
+
+    # Assert
+    arcnames = {source.arcname for source in kept}
+    assert {"plugins/__init__.py", "plugins/csv.py"} <= arcnames
+    assert {"sdk/services/__init__.py", "sdk/services/storage.py"} <= arcnames
+    assert "sdk/services/queue.json" in arcnames
+    assert "sdk/services/queue.py" not in arcnames
+    assert set(report.removed) == {"sdk", "unused"}
+
+
+@pytest.mark.parametrize(
+    "module, is_package, level, target, expected",
+    [
+        ("app", False, 0, "json", "json"),
+        ("pkg.mod", False, 1, "", "pkg"),
+        ("pkg.mod", False, 1, "other", "pkg.other"),
+        ("pkg", True, 1, "sub", "pkg.sub"),
+        ("pkg.sub.mod", False, 2, "util", "pkg.util"),
+        ("app", False, 1, "", None),
+    ],
+)
+def test_resolve_import(
+    module: str, is_package: bool, level: int, target: str, expected: str
+) -> None:
+    """
+    Test that relative imports resolve against the importing module's package.
+    """
+    # Act
+    result = resolve_import(module, is_package, level, target)
+
+    # Assert
+    assert result == expected
+
+
+def test_import_scanner_caches_by_content(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that files are parsed once per content, whatever their path.
+    """
+    # Arrange
+    first_path = tmp_path / "first.py"
+    copy_path = tmp_path / "copy.py"
+    first_path.write_text("import json\n")
+    copy_path.write_text("import json\n")
+    cache_path = str(tmp_path / "cache" / "imports.json")
+    parsed = []
+
+    def scan_imports(path: str) -> tuple[list[tuple[int, str, list[str]]], bool]:
+        parsed.append(path)
+        return [(0, "json", [])], False
+
+    monkeypatch.setattr(tree_shake, "scan_imports", scan_imports)
+
+    # Act
+    first = ImportScanner(cache_path).scan([str(first_path), str(copy_path)])
+    ImportScanner(cache_path).scan([str(copy_path)])
+    copy_path.write_text("import yaml\n")
+    ImportScanner(cache_path).scan([str(first_path), str(copy_path)])
+
+    # Assert
+    assert first[str(copy_path)].imports == [(0, "json", [])]
+    assert parsed == [str(first_path), str(copy_path)]
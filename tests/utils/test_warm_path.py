@@ -0,0 +1,133 @@
+"""
+This module contains tests for the warm-path linting utility functions.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from lambda_kit.utils import warm_path
+from lambda_kit.utils.warm_path import (
+    lint_handler_files,
+    lint_handler_source,
+    lint_init_source,
+)
+
+HANDLER_CODE = """
+import json
+import re as regex
+from boto3 import client
+
+import psycopg2
+from aws_lambda_typing import context as lambda_context
+
+S3 = client("s3")
+PATTERN = regex.compile("[a-z]+")
+
+
+def helper(event: dict) -> None:
+    client("sqs")
+
+
+def handler(event: dict, context: lambda_context.Context) -> dict:
+    import yaml
+    sqs = client("sqs")
+    connection = psycopg2.connect("dbname=test")
+    words = regex.compile(r"\\w+")
+    print(json.dumps(event, indent=2))
+    print(json.dumps(event, indent=None))
+    table = client("dynamodb")  # kit: ignore
+    session.client("s3")
+    return {}
+"""
+
+
+def test_lint_handler_source_flags_per_invocation_work() -> None:
+    """
+    Test that only work inside handler bodies is flagged, with names resolved
+    through the module's imports.
+    """
+    # Act
+    findings = lint_handler_source(HANDLER_CODE, "app.py")
+
+    # Assert
+    assert [(finding.line, finding.rule) for finding in findings] == [
+        (18, "import-in-handler"),
+        (19, "client-in-handler"),
+        (20, "connection-in-handler"),
+        (21, "regex-compile"),
+        (22, "json-indent"),
+    ]
+    assert findings[1].location == "app.py:19:11"
+    assert findings[1].handler == "handler"
+    assert findings[1].message.startswith("boto3.client() creates a client")
+
+
+INIT_CODE = """
+import socket
+import uuid
+from datetime import datetime
+from random import getrandbits
+
+STARTED = datetime.now()
+NONCE = getrandbits(32)
+SEED = uuid.uuid4()  # kit: ignore
+
+
+class Config:
+    CONNECTION = socket.create_connection(("localhost", 6379))
+
+
+def handler(event: dict, context: object) -> dict:
+    return {"id": str(uuid.uuid4()), "at": datetime.now().isoformat()}
+"""
+
+
+def test_lint_init_source_flags_snapshot_hazards() -> None:
+    """
+    Test that only code run at import is flagged, class bodies included.
+    """
+    # Act
+    findings = lint_init_source(INIT_CODE, "app.py")
+
+    # Assert
+    assert [(finding.line, finding.rule) for finding in findings] == [
+        (7, "init-timestamp"),
+        (8, "init-unique-value"),
+        (13, "init-connection"),
+    ]
+    assert findings[0].handler == "<module>"
+    assert findings[1].message.startswith("random.getrandbits() generates")
+
+
+def test_lint_handler_source_ignores_unparsable_code() -> None:
+    """
+    Test that code that cannot be parsed has no findings.
+    """
+    # Act
+    findings = lint_handler_source("def handler(:")
+
+    # Assert
+    assert not findings
+
+
+@pytest.mark.parametrize("threshold", [64, 1])
+def test_lint_handler_files_serial_or_parallel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, threshold: int
+) -> None:
+    """
+    Test that files are linted in the order given, serial or parallel.
+    """
+    # Arrange
+    monkeypatch.setattr(warm_path, "PARALLEL_SCAN_THRESHOLD", threshold)
+    paths = []
+    for name in ("first", "second"):
+        path = tmp_path / f"{name}.py"
+        path.write_text(HANDLER_CODE)
+        paths.append(str(path))
+
+    # Act
+    findings = lint_handler_files(paths, workers=2)
+
+    # Assert
+    assert [finding.path for finding in findings] == [paths[0]] * 5 + [paths[1]] * 5
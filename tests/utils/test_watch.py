@@ -0,0 +1,99 @@
+"""
+This module contains tests for the source tree watchers.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from lambda_kit.utils.packaging import exclude_under
+from lambda_kit.utils.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    SourceWatcher,
+    wait_for_changes,
+)
+
+
+def make_watcher(kind: str, directory: Path) -> SourceWatcher:
+    """
+    Create a watcher of a kind that ignores the directory's dist folder.
+    """
+    exclude = exclude_under(str(directory / "dist"))
+    if kind == "polling":
+        return PollingWatcher(str(directory), exclude, interval=0.02)
+    try:
+        watcher: SourceWatcher = InotifyWatcher(str(directory), exclude)
+    except OSError:
+        pytest.skip("inotify is not available")
+    return watcher
+
+
+def edit_later(directory: Path) -> None:
+    """
+    Edit, create and delete files in a directory after a short delay.
+    """
+    time.sleep(0.1)
+    (directory / "dist" / "app.zip").write_text("ignored")
+    (directory / "app.py").write_text("X = 2\n")
+    (directory / "package" / "sub").mkdir(parents=True)
+    (directory / "package" / "sub" / "module.py").write_text("Y = 1\n")
+    (directory / "old.py").unlink()
+
+
+@pytest.mark.parametrize("kind", ["inotify", "polling"])
+def test_watcher_reports_a_burst_of_changes_once(kind: str, tmp_path: Path) -> None:
+    """
+    Test that edits, new files in new directories and deletions are reported
+    together, and that excluded paths are not.
+    """
+    # Arrange
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "app.py").write_text("X = 1\n")
+    (tmp_path / "old.py").write_text("Z = 1\n")
+    watcher = make_watcher(kind, tmp_path)
+    editor = threading.Thread(target=edit_later, args=(tmp_path,))
+
+    # Act
+    editor.start()
+    changes = wait_for_changes(watcher, debounce=0.2, timeout=5)
+    editor.join()
+    quiet = watcher.wait(0.1)
+    watcher.close()
+
+    # Assert
+    changed = {Path(path).relative_to(tmp_path).as_posix() for path in changes}
+    assert {"app.py", "old.py", "package/sub/module.py"} <= changed
+    assert not any(path.startswith("dist") for path in changed)
+    assert not quiet
+
+
+class ScriptedWatcher(SourceWatcher):
+    """
+    A watcher that reports a fixed sequence of changes.
+    """
+
+    def __init__(self, batches: list[set[str]]):
+        self.batches = batches
+
+    def wait(self, timeout: Optional[float] = None) -> set[str]:
+        return self.batches.pop(0) if self.batches else set()
+
+
+def test_wait_for_changes_merges_until_quiet() -> None:
+    """
+    Test that changes arriving within the debounce period are merged.
+    """
+    # Arrange
+    watcher = ScriptedWatcher([{"a.py"}, {"b.py"}, set(), {"c.py"}])
+
+    # Act
+    first = wait_for_changes(watcher, debounce=0.01)
+    second = wait_for_changes(watcher, debounce=0.01)
+
+    # Assert
+    assert first == {"a.py", "b.py"}
+    assert second == {"c.py"}
@@ -0,0 +1,188 @@
+"""
+This module contains tests for selecting wheels for a Lambda target.
+"""
+
+import struct
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from pytest_mock import MockerFixture
+
+from lambda_kit.utils import wheel_index
+from lambda_kit.utils.packaging import ZipSource
+from lambda_kit.utils.wheel_index import (
+    TargetPlatform,
+    find_foreign_binaries,
+    index_wheelhouse,
+    select_wheels,
+)
+
+ARM64 = TargetPlatform("arm64", "3.12")
+X86_64 = TargetPlatform("x86_64", "3.12")
+
+
+def make_wheel(  # pylint: disable=too-many-arguments
+    wheelhouse: Path,
+    name: str,
+    version: str,
+    tag: str = "py3-none-any",
+    *,
+    requires: Optional[list[str]] = None,
+    requires_python: Optional[str] = None,
+) -> Path:
+    """
+    Write a wheel with the given tag and dependencies.
+    """
+    wheel_path = wheelhouse / f"{name}-{version}-{tag}.whl"
+    headers = ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+    headers.extend(f"Requires-Dist: {line}" for line in requires or [])
+    if requires_python:
+        headers.append(f"Requires-Python: {requires_python}")
+    with zipfile.ZipFile(wheel_path, "w") as wheel:
+        wheel.writestr(f"{name}/__init__.py", "")
+        wheel.writestr(f"{name}-{version}.dist-info/METADATA", "\n".join(headers))
+    return wheel_path
+
+
+def make_wheelhouse(wheelhouse: Path) -> None:
+    """
+    Write a native package with a dependency on arm64 only, whose newest
+    version has no arm64 wheel.
+    """
+    wheelhouse.mkdir()
+    for machine in ["x86_64", "aarch64"]:
+        make_wheel(
+            wheelhouse,
+            "fastjson",
+            "1.0",
+            f"cp312-cp312-manylinux_2_17_{machine}.manylinux2014_{machine}",
+            requires=['simd-shim>=1; platform_machine == "aarch64"'],
+        )
+    make_wheel(wheelhouse, "fastjson", "2.0", "cp312-cp312-manylinux_2_28_x86_64")
+    make_wheel(wheelhouse, "fastjson", "3.0", "cp313-cp313-manylinux_2_28_aarch64")
+    make_wheel(wheelhouse, "simd_shim", "1.0")
+    make_wheel(wheelhouse, "simd_shim", "2.0", requires_python=">=3.13")
+    (wheelhouse / "fastjson-4.0.tar.gz").write_bytes(b"")
+
+
+def test_target_tags_prefer_the_newest_compatible_glibc() -> None:
+    """
+    Test that a target supports the manylinux tags of its runtime's glibc.
+    """
+    # Act
+    tags = [str(tag) for tag in TargetPlatform("x86_64", "3.11").tags()]
+
+    # Assert
+    assert tags[0] == "cp311-cp311-manylinux_2_26_x86_64"
+    assert "cp311-abi3-manylinux2014_x86_64" in tags
+    assert "py3-none-any" in tags
+    assert not any("manylinux_2_28" in tag or "aarch64" in tag for tag in tags)
+    assert str(ARM64.tags()[0]) == "cp312-cp312-manylinux_2_34_aarch64"
+
+
+@pytest.mark.parametrize(
+    "target, expected",
+    [
+        (
+            ARM64,
+            [
+                "fastjson-1.0-cp312-cp312-manylinux_2_17_aarch64"
+                ".manylinux2014_aarch64.whl",
+                "simd_shim-1.0-py3-none-any.whl",
+            ],
+        ),
+        (X86_64, ["fastjson-2.0-cp312-cp312-manylinux_2_28_x86_64.whl"]),
+    ],
+)
+def test_select_wheels_for_target(
+    target: TargetPlatform, expected: list[str], tmp_path: Path
+) -> None:
+    """
+    Test that the newest version with a wheel for the target is selected,
+    along with the dependencies the target's markers require.
+    """
+    # Arrange
+    make_wheelhouse(tmp_path / "wheelhouse")
+    index = index_wheelhouse(str(tmp_path / "wheelhouse"))
+
+    # Act
+    records = select_wheels(["fastjson"], index, target)
+
+    # Assert
+    assert [record.filename for record in records] == expected
+
+
+def test_select_wheels_applies_constraints(tmp_path: Path) -> None:
+    """
+    Test that constraints narrow needed distributions and add no others.
+    """
+    # Arrange
+    make_wheelhouse(tmp_path / "wheelhouse")
+    index = index_wheelhouse(str(tmp_path / "wheelhouse"))
+
+    # Act
+    records = select_wheels(
+        ["fastjson"], index, X86_64, constraints=["fastjson<2", "simd-shim==1.0"]
+    )
+
+    # Assert
+    assert [record.filename for record in records] == [
+        "fastjson-1.0-cp312-cp312-manylinux_2_17_x86_64.manylinux2014_x86_64.whl"
+    ]
+
+
+def test_select_wheels_never_builds_from_source(tmp_path: Path) -> None:
+    """
+    Test that a requirement only satisfied by a source distribution fails.
+    """
+    # Arrange
+    make_wheelhouse(tmp_path / "wheelhouse")
+    index = index_wheelhouse(str(tmp_path / "wheelhouse"))
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="fastjson==4.0.*python3.12-arm64"):
+        select_wheels(["fastjson==4.0"], index, ARM64)
+
+
+def test_index_wheelhouse_reads_only_new_wheels(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """
+    Test that the cached index is reused for wheels that did not change.
+
+    :param mocker: The pytest mocker fixture.
+    """
+    # Arrange
+    wheelhouse = tmp_path / "wheelhouse"
+    make_wheelhouse(wheelhouse)
+    index_wheelhouse(str(wheelhouse))
+    make_wheel(wheelhouse, "extra", "1.0")
+    read_metadata = mocker.spy(wheel_index, "read_wheel_metadata")
+
+    # Act
+    index = index_wheelhouse(str(wheelhouse))
+
+    # Assert
+    assert read_metadata.call_count == 1
+    assert sorted(index) == ["extra", "fastjson", "simd-shim"]
+    assert len(index["fastjson"]) == 4
+
+
+def test_find_foreign_binaries(tmp_path: Path) -> None:
+    """
+    Test that shared objects built for another machine are reported.
+    """
+    # Arrange
+    sources = []
+    for name, machine in [("_x86.so", 62), ("_arm.cpython-312.so", 183)]:
+        path = tmp_path / name
+        path.write_bytes(b"\x7fELF\x02\x01" + bytes(12) + struct.pack("<H", machine))
+        sources.append(ZipSource(path=str(path), arcname=f"python/{name}"))
+
+    # Act
+    foreign = find_foreign_binaries(sources, ARM64)
+
+    # Assert
+    assert foreign == [("python/_x86.so", "x86_64")]
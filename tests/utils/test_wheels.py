@@ -0,0 +1,178 @@
+"""
+This module contains tests for the wheel installation utility functions.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from lambda_kit.utils.wheel_index import TargetPlatform
+from lambda_kit.utils.wheels import (
+    install_requirements,
+    install_wheel,
+    read_requirement_specifiers,
+)
+
+
+def make_wheel(directory: Path, name: str = "demo", version: str = "1.0") -> Path:
+    wheel_path = directory / f"{name}-{version}-py3-none-any.whl"
+    dist_info = f"{name}-{version}.dist-info"
+    with zipfile.ZipFile(wheel_path, "w") as wheel:
+        wheel.writestr(f"{name}/__init__.py", "VALUE = 1\n")
+        wheel.writestr(f"{name}-{version}.data/purelib/{name}_extra.py", "")
+        wheel.writestr(f"{name}-{version}.data/scripts/{name}-cli", "#!python\n")
+        wheel.writestr(
+            f"{dist_info}/METADATA",
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+        )
+        wheel.writestr(
+            f"{dist_info}/WHEEL",
+            "Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        wheel.writestr(f"{dist_info}/RECORD", "")
+    return wheel_path
+
+
+def test_install_wheel_layout(tmp_path: Path) -> None:
+    """
+    Test that install_wheel lays files out like pip install --target.
+    """
+    # Arrange
+    wheel_path = make_wheel(tmp_path)
+    target_dir = tmp_path / "python"
+
+    # Act
+    count = install_wheel(str(wheel_path), str(target_dir))
+
+    # Assert
+    assert count == 5
+    assert (target_dir / "demo" / "__init__.py").read_text() == "VALUE = 1\n"
+    assert (target_dir / "demo_extra.py").exists()
+    assert (target_dir / "demo-1.0.dist-info" / "METADATA").exists()
+    assert not (target_dir / "demo-cli").exists()
+
+
+def test_install_wheel_rejects_unsafe_paths(tmp_path: Path) -> None:
+    """
+    Test that install_wheel refuses to write outside the target directory.
+    """
+    # Arrange
+    wheel_path = tmp_path / "evil-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(wheel_path, "w") as wheel:
+        wheel.writestr("../escape.py", "")
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="Unsafe path"):
+        install_wheel(str(wheel_path), str(tmp_path / "python"))
+
+
+def test_install_requirements_skips_when_current(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """
+    Test that install_requirements only installs when requirements change.
+
+    :param mocker: The pytest mocker fixture.
+    """
+    # Arrange
+    wheel_path = make_wheel(tmp_path)
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("demo==1.0\n")
+    target_dir = tmp_path / "build" / "python"
+    info = mocker.Mock()
+    mock_populate = mocker.patch("lambda_kit.utils.wheels.populate_wheelhouse")
+    mocker.patch(
+        "lambda_kit.utils.wheels.resolve_requirements",
+        return_value=[str(wheel_path)],
+    )
+
+    # Act
+    first = install_requirements(str(requirements), str(target_dir), info)
+    second = install_requirements(str(requirements), str(target_dir), info)
+
+    # Assert
+    assert first
+    assert not second
+    mock_populate.assert_called_once()
+    assert os.path.isfile(target_dir / "demo" / "__init__.py")
+    assert not os.path.exists(target_dir / ".requirements.sha256")
+
+
+def test_install_requirements_for_target_skips_pip(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """
+    Test that wheels for a target are selected from the wheelhouse without
+    running pip, and that changing the target reinstalls them.
+
+    :param mocker: The pytest mocker fixture.
+    """
+    # Arrange
+    wheelhouse = tmp_path / "wheelhouse"
+    wheelhouse.mkdir()
+    make_wheel(wheelhouse)
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("demo==1.0\n")
+    target_dir = tmp_path / "build" / "python"
+    info = mocker.Mock()
+    run_pip = mocker.patch("lambda_kit.utils.wheels._run_pip")
+
+    # Act
+    installed = [
+        install_requirements(
+            str(requirements),
+            str(target_dir),
+            info,
+            wheelhouse=str(wheelhouse),
+            offline=True,
+            target=TargetPlatform(architecture, "3.12"),
+        )
+        for architecture in ["arm64", "arm64", "x86_64"]
+    ]
+
+    # Assert
+    assert installed == [True, False, True]
+    run_pip.assert_not_called()
+    assert (target_dir / "demo" / "__init__.py").is_file()
+
+
+def test_read_requirement_specifiers_skips_options(tmp_path: Path) -> None:
+    """
+    Test that pip options are skipped and included files are followed.
+    """
+    # Arrange
+    (tmp_path / "base.txt").write_text("fastjson>=1.0\n")
+    (tmp_path / "constraints.txt").write_text("simd-shim==1.0\n")
+    (tmp_path / "requirements.txt").write_text(
+        "--index-url https://example.com/simple\n"
+        "-r base.txt\n"
+        "--constraint=constraints.txt\n"
+        "# A comment\n"
+        "demo==1.0 --hash=sha256:abc  # pinned\n"
+        "other \\\n"
+        "    >=2.0\n"
+    )
+
+    # Act
+    requirements, constraints = read_requirement_specifiers(
+        str(tmp_path / "requirements.txt")
+    )
+
+    # Assert
+    assert requirements == ["fastjson>=1.0", "demo==1.0", "other     >=2.0"]
+    assert constraints == ["simd-shim==1.0"]
+
+
+def test_read_requirement_specifiers_rejects_editable(tmp_path: Path) -> None:
+    """
+    Test that an editable requirement cannot be selected from a wheelhouse.
+    """
+    # Arrange
+    (tmp_path / "requirements.txt").write_text("-e ./src\n")
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="Unsupported requirement '-e ./src'"):
+        read_requirement_specifiers(str(tmp_path / "requirements.txt"))